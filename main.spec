@@ -6,7 +6,8 @@ a = Analysis(
     pathex=['pyminder\\lib', 'pyminder'],
     binaries=[],
     datas=[('ui\\dist', 'ui\\dist')],
-    hiddenimports=[],
+    # modules only imported through lib.lazy.lazy_import, the analysis cannot see them
+    hiddenimports=['flask', 'numpy'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
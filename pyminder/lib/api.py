@@ -2,17 +2,18 @@
 Bridge API between the frontend and the backend models & Application instance
 
 """
+
 import io
+import pathlib
 
 import typing as T
 import datetime as DT
-import time
 import contextlib
+import functools
 from decimal import Decimal
 
-import pandas as pd
 
-from . import models
+from . import heatmap, importer, models
 from .application import Application
 
 from .app_types import (
@@ -28,20 +29,85 @@ from .app_types import (
     TaskStatus,
     TimeOwner,
     TimeReport,
-    DateTimeCard,
-    ClientTime,
-    ProjectTime,
-    TaskTimeCard,
-    ReportTimeValues,
     ReportPayload,
     Shortcut,
     DayActivityEntry,
+    DayActivities,
+    HeatmapCalendar,
+    HeatmapWeekdayHour,
+    ImportSummary,
+    ClientTimeNode,
+    CacheStats,
+    DiagnosticsReport,
 )
+from .cache import LRUCache
 from .log_helper import getLogger
+from .reports import build_time_report, day_activity, group_day_activities
 from .timer import Timer
 
 LOG = getLogger(__name__)
 
+TIMER_STOP_TIMEOUT = 2.0  # seconds to wait for the timer thread to exit
+
+REPORT_CACHE_SIZE = 16
+REPORT_TABLES = tuple(
+    model.__table__.name
+    for model in (
+        models.Client,
+        models.Project,
+        models.Task,
+        models.Event,
+        models.Entry,
+    )
+)
+
+SHORTCUT_TABLES = tuple(
+    model.__table__.name
+    for model in (models.Client, models.Project, models.Task, models.Shortcut)
+)
+
+# client, project and task ids, start and end dates
+ReportKey = tuple[
+    Identifier | None,
+    Identifier | None,
+    Identifier | None,
+    DT.date | None,
+    DT.date | None,
+]
+
+
+def to_date(value: str | DT.date | None) -> DT.date | None:
+    """
+    Accept a `YYYY-MM-DD` string from the frontend or a date from python.
+
+    :param value:
+    :return:
+    """
+    if isinstance(value, str):
+        return DT.date.fromisoformat(value[:10])
+    return value
+
+
+def report_key(payload: ReportPayload) -> ReportKey:
+    """
+    The parts of a report payload that change the report itself, in the form
+    `BreakdownByConditionsStmt` uses them (a project only narrows a client, a
+    task only narrows a project).
+
+    :param payload:
+    :return:
+    """
+    client_id = payload.get("client_id", None)
+    project_id = payload.get("project_id", None) if client_id is not None else None
+    task_id = payload.get("task_id", None) if project_id is not None else None
+    return (
+        client_id,
+        project_id,
+        task_id,
+        to_date(payload.get("start_date", None)),
+        to_date(payload.get("end_date", None)),
+    )
+
 
 class API:
     """
@@ -52,10 +118,30 @@ class API:
     __app: Application
     # todo relocate this to app
     __timer: T.Optional["Timer"]
+    __reports: LRUCache[tuple[ReportKey, int], TimeReport]
+    __shortcuts: LRUCache[int, list[Shortcut]]
+
+    def __unit_of_work(method):
+        """
+        Run a bridge call as one unit of work: every `get_db` inside it, also
+        in the helpers it calls, shares one session that is committed when the
+        call returns and rolled back when it raises.
+        """
+
+        @functools.wraps(method)
+        def call(self, *args, **kwargs):
+            with self.__app.get_db():
+                return method(self, *args, **kwargs)
+
+        return call
 
     def __init__(self, app):
         self.__app = app
         self.__timer = None
+        self.__reports = LRUCache(REPORT_CACHE_SIZE)
+        # the one current shortcut list, keyed by generation
+        self.__shortcuts = LRUCache(1)
+        app.diagnostics.instrument(self)
 
     def info(self, message: str) -> None:
         """
@@ -80,6 +166,7 @@ class API:
         """
         self.__app.main_window.set_title(new_title)
 
+    @__unit_of_work
     def client_create(self, name: str) -> Client:
         """
         Create a client instance.
@@ -89,26 +176,43 @@ class API:
         with self.__app.get_db() as session:
             record = models.Client(name=name, is_active=True)
             session.add(record)
-            session.commit()
+            session.flush()
             return record.to_dict()
 
-    def clients_list(self) -> list[Client]:
+    @__unit_of_work
+    def clients_list(self, with_time: bool = False) -> list[Client]:
         """
         List all clients.
+        :param with_time: also fill in each client's all time total
         :return:
         """
         with self.__app.get_db() as session:
-            return [record.to_dict() for record in models.Client.GetAll(session)]
+            records = [record.to_dict() for record in models.Client.GetAll(session)]
+            if with_time:
+                totals = models.Queries.TimeTotals(session)["client"]
+                for record in records:
+                    record["time"] = totals.get(record["id"])
+            return records
 
-    def client_list_active(self) -> list[Client]:
+    @__unit_of_work
+    def client_list_active(self, with_time: bool = False) -> list[Client]:
         """
         List all active clients.
 
+        :param with_time: also fill in each client's all time total
         :return:
         """
         with self.__app.get_db() as session:
-            return [record.to_dict() for record in models.Client.GetAllActive(session)]
+            records = [
+                record.to_dict() for record in models.Client.GetAllActive(session)
+            ]
+            if with_time:
+                totals = models.Queries.TimeTotals(session)["client"]
+                for record in records:
+                    record["time"] = totals.get(record["id"])
+            return records
 
+    @__unit_of_work
     def client_get(self, client_id: Identifier) -> T.Optional[Client]:
         """
         Get a client instance.
@@ -123,13 +227,14 @@ class API:
                 return record.to_dict() if all_time else None
             return None
 
+    @__unit_of_work
     def client_set_status(self, client_id: Identifier, status: bool) -> bool:
         with self.__app.get_db() as session:
             record = models.Client.GetById(session, client_id)
             record.is_active = status
-            session.commit()
             return status
 
+    @__unit_of_work
     def client_update(
         self, client_id: Identifier, client_name: str
     ) -> T.Optional[Client]:
@@ -144,10 +249,11 @@ class API:
             if record:
                 record.name = client_name
                 session.add(record)
-                session.commit()
+                session.flush()
                 return record.to_dict()
             return None
 
+    @__unit_of_work
     def client_destroy(self, client_id: Identifier) -> bool:
         """
         Destroy a client record.
@@ -156,9 +262,9 @@ class API:
         """
         with self.__app.get_db() as session:
             models.Client.Delete_By_Id(session, client_id)
-            session.commit()
             return True
 
+    @__unit_of_work
     def project_create(self, client_id: Identifier, name: str) -> Project:
         """
         Create a project record.
@@ -169,33 +275,52 @@ class API:
         with self.__app.get_db() as session:
             record = models.Project(name=name, is_active=True, client_id=client_id)
             session.add(record)
-            session.commit()
+            session.flush()
             return record.to_dict()
 
-    def projects_list_by_client_id(self, client_id: Identifier) -> list[Project]:
+    @__unit_of_work
+    def projects_list_by_client_id(
+        self, client_id: Identifier, with_time: bool = False
+    ) -> list[Project]:
         """
         List all projects by client.
         :param client_id:
+        :param with_time: also fill in each project's all time total
         :return:
         """
         with self.__app.get_db() as session:
-            return [
+            records = [
                 record.to_dict()
                 for record in models.Project.GetByClient(session, client_id)
             ]
+            if with_time:
+                totals = models.Queries.TimeTotals(session, client_id=client_id)
+                for record in records:
+                    record["time"] = totals["project"].get(record["id"])
+            return records
 
-    def projects_list_active_by_client_id(self, client_id: Identifier) -> list[Project]:
+    @__unit_of_work
+    def projects_list_active_by_client_id(
+        self, client_id: Identifier, with_time: bool = False
+    ) -> list[Project]:
         """
         List all active projects by client.
         :param client_id:
+        :param with_time: also fill in each project's all time total
         :return:
         """
         with self.__app.get_db() as session:
-            return [
+            records = [
                 record.to_dict()
                 for record in models.Project.FetchActive_by_Client(session, client_id)
             ]
+            if with_time:
+                totals = models.Queries.TimeTotals(session, client_id=client_id)
+                for record in records:
+                    record["time"] = totals["project"].get(record["id"])
+            return records
 
+    @__unit_of_work
     def project_get(self, project_id: Identifier) -> Project:
         """
         Get a project record.
@@ -207,6 +332,7 @@ class API:
             record["time"] = models.Project.GetAllTime(session, project_id)
             return record
 
+    @__unit_of_work
     def project_update(self, project_id: Identifier, project_name: str) -> Project:
         """
         Update a project record.
@@ -219,9 +345,10 @@ class API:
             if record:
                 record.name = project_name
                 session.add(record)
-                session.commit()
+                session.flush()
             return record.to_dict()
 
+    @__unit_of_work
     def project_set_status(self, project_id: Identifier, status: bool) -> Project:
         """
         Set a project status.
@@ -232,9 +359,10 @@ class API:
         with self.__app.get_db() as session:
             record = models.Project.GetById(session, project_id)
             record.is_active = status
-            session.commit()
+            session.flush()
             return record.to_dict()
 
+    @__unit_of_work
     def project_destroy(self, project_id: Identifier) -> bool:
         """
         Destroy a project record.
@@ -243,9 +371,9 @@ class API:
         """
         with self.__app.get_db() as session:
             retval = models.Project.Delete_By_Id(session, project_id)
-            session.commit()
             return retval
 
+    @__unit_of_work
     def task_create(self, project_id: Identifier, name: str) -> Task:
         """
         Create a task record.
@@ -256,33 +384,52 @@ class API:
         with self.__app.get_db() as session:
             record = models.Task(name=name, project_id=project_id)
             session.add(record)
-            session.commit()
+            session.flush()
             return record.to_dict()
 
-    def tasks_lists_by_project_id(self, project_id: Identifier) -> list[Task]:
+    @__unit_of_work
+    def tasks_lists_by_project_id(
+        self, project_id: Identifier, with_time: bool = False
+    ) -> list[Task]:
         """
         List all tasks by project.
         :param project_id:
+        :param with_time: also fill in each task's all time total
         :return:
         """
         with self.__app.get_db() as session:
-            return [
+            records = [
                 record.to_dict()
                 for record in models.Task.GetByProject(session, project_id)
             ]
+            if with_time:
+                totals = models.Queries.TimeTotals(session, project_id=project_id)
+                for record in records:
+                    record["time"] = totals["task"].get(record["id"])
+            return records
 
-    def tasks_list_active_by_project_id(self, project_id: Identifier) -> list[Task]:
+    @__unit_of_work
+    def tasks_list_active_by_project_id(
+        self, project_id: Identifier, with_time: bool = False
+    ) -> list[Task]:
         """
         List all active tasks by project.
         :param project_id:
+        :param with_time: also fill in each task's all time total
         :return:
         """
         with self.__app.get_db() as session:
-            return [
+            records = [
                 record.to_dict()
                 for record in models.Task.GetActiveByProject(session, project_id)
             ]
+            if with_time:
+                totals = models.Queries.TimeTotals(session, project_id=project_id)
+                for record in records:
+                    record["time"] = totals["task"].get(record["id"])
+            return records
 
+    @__unit_of_work
     def task_get(self, task_id: Identifier) -> Task:
         """
         Get a task record.
@@ -294,11 +441,13 @@ class API:
             record["time"] = models.Task.GetAllTime(session, task_id)
             return record
 
+    @__unit_of_work
     def task_get_by_name(self, task_name: str) -> Task:
         with self.__app.get_db() as session:
             record = models.Task.GetByName(session, task_name)
             return record.to_dict()
 
+    @__unit_of_work
     def task_update(
         self, task_id: Identifier, name: str | None = None, status: str | None = None
     ) -> T.Optional[Task]:
@@ -318,10 +467,11 @@ class API:
                     record.status = TaskStatus[status]
 
                 session.add(record)
-                session.commit()
+                session.flush()
                 return record.to_dict()
             return None
 
+    @__unit_of_work
     def task_destroy(self, task_id: Identifier) -> bool:
         """
         Destroy given task record by its id
@@ -330,16 +480,16 @@ class API:
         """
         with self.__app.get_db() as session:
             models.Task.Delete_By_Id(session, task_id)
-            session.commit()
             return True
 
+    @__unit_of_work
     def task_set_status_by_name(self, task_name: str, status: bool) -> bool:
         with self.__app.get_db() as session:
             task = models.Task.GetByName(session, task_name)
             task.is_active = status
-            session.commit()
             return status
 
+    @__unit_of_work
     def task_set_status(self, task_id: Identifier, status: bool) -> bool:
         """
         Set a task status to hide it from the select/dropdown list.
@@ -351,9 +501,9 @@ class API:
         """
         with self.__app.get_db() as session:
             status = models.Task.Update_Status(session, task_id, status)
-            session.commit()
             return status
 
+    @__unit_of_work
     def event_create(
         self,
         task_id: Identifier,
@@ -383,9 +533,10 @@ class API:
                 is_active=True,
             )
             session.add(record)
-            session.commit()
+            session.flush()
             return record.to_dict()
 
+    @__unit_of_work
     def events_get_or_create_by_date(
         self, task_id: Identifier, start_date: DT.date | None = None
     ) -> list[Event]:
@@ -400,59 +551,77 @@ class API:
             record = models.Event.GetOrCreateByDate(session, task_id, my_date)
             return record.to_dict()
 
-    def events_by_task_id(self, task_id: Identifier) -> list[Event]:
+    @__unit_of_work
+    def events_by_task_id(
+        self, task_id: Identifier, include_entries: bool = False
+    ) -> list[Event]:
         """
         Get all events by task id.
         :param task_id:
+        :param include_entries: also send every event's entries
         :return:
         """
         with self.__app.get_db() as session:
             return [
-                record.to_dict() for record in models.Event.GetByTask(session, task_id)
+                record.to_dict(include_entries)
+                for record in models.Event.GetByTask(session, task_id, include_entries)
             ]
 
-    def event_active_by_task_id(self, task_id: Identifier) -> T.List[Event]:
+    @__unit_of_work
+    def event_active_by_task_id(
+        self, task_id: Identifier, include_entries: bool = False
+    ) -> T.List[Event]:
         """
         Get all active events by task id.
         :param task_id:
+        :param include_entries: also send every event's entries
         :return:
         """
         with self.__app.get_db() as session:
             return [
-                record.to_dict()
-                for record in models.Event.GetActiveByTask(session, task_id)
+                record.to_dict(include_entries)
+                for record in models.Event.GetActiveByTask(
+                    session, task_id, include_entries
+                )
             ]
 
-    def event_get(self, event_id: Identifier) -> Event | None:
+    @__unit_of_work
+    def event_get(
+        self, event_id: Identifier, include_entries: bool = False
+    ) -> Event | None:
         """
         Get an event record.
         :param event_id:
+        :param include_entries: also send the event's entries
         :return:
         """
         with self.__app.get_db() as session:
             record = models.Event.GetById(session, event_id)
             if record:
-                response = record.to_dict()
-                response["time"] = models.Event.GetAllTime(session, event_id)
-                return response
+                return record.to_dict(include_entries)
             return None
 
+    @__unit_of_work
     def event_get_by_date(
-        self, task_id: Identifier, event_date: str | None
+        self, task_id: Identifier, event_date: str | None, include_entries: bool = False
     ) -> Event | None:
         """
         Get an event record based on date.
         :param task_id:
         :param event_date:
+        :param include_entries: also send the event's entries
         :return:
         """
         with self.__app.get_db() as session:
-            record = models.Event.GetByDate(session, task_id, event_date)
+            record = models.Event.GetByDate(
+                session, task_id, to_date(event_date), include_entries
+            )
             if record is not None:
-                return record.to_dict()
+                return record.to_dict(include_entries)
 
             return None
 
+    @__unit_of_work
     def event_list_dates_by_project_id(self, task_id: Identifier) -> list[EventDate]:
         """
         Get a list of event record id by their start date.
@@ -465,6 +634,7 @@ class API:
                 for record in models.Event.GetAllEventDatesByTask(session, task_id)
             ]
 
+    @__unit_of_work
     def event_update(
         self, event_id: Identifier, details: str | None = None, notes: str | None = None
     ) -> Event | None:
@@ -484,11 +654,12 @@ class API:
                 if notes is not None:
                     record.notes = notes
                 session.add(record)
-                session.commit()
+                session.flush()
                 return record.to_dict()
 
             return None
 
+    @__unit_of_work
     def event_destroy(self, event_id: Identifier) -> bool:
         """
         Destroy an event record.
@@ -498,9 +669,9 @@ class API:
         """
         with self.__app.get_db() as session:
             retval = models.Event.Delete_By_Id(session, event_id)
-            session.commit()
             return retval
 
+    @__unit_of_work
     def event_add_entry(
         self,
         event_id: Identifier,
@@ -528,9 +699,10 @@ class API:
                 start=start_dt, end=end_dt, seconds=seconds, stop_reason=key
             )
             session.add(entry)
-            session.commit()
+            session.flush()
             return entry.to_dict()
 
+    @__unit_of_work
     def entries_lists_by_event_id(self, event_id: Identifier) -> list[Entry]:
         """
         Get all entries by the given parent event id.
@@ -543,6 +715,7 @@ class API:
                 entry.to_dict() for entry in models.Entry.GetByEvent(session, event_id)
             ]
 
+    @__unit_of_work
     def entry_get(self, entry_id: Identifier) -> Entry:
         """
         Get an entry record.
@@ -555,6 +728,7 @@ class API:
             if record:
                 return record.to_dict()
 
+    @__unit_of_work
     def entry_update(self, entry_id: Identifier, changeset: EntryUpdate) -> Entry:
         """
         Update an entry record.
@@ -571,9 +745,10 @@ class API:
             record.seconds = (record.stopped_on - record.started_on).seconds
 
             session.add(record)
-            session.commit()
+            session.flush()
             return record.to_dict()
 
+    @__unit_of_work
     def entry_destroy(self, entry_id: Identifier) -> bool:
         """
         Destroy an entry record.
@@ -583,9 +758,40 @@ class API:
         """
         with self.__app.get_db() as session:
             retval = models.Entry.Delete_By_Id(session, entry_id)
-            session.commit()
             return retval
 
+    def entries_import(
+        self,
+        path: str,
+        dry_run: bool = False,
+        listener_id: Identifier | None = None,
+    ) -> ImportSummary:
+        """
+        Bulk import entries from a .csv, .json or .jsonl file in one
+        transaction, see importer.py for the accepted columns.
+
+        :param path: the file to import
+        :param dry_run: validate everything but write nothing
+        :param listener_id: optional frontend callback receiving
+            (entries written, entries total) after each batch
+        :return:
+        """
+
+        def progress(done: int, total: int) -> None:
+            self.__app.tell(listener_id, done, total)
+
+        try:
+            return importer.import_entries(
+                self.__app.engine,
+                pathlib.Path(path),
+                dry_run,
+                progress if listener_id is not None else None,
+            )
+        finally:
+            if listener_id is not None:
+                self.__app.clearCallback(listener_id)
+
+    @__unit_of_work
     def entry_create(
         self,
         event_id: Identifier,
@@ -622,7 +828,7 @@ class API:
                 )
 
             session.add(record)
-            session.commit()
+            session.flush()
             return record.to_dict()
 
     def timer_check(self) -> bool:
@@ -633,10 +839,12 @@ class API:
         """
         return self.__timer is not None and self.__timer.running is True
 
-    def timer_owner(self) -> T.Optional[TimeOwner]:
+    @__unit_of_work
+    def timer_owner(self, include_entries: bool = False) -> T.Optional[TimeOwner]:
         """
         Get everything about the timer's owner.
 
+        :param include_entries: also send the running event's entries
         :return:
         """
         if self.__timer is not None:
@@ -650,7 +858,7 @@ class API:
                     client=client.to_dict(),
                     project=project.to_dict(),
                     task=task.to_dict(),
-                    event=event.to_dict(),
+                    event=event.to_dict(include_entries),
                     isRunning=self.__timer.running,
                     isPaused=self.__timer.paused,
                 )
@@ -672,30 +880,36 @@ class API:
         self,
         listener_id: Identifier,
         task_id: Identifier,
+        include_entries: bool = False,
     ) -> Event:
         """
         Create a new event if not exists and then start the timer with the provided event record id.
 
         :param listener_id:
         :param task_id:
+        :param include_entries: also send the event's entries
         :return:
         """
 
+        # the event and the timer's entry are written in one transaction,
+        # committed before the timer thread starts checkpointing the entry
         with self.__app.get_db() as session:
             event = models.Event.GetOrCreateByDate(session, task_id, DT.date.today())
-            session.commit()
-            event_id = event.id
 
-        LOG.debug("timer_start {}", self.__timer)
-        if self.__timer is None:
-            LOG.debug("timer_starting for {}", listener_id)
-            self.__timer = Timer(self.__app, listener_id, event_id, 0.500)
+            LOG.debug(f"timer_start {self.__timer}")
+            timer = None
+            if self.__timer is None:
+                LOG.debug(f"timer_starting for {listener_id}")
+                timer = Timer(self.__app, listener_id, event.id, 1.0)
 
+            record = event.to_dict(include_entries)
+
+        if timer is not None:
+            self.__timer = timer
             self.__timer.start()
             LOG.debug("timer_started")
 
-        with self.__app.get_db() as session:
-            return models.Event.GetById(session, event_id).to_dict()
+        return record
 
     def timer_stop(self) -> bool:
         """
@@ -705,9 +919,9 @@ class API:
         """
         if self.__timer is not None:
             self.__timer.stop()
-            time.sleep(1)
-            while self.__timer.running:
-                time.sleep(1)
+            self.__timer.join(TIMER_STOP_TIMEOUT)
+            if self.__timer.is_alive():
+                LOG.warning(f"Timer {self.__timer.identifier} did not stop in time")
 
             del self.__timer
             self.__timer = None
@@ -737,17 +951,33 @@ class API:
             return True
         return False
 
+    def __shortcuts_list(self) -> list[Shortcut]:
+        """
+        The shortcuts most recently used first, read with one joined query and
+        kept until a write to a shortcut, client, project or task commits.
+        """
+
+        def build() -> list[Shortcut]:
+            with self.__app.get_db() as session:
+                return [
+                    models.Shortcut.row_to_dict(row)
+                    for row in session.execute(models.Shortcut.MostRecentStmt())
+                ]
+
+        generation = self.__app.generation.of(*SHORTCUT_TABLES)
+        return self.__shortcuts.get_or_build(generation, build)
+
+    @__unit_of_work
     def shortcut_get_all(self) -> list[Shortcut]:
         """
-        Get all shortcuts (client, project, task) for rapid context switching.
+        Get all shortcuts (client, project, task) for rapid context switching,
+        most recently used first.
 
         :return:
         """
-        with self.__app.get_db() as session:
-            return [
-                record.to_dict() for record in models.Shortcut.GetAllReversed(session)
-            ]
+        return [shortcut.copy() for shortcut in self.__shortcuts_list()]
 
+    @__unit_of_work
     def shortcut_get(self, shortcut_id: Identifier) -> Shortcut:
         """
         Get a specific shortcut by its id.
@@ -755,15 +985,18 @@ class API:
         :param shortcut_id:
         :return:
         """
-        with self.__app.get_db() as session:
-            record = models.Shortcut.GetById(session, shortcut_id)
-            return record.to_dict()
+        for shortcut in self.__shortcuts_list():
+            if shortcut["id"] == shortcut_id:
+                return shortcut.copy()
+        raise ValueError(f"No shortcut with id {shortcut_id}")
 
+    @__unit_of_work
     def shortcut_add(
         self, client_id: Identifier, project_id: Identifier, task_id: Identifier
     ) -> Shortcut:
         """
-        Add a new shortcut .
+        Add a shortcut, or move an existing one to the front.  Only the
+        application's `shortcut_capacity` most recent shortcuts are kept.
 
         :param client_id:
         :param project_id:
@@ -771,10 +1004,20 @@ class API:
         :return:
         """
         with self.__app.get_db() as session:
-            record = models.Shortcut.GetOrCreate(
-                session, client_id=client_id, project_id=project_id, task_id=task_id
+            shortcut_id = models.Shortcut.Use(
+                session,
+                client_id,
+                project_id,
+                task_id,
+                capacity=self.__app.shortcut_capacity,
             )
-            return record.to_dict()
+            # read from the session, the cached list only follows commits
+            row = session.execute(
+                models.Shortcut.MostRecentStmt().where(
+                    models.Shortcut.id == shortcut_id
+                )
+            ).one()
+            return models.Shortcut.row_to_dict(row)
 
     def open_window(self, win_name: str) -> bool:
         """
@@ -795,92 +1038,69 @@ class API:
         """
         return self.__app.window_toggle_resize(win_name, size)
 
+    @__unit_of_work
+    def time_tree(
+        self,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        active_only: bool = False,
+    ) -> list[ClientTimeNode]:
+        """
+        Get every client, its projects and their tasks with time totals.
+
+        :param start_date: optional first day (inclusive) to count time from
+        :param end_date: optional last day (inclusive) to count time to
+        :param active_only: skip deactivated clients, projects, and tasks
+        :return:
+        """
+        with self.__app.get_db() as session:
+            return models.Queries.TimeTree(
+                session, to_date(start_date), to_date(end_date), active_only
+            )
+
+    @__unit_of_work
     def report_generate(self, payload: ReportPayload) -> TimeReport:
         """
         Generate a report using the given payload.
 
+        Reports are cached by payload until a client, project, task, event or
+        entry is written to.  With the columnar entry store enabled they are
+        computed from its arrays instead of SQLite.
+
         :param payload:
         :return:
         """
-        end_date = payload.get("end_date", None)
-        client_id = payload.get("client_id", None)
-        project_id = payload.get("project_id", None)
-        task_id = payload.get("task_id", None)
+        key = report_key(payload)
         # sort_order = payload.get("sort_order", ["cname", "dtwhen", "pname", "tname"])
 
-        with self.__app.get_db():
-            start_date = (
-                DT.datetime.strptime(payload.get("start_date"), "%Y-%m-%d").date()
-                if payload.get("start_date", None) is not None
-                and isinstance(payload.get("start_date", None), str)
-                else None
-            )
-            end_date = (
-                DT.datetime.strptime(end_date, "%Y-%m-%d").date()
-                if end_date is not None and isinstance(end_date, str)
-                else None
-            )  # type: DT.date
-            stmt = models.Queries.BreakdownByConditionsStmt(
-                client_id, project_id, task_id, start_date, end_date
-            )
+        def build() -> TimeReport:
+            if self.__app.entry_store is not None:
+                return build_time_report(self.__app.entry_store.breakdown(*key))
 
-            def mk_time(my_seconds):
-                hours, rem = divmod(my_seconds, 3600)
-                minutes, seconds = divmod(rem, 60)
-                return int(hours), int(minutes), int(seconds)
-
-            def to_dec(hours, minutes, seconds):
-                return hours + (minutes / 60) + (seconds / 3600)
-
-            def to_frame(name, category, subframe) -> ReportTimeValues:
-                total_seconds = subframe["seconds"].sum()
-                total_time = mk_time(total_seconds)
-                total_dec = to_dec(*total_time)
-
-                return {
-                    "name": name,
-                    "category": category,
-                    "hours": total_time[0],
-                    "minutes": total_time[1],
-                    "seconds": total_time[2],
-                    "total_seconds": total_seconds,
-                    "decimal": total_dec,
-                }
-
-            df = pd.read_sql_query(sql=stmt, con=self.__app.engine)
-
-            report = TimeReport(clients={}, **to_frame("report", "report", df))
-
-            for client, client_data in df.groupby("client_name"):
-                cname = str(client)
-                report["clients"][cname] = ClientTime(
-                    projects={}, **to_frame(cname, "client", client_data)
-                )
-                for project, project_data in client_data.groupby("project_name"):
-                    pname = str(project)
-                    report["clients"][cname]["projects"][pname] = ProjectTime(
-                        dates={}, **to_frame(pname, "project", project_data)
-                    )
+            stmt = models.Queries.BreakdownByConditionsStmt(*key)
+            with self.__app.get_db() as session:
+                return build_time_report(session.execute(stmt))
 
-                    for dtwhen, date_data in project_data.groupby("date_when"):
-                        my_date = str(dtwhen)
-                        report["clients"][cname]["projects"][pname]["dates"][
-                            my_date
-                        ] = DateTimeCard(
-                            tasks=[], **to_frame(my_date, "date", date_data)
-                        )
-                        for task, task_data in date_data.groupby("task_name"):
-                            my_task = str(task)
-                            report["clients"][cname]["projects"][pname]["dates"][
-                                my_date
-                            ]["tasks"].append(
-                                TaskTimeCard(
-                                    entries=task_data["entries"].sum(),
-                                    **to_frame(my_task, "task", task_data),
-                                )
-                            )
-
-        return report
+        generation = self.__app.generation.of(*REPORT_TABLES)
+        return self.__reports.get_or_build((key, generation), build)
+
+    def report_cache_stats(self) -> CacheStats:
+        """
+        Hit/miss counters of the report cache.
+
+        :return:
+        """
+        return self.__reports.stats()
+
+    def diagnostics_get(self) -> DiagnosticsReport:
+        """
+        Call count, latency percentiles, SQL statements, records returned and
+        payload size of every bridge method called so far, slowest in total
+        first.
+
+        :return:
+        """
+        return self.__app.diagnostics.report()
 
     def report_build2text(self, payload: ReportPayload) -> str:
         """
@@ -958,27 +1178,80 @@ class API:
 
         return f.getvalue()
 
+    @__unit_of_work
     def report_day(self, request_date: str) -> list[DayActivityEntry]:
         search_date = DT.datetime.fromisoformat(request_date).date()
-        records = []
-
-        with self.__app.get_db() as session:
-            for activity in models.Queries.DayActivities(session, search_date):
-                records.append(
-                    DayActivityEntry(
-                        start_date=activity._mapping["start_date"].isoformat(),
-                        client_name=activity._mapping["client_name"],
-                        project_name=activity._mapping["project_name"],
-                        task_name=activity._mapping["task_name"],
-                        started_on=activity._mapping["started_on"].isoformat(),
-                        stopped_on=activity._mapping["stopped_on"].isoformat(),
-                        seconds=activity._mapping["seconds"],
-                        client_id=activity._mapping["client_id"],
-                        project_id=activity._mapping["project_id"],
-                        task_id=activity._mapping["task_id"],
-                        event_id=activity._mapping["event_id"],
-                        entry_id=activity._mapping["entry_id"],
-                    )
-                )
 
-        return records
+        with self.__app.get_db() as session:
+            return [
+                day_activity(activity)
+                for activity in models.Queries.DayActivities(session, search_date)
+            ]
+
+    @__unit_of_work
+    def report_range_activities(
+        self, start_date: str, end_date: str, columnar: bool = False
+    ) -> list[DayActivities]:
+        """
+        Every entry from start_date to end_date inclusive, grouped by day, for
+        the week and month timelines.  Days without entries are left out.
+        """
+        stmt = models.Queries.RangeActivitiesStmt(
+            to_date(start_date), to_date(end_date)
+        )
+        with self.__app.get_db() as session:
+            return group_day_activities(session.execute(stmt), columnar)
+
+    @__unit_of_work
+    def heatmap_calendar(
+        self,
+        start_date: str,
+        end_date: str,
+        client_id: Identifier | None = None,
+        project_id: Identifier | None = None,
+        task_id: Identifier | None = None,
+    ) -> HeatmapCalendar:
+        """
+        Seconds tracked on each day from start_date to end_date inclusive,
+        entries running past midnight are split between their days.
+        """
+        start, end = to_date(start_date), to_date(end_date)
+        spans = self.__heatmap_spans(start, end, client_id, project_id, task_id)
+        return heatmap.calendar(spans, start, end)
+
+    @__unit_of_work
+    def heatmap_weekday_hour(
+        self,
+        start_date: str,
+        end_date: str,
+        client_id: Identifier | None = None,
+        project_id: Identifier | None = None,
+        task_id: Identifier | None = None,
+    ) -> HeatmapWeekdayHour:
+        """
+        Seconds tracked from start_date to end_date inclusive as a 7x24
+        weekday (Monday first) by hour of the day matrix.
+        """
+        start, end = to_date(start_date), to_date(end_date)
+        spans = self.__heatmap_spans(start, end, client_id, project_id, task_id)
+        return heatmap.weekday_hour(spans, start, end)
+
+    def __heatmap_spans(
+        self, start: DT.date, end: DT.date, client_id, project_id, task_id
+    ) -> heatmap.Spans:
+        if end < start:
+            raise ValueError(f"end_date {end} is before start_date {start}")
+
+        if self.__app.entry_store is not None:
+            return self.__app.entry_store.spans(
+                heatmap.to_epoch(start),
+                heatmap.to_epoch(end + DT.timedelta(days=1)),
+                client_id,
+                project_id,
+                task_id,
+            )
+
+        with self.__app.get_db() as session:
+            return heatmap.load_spans(
+                session, start, end, client_id, project_id, task_id
+            )
@@ -54,7 +54,8 @@ class Event(Base):
     details: str
     notes: str
     time: T.Optional["TimeObject"]
-    entries: list["Entry"]
+    entries_count: int
+    entries: T.Optional[list["Entry"]]
 
 
 class EventDate(T.TypedDict):
@@ -98,6 +99,22 @@ class TimeObject(T.TypedDict):
     hours: int
 
 
+class TaskTimeNode(T.TypedDict):
+    id: Identifier
+    name: str
+    is_active: bool
+    seconds: int
+    time: TimeObject
+
+
+class ProjectTimeNode(TaskTimeNode):
+    tasks: list[TaskTimeNode]
+
+
+class ClientTimeNode(TaskTimeNode):
+    projects: list[ProjectTimeNode]
+
+
 class ReportTimeValues(T.TypedDict):
     hours: float
     minutes: float
@@ -164,3 +181,81 @@ class DayActivityEntry(T.TypedDict):
     task_id: Identifier
     event_id: Identifier
     entry_id: Identifier
+
+
+class DayActivityColumns(T.TypedDict):
+    client_name: list[str]
+    project_name: list[str]
+    task_name: list[str]
+    started_on: list[str]
+    stopped_on: list[str]
+    seconds: list[int]
+    entry_id: list[Identifier]
+    client_id: list[Identifier]
+    project_id: list[Identifier]
+    task_id: list[Identifier]
+    event_id: list[Identifier]
+
+
+class DayActivities(T.TypedDict):
+    day: str
+    seconds: int
+    entries: list[DayActivityEntry] | None
+    columns: DayActivityColumns | None
+
+
+class HeatmapCalendar(T.TypedDict):
+    start_date: str
+    end_date: str
+    seconds: list[int]  # one per day from start_date
+    total_seconds: int
+
+
+class HeatmapWeekdayHour(T.TypedDict):
+    start_date: str
+    end_date: str
+    seconds: list[list[int]]  # [weekday, Monday first][hour of the day]
+    total_seconds: int
+
+
+class ImportSummary(T.TypedDict):
+    path: str
+    dry_run: bool
+    records: int
+    entries: int
+    clients: int
+    projects: int
+    tasks: int
+    events: int
+    errors: list[str]  # the first validation errors, see importer.MAX_ERRORS
+    error_count: int
+    seconds: float
+
+
+class CacheStats(T.TypedDict):
+    capacity: int
+    size: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class MethodStats(T.TypedDict):
+    name: str
+    calls: int
+    errors: int
+    total_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    statements: int
+    max_statements: int
+    rows: int
+    payload_bytes: int
+    max_payload_bytes: int
+
+
+class DiagnosticsReport(T.TypedDict):
+    started_on: str
+    methods: list[MethodStats]
@@ -1,3 +1,4 @@
+import threading
 import time
 import typing as T
 import pathlib
@@ -10,7 +11,13 @@ import webview
 
 from . import models
 from .app_types import Identifier
+from .checkpoint import CheckpointJournal, DEFAULT_INTERVAL
+from .columnar import EntryStore
+from .diagnostics import Diagnostics
+from .generation import DataGeneration
 from .log_helper import getLogger
+from .push import PushDispatcher
+from .startup import StartupProfiler
 
 LOG = getLogger(__name__)
 
@@ -25,6 +32,13 @@ class Application:
 
     engine: sqlalchemy.engine.Engine
     Session: models.scoped_session
+    checkpoints: CheckpointJournal
+    push: PushDispatcher
+    generation: DataGeneration
+    entry_store: EntryStore | None
+    diagnostics: Diagnostics
+    shortcut_capacity: int
+    profiler: StartupProfiler
 
     current_client_id: int | None = None
     current_project_id: int | None = None
@@ -32,13 +46,43 @@ class Application:
     windows: dict[str, webview.Window]
 
     def __init__(
-        self, here: pathlib.Path, db_path: pathlib.Path, debug: bool = False
+        self,
+        here: pathlib.Path,
+        db_path: pathlib.Path,
+        debug: bool = False,
+        storage_profile: str = models.DEFAULT_STORAGE_PROFILE,
+        checkpoint_interval: float = DEFAULT_INTERVAL,
+        profiler: StartupProfiler | None = None,
+        columnar: bool = False,
+        shortcut_capacity: int = models.SHORTCUT_CAPACITY,
     ) -> None:
         self.here = here
         self.database_path = db_path
         self.debug = debug
+        self.shortcut_capacity = shortcut_capacity
+        self.profiler = profiler if profiler is not None else StartupProfiler()
+
+        with self.profiler.phase("engine"):
+            self.engine, self.Session = models.connect(
+                self.database_path,
+                echo=self.debug,
+                create=False,
+                profile=storage_profile,
+            )
+            with self.engine.connect():
+                pass
+
+        with self.profiler.phase("schema"):
+            models.Base.metadata.create_all(self.engine, checkfirst=True)
 
-        self.engine, self.Session = models.connect(self.database_path, echo=self.debug)
+        self.generation = DataGeneration(self.engine)
+        # optional NumPy copy of the entries, see columnar.py
+        self.entry_store = (
+            EntryStore(self.engine, self.generation) if columnar else None
+        )
+        self.diagnostics = Diagnostics(self.engine)
+        self.checkpoints = CheckpointJournal(self.engine, checkpoint_interval)
+        self.push = PushDispatcher(self.evaluate_js)
 
         self._main_window = None
         self.current_client_id = None
@@ -46,6 +90,7 @@ class Application:
         self.current_task_id = None
 
         self.windows = dict()
+        self._units = threading.local()
 
         self.web_app = None
 
@@ -70,36 +115,57 @@ class Application:
 
     def shutdown(self) -> None:
         LOG.debug("Shutting down application, main window closed")
+        self.checkpoints.flush()
+        self.push.close()
         targets = list(self.windows.values())
         for window in targets:
             LOG.debug("Shutting down window")
             window.destroy()
 
-    def tell(self, identifier: Identifier, *args):
-        def check_success(result):
-            LOG.debug(f"Checking {identifier} success {result}")
-
-        temp = json.dumps(args)
-        script = f"window.criticalCall('{identifier}', {temp})"
-        # LOG.debug(f"Telling {identifier} - `{script=}`")
-        if self.main_window is None:
-            raise RuntimeError("Main window not initialized")
-        response = self.main_window.evaluate_js(script)
-        # LOG.debug(f"Telling {identifier} - `{response=}`")
-        return response
-
-    def clearCallback(self, identifier: Identifier):
-        script = f"window.endCallback('{identifier}')"
+    def evaluate_js(self, script: str):
         if self.main_window is None:
             raise RuntimeError("Main window not initialized")
         return self.main_window.evaluate_js(script)
 
+    def tell(self, identifier: Identifier, *args) -> None:
+        """
+        Queue a tick for a frontend callback, never blocks on the webview.
+        """
+        temp = json.dumps(args)
+        self.push.tick(identifier, f"window.criticalCall('{identifier}', {temp})")
+
+    def clearCallback(self, identifier: Identifier) -> None:
+        """
+        Queue the end of a frontend callback behind anything already sent to it.
+        """
+        self.push.clear(identifier, f"window.endCallback('{identifier}')")
+
     @contextmanager
-    def get_db(self):
+    def get_db(self) -> T.Iterator[models.Session]:
+        """
+        The calling thread's unit of work.
+
+        The outermost `get_db` of a thread opens the session, commits it when
+        the block finishes and rolls it back when the block raises, so a
+        failed call never leaves its connection inside a transaction.  Nested
+        `get_db` blocks share that session and leave committing to it.
+        """
+        session = getattr(self._units, "session", None)
+        if session is not None:
+            yield session
+            return
+
         session = self.Session()
-        yield session
-        session.close()
-        del session
+        self._units.session = session
+        try:
+            yield session
+            session.commit()
+        except BaseException:
+            session.rollback()
+            raise
+        finally:
+            self._units.session = None
+            session.close()
 
     def open_window(self, my_api, win_name: str) -> bool:
         valid = ["tasks", "reports", "manage"]
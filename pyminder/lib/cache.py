@@ -0,0 +1,68 @@
+"""
+Small thread safe LRU cache with hit/miss metrics.
+
+"""
+
+import collections
+import threading
+import typing as T
+
+from .app_types import CacheStats
+
+K = T.TypeVar("K", bound=T.Hashable)
+V = T.TypeVar("V")
+
+
+class LRUCache(T.Generic[K, V]):
+    capacity: int
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self, capacity: int = 32):
+        self.capacity = capacity
+        self._items: collections.OrderedDict[K, V] = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_build(self, key: K, build: T.Callable[[], V]) -> V:
+        """
+        Get the cached value for `key`, building and storing it on a miss.
+
+        :param key:
+        :param build: called without the lock held
+        :return:
+        """
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+
+        value = build()
+
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                capacity=self.capacity,
+                size=len(self._items),
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+            )
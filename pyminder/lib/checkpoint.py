@@ -0,0 +1,136 @@
+"""
+Write-behind journal for the running timer's Entry record.
+
+The timer reports its progress every tick, the journal keeps only the latest
+values per entry and writes them with a plain UPDATE at most once every
+`interval` seconds, or right away when flushed on pause/stop/shutdown.
+
+"""
+
+import datetime as DT
+import threading
+import time
+import typing as T
+
+import sqlalchemy
+from sqlalchemy import update
+
+from . import models
+from .app_types import Identifier, StopReasons
+from .log_helper import getLogger
+
+LOG = getLogger(__name__)
+
+DEFAULT_INTERVAL = 10.0  # seconds
+
+
+class CheckpointStats(T.TypedDict):
+    interval: float
+    pending: int
+    recorded: int
+    coalesced: int
+    flushes: int
+    writes: int
+    writes_per_minute: float
+
+
+class CheckpointJournal:
+    engine: sqlalchemy.engine.Engine
+    interval: float
+    clock: T.Callable[[], float]
+
+    recorded: int
+    coalesced: int
+    flushes: int
+    writes: int
+
+    def __init__(
+        self,
+        engine: sqlalchemy.engine.Engine,
+        interval: float = DEFAULT_INTERVAL,
+        clock: T.Callable[[], float] = time.monotonic,
+    ):
+        self.engine = engine
+        self.interval = interval
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        # held from taking a batch until it is committed, so batches commit in
+        # the order they were taken and an older one never overwrites a newer
+        self._flush_lock = threading.Lock()
+        self._pending: dict[Identifier, dict[str, T.Any]] = {}
+        self._started = self._last_flush = clock()
+
+        self.recorded = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.writes = 0
+
+    def record(
+        self,
+        entry_id: Identifier,
+        stopped_on: DT.datetime,
+        seconds: float,
+        reason: StopReasons = StopReasons.PLACEHOLDER,
+    ) -> None:
+        """
+        Remember the latest state of an entry, writing it out if the interval
+        has passed since the last flush.
+
+        :param entry_id:
+        :param stopped_on:
+        :param seconds:
+        :param reason:
+        :return:
+        """
+        with self._lock:
+            if entry_id in self._pending:
+                self.coalesced += 1
+            self._pending[entry_id] = dict(
+                stopped_on=stopped_on, seconds=seconds, stop_reason=reason
+            )
+            self.recorded += 1
+            due = self.clock() - self._last_flush >= self.interval
+
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write every pending entry now.
+
+        :return: the number of entries written
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._last_flush = self.clock()
+
+            if not pending:
+                return 0
+
+            table = models.Entry.__table__
+            with self.engine.begin() as conn:
+                for entry_id, values in pending.items():
+                    conn.execute(
+                        update(table).where(table.c.id == entry_id).values(**values)
+                    )
+
+        with self._lock:
+            self.flushes += 1
+            self.writes += len(pending)
+
+        return len(pending)
+
+    def stats(self) -> CheckpointStats:
+        with self._lock:
+            minutes = max(self.clock() - self._started, 1) / 60
+            return CheckpointStats(
+                interval=self.interval,
+                pending=len(self._pending),
+                recorded=self.recorded,
+                coalesced=self.coalesced,
+                flushes=self.flushes,
+                writes=self.writes,
+                writes_per_minute=self.writes / minutes,
+            )
@@ -0,0 +1,395 @@
+"""
+In-memory columnar copy of the Entry fact table for vectorized reports.
+
+Each entry becomes one slot in a set of NumPy arrays: its started_on and
+stopped_on as epoch seconds (naive datetimes are read as UTC), its seconds,
+the day of its event and its task.  Tasks, projects and clients are held as
+small dimension arrays with dictionary encoded names, so a report is a few
+`searchsorted`/`bincount` calls over the arrays instead of a join.
+
+The store loads the table once, then follows writes through the
+`DataGeneration` counters: nothing is read while the generation stands still,
+changed entries are found through their `updated_on` watermark, and a row
+count check catches deletes (which fall back to a full load).
+
+NumPy is only imported the first time a store is used.
+
+"""
+
+import datetime as DT
+import itertools
+import threading
+import typing as T
+
+import sqlalchemy
+from sqlalchemy import Integer, String, cast, func, or_, select, type_coerce
+
+from . import models
+from .generation import DataGeneration
+from .lazy import lazy_import
+
+np = lazy_import("numpy")
+
+ENTRY_TABLES = ("Entry", "Event")
+DIMENSION_TABLES = ("Task", "Project", "Client")
+SECONDS_PER_DAY = 86400
+
+
+class Breakdown(T.NamedTuple):
+    """
+    One `Queries.BreakdownByConditionsStmt` row, see `reports.BreakdownRow`.
+    """
+
+    client_name: str
+    project_name: str
+    date_when: str
+    task_name: str
+    seconds: int
+    entries: int
+
+
+class Dimension(T.NamedTuple):
+    """
+    A dimension table sorted by id.  `parent` holds the position of the owning
+    row in the parent dimension, `rank` the position of the row's name in
+    `vocabulary`, the sorted distinct names.
+    """
+
+    ids: "np.ndarray"
+    rank: "np.ndarray"
+    parent: "np.ndarray"
+    vocabulary: "np.ndarray"
+
+    def codes(self, ids) -> "np.ndarray":
+        return np.searchsorted(self.ids, ids)
+
+
+def epoch(column):
+    return cast(func.strftime("%s", column), Integer)
+
+
+def epoch_day(column):
+    return cast(func.julianday(column) - 2440587.5, Integer)
+
+
+def to_day(value: DT.date) -> int:
+    return (value - DT.date(1970, 1, 1)).days
+
+
+def encode(ids: list, names: list, parents: "np.ndarray") -> Dimension:
+    vocabulary, rank = np.unique(np.array(names, dtype=str), return_inverse=True)
+    return Dimension(
+        np.array(ids, dtype=np.int64), rank.astype(np.int64), parents, vocabulary
+    )
+
+
+class EntryStore:
+    engine: sqlalchemy.engine.Engine
+    generation: DataGeneration
+
+    # per entry, ordered by entry id
+    ids: "np.ndarray"
+    started: "np.ndarray"
+    stopped: "np.ndarray"
+    seconds: "np.ndarray"
+    day: "np.ndarray"
+    task_ids: "np.ndarray"
+
+    tasks: Dimension
+    projects: Dimension
+    clients: Dimension
+
+    full_loads: int
+    incremental_loads: int
+
+    def __init__(self, engine: sqlalchemy.engine.Engine, generation: DataGeneration):
+        self.engine = engine
+        self.generation = generation
+        self.full_loads = 0
+        self.incremental_loads = 0
+
+        self._lock = threading.Lock()
+        self._entries_generation: int | None = None
+        self._dimensions_generation: int | None = None
+        self._entry_watermark: str | None = None
+        self._event_watermark: str | None = None
+        self._by_day: "np.ndarray | None" = None
+        self._days: "np.ndarray | None" = None
+        self._task_codes: "np.ndarray | None" = None
+
+    def __len__(self) -> int:
+        return len(self.ids) if self._entries_generation is not None else 0
+
+    @staticmethod
+    def _entries_stmt():
+        return (
+            select(
+                models.Entry.id,
+                epoch(models.Entry.started_on),
+                epoch(models.Entry.stopped_on),
+                models.Entry.seconds,
+                epoch_day(models.Event.start_date),
+                models.Event.task_id,
+            )
+            .select_from(models.Entry)
+            .join(models.Event, models.Entry.event_id == models.Event.id)
+            .order_by(models.Entry.id)
+        )
+
+    @staticmethod
+    def _watermarks(conn) -> tuple[str | None, str | None]:
+        # compared as stored text: CURRENT_TIMESTAMP has no fractional part
+        return (
+            conn.execute(
+                select(func.max(type_coerce(models.Entry.updated_on, String)))
+            ).scalar(),
+            conn.execute(
+                select(func.max(type_coerce(models.Event.updated_on, String)))
+            ).scalar(),
+        )
+
+    @staticmethod
+    def _columns(rows: list) -> list["np.ndarray"]:
+        # fromiter over the flattened rows, np.array() on a list of rows is
+        # many times slower
+        table = np.fromiter(
+            itertools.chain.from_iterable(rows), dtype=np.int64, count=len(rows) * 6
+        ).reshape(-1, 6)
+        return [table[:, column].copy() for column in range(6)]
+
+    def sync(self) -> bool:
+        """
+        Bring the arrays up to date with the database.
+
+        :return: False when nothing was written since the last sync
+        """
+        with self._lock:
+            entries = self.generation.of(*ENTRY_TABLES)
+            dimensions = self.generation.of(*DIMENSION_TABLES)
+            changed = False
+
+            with self.engine.connect() as conn:
+                if dimensions != self._dimensions_generation:
+                    self._load_dimensions(conn)
+                    self._dimensions_generation = dimensions
+                    changed = True
+
+                if entries != self._entries_generation:
+                    if self._entries_generation is None or not self._update(conn):
+                        self._load(conn)
+                    self._entries_generation = entries
+                    changed = True
+
+            if changed:
+                self._by_day = self._days = self._task_codes = None
+            return changed
+
+    def _load_dimensions(self, conn) -> None:
+        clients = conn.execute(
+            select(models.Client.id, models.Client.name).order_by(models.Client.id)
+        ).all()
+        self.clients = encode(
+            [row[0] for row in clients],
+            [row[1] for row in clients],
+            np.zeros(len(clients), dtype=np.int64),
+        )
+        projects = conn.execute(
+            select(
+                models.Project.id, models.Project.name, models.Project.client_id
+            ).order_by(models.Project.id)
+        ).all()
+        self.projects = encode(
+            [row[0] for row in projects],
+            [row[1] for row in projects],
+            self.clients.codes(np.array([row[2] for row in projects], dtype=np.int64)),
+        )
+        tasks = conn.execute(
+            select(models.Task.id, models.Task.name, models.Task.project_id).order_by(
+                models.Task.id
+            )
+        ).all()
+        self.tasks = encode(
+            [row[0] for row in tasks],
+            [row[1] for row in tasks],
+            self.projects.codes(np.array([row[2] for row in tasks], dtype=np.int64)),
+        )
+
+    def _load(self, conn) -> None:
+        self._entry_watermark, self._event_watermark = self._watermarks(conn)
+        rows = conn.execute(self._entries_stmt()).all()
+        (
+            self.ids,
+            self.started,
+            self.stopped,
+            self.seconds,
+            self.day,
+            self.task_ids,
+        ) = self._columns(rows)
+        self.full_loads += 1
+
+    def _update(self, conn) -> bool:
+        """
+        Apply the entries changed since the watermarks in place.
+
+        :return: False when a full load is needed instead
+        """
+        watermarks = self._watermarks(conn)
+        stmt = self._entries_stmt().where(
+            or_(
+                type_coerce(models.Entry.updated_on, String)
+                >= (self._entry_watermark or ""),
+                type_coerce(models.Event.updated_on, String)
+                >= (self._event_watermark or ""),
+            )
+        )
+        ids, started, stopped, seconds, day, task_ids = self._columns(
+            conn.execute(stmt).all()
+        )
+
+        position = np.searchsorted(self.ids, ids)
+        known = position < len(self.ids)
+        known[known] = self.ids[position[known]] == ids[known]
+        for mine, theirs in (
+            (self.started, started),
+            (self.stopped, stopped),
+            (self.seconds, seconds),
+            (self.day, day),
+            (self.task_ids, task_ids),
+        ):
+            mine[position[known]] = theirs[known]
+
+        added = ~known
+        if added.any():
+            self.ids = np.concatenate([self.ids, ids[added]])
+            self.started = np.concatenate([self.started, started[added]])
+            self.stopped = np.concatenate([self.stopped, stopped[added]])
+            self.seconds = np.concatenate([self.seconds, seconds[added]])
+            self.day = np.concatenate([self.day, day[added]])
+            self.task_ids = np.concatenate([self.task_ids, task_ids[added]])
+            if len(self.ids) > 1 and (np.diff(self.ids) < 0).any():
+                return False
+
+        count = conn.execute(select(func.count(models.Entry.id))).scalar()
+        if count != len(self.ids):
+            return False
+
+        self._entry_watermark, self._event_watermark = watermarks
+        self.incremental_loads += 1
+        return True
+
+    def _indexes(self) -> tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        Entry positions ordered by day, the days in that order and each
+        entry's task code, rebuilt after every change.
+        """
+        if self._by_day is None:
+            self._by_day = np.argsort(self.day, kind="stable")
+            self._days = self.day[self._by_day]
+            self._task_codes = self.tasks.codes(self.task_ids)
+        return self._by_day, self._days, self._task_codes
+
+    def _owned(self, picked, task_codes, client_id, project_id, task_id):
+        """
+        Narrow entry positions to a client, project or task the way
+        `BreakdownByConditionsStmt` does.
+
+        :return: the positions with their task, project and client codes
+        """
+        task = task_codes[picked]
+        project = self.tasks.parent[task]
+        client = self.projects.parent[project]
+        if client_id is None:
+            return picked, task, project, client
+
+        keep = self.clients.ids[client] == client_id
+        if project_id is not None:
+            keep &= self.projects.ids[project] == project_id
+            if task_id is not None:
+                keep &= self.tasks.ids[task] == task_id
+        return picked[keep], task[keep], project[keep], client[keep]
+
+    def spans(
+        self, low: int, high: int, client_id=None, project_id=None, task_id=None
+    ) -> tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        started, stopped and seconds of the entries overlapping the `low` to
+        `high` epoch seconds, narrowed like `breakdown`.
+        """
+        self.sync()
+        with self._lock:
+            _, _, task_codes = self._indexes()
+            (picked,) = np.nonzero((self.started < high) & (self.stopped >= low))
+            picked = self._owned(picked, task_codes, client_id, project_id, task_id)[0]
+            return self.started[picked], self.stopped[picked], self.seconds[picked]
+
+    def breakdown(
+        self,
+        client_id=None,
+        project_id=None,
+        task_id=None,
+        start_date: DT.date | None = None,
+        end_date: DT.date | None = None,
+    ) -> list[Breakdown]:
+        """
+        The rows of `Queries.BreakdownByConditionsStmt` for the same arguments,
+        grouped and ordered by client, project, date then task name.
+        """
+        self.sync()
+        with self._lock:
+            by_day, days, task_codes = self._indexes()
+            first = 0
+            last = len(days)
+            if start_date is not None:
+                first = np.searchsorted(days, to_day(start_date), side="left")
+            if end_date is not None:
+                last = np.searchsorted(days, to_day(end_date), side="right")
+            picked = by_day[first:last]
+            picked = picked[self.seconds[picked] > 0]
+            picked, task, project, client = self._owned(
+                picked, task_codes, client_id, project_id, task_id
+            )
+
+            if len(picked) == 0:
+                return []
+
+            date_when = self.started[picked] // SECONDS_PER_DAY
+            first_day = date_when.min()
+            spans = (
+                len(self.clients.ids) + 1,
+                len(self.projects.ids) + 1,
+                int(date_when.max() - first_day) + 1,
+                len(self.tasks.ids) + 1,
+            )
+            keys = np.ravel_multi_index(
+                (
+                    self.clients.rank[client],
+                    self.projects.rank[project],
+                    date_when - first_day,
+                    self.tasks.rank[task],
+                ),
+                spans,
+            )
+            groups, group_of = np.unique(keys, return_inverse=True)
+            seconds = np.bincount(group_of, weights=self.seconds[picked])
+            entries = np.bincount(group_of)
+
+            client_rank, project_rank, day_offset, task_rank = np.unravel_index(
+                groups, spans
+            )
+            dates = np.datetime_as_string(
+                (day_offset + first_day).astype("datetime64[D]"), unit="D"
+            )
+
+            return list(
+                map(
+                    Breakdown._make,
+                    zip(
+                        self.clients.vocabulary[client_rank].tolist(),
+                        self.projects.vocabulary[project_rank].tolist(),
+                        dates.tolist(),
+                        self.tasks.vocabulary[task_rank].tolist(),
+                        seconds.astype(np.int64).tolist(),
+                        entries.tolist(),
+                    ),
+                )
+            )
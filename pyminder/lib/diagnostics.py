@@ -0,0 +1,208 @@
+"""
+Per bridge method call statistics, to find the window actions that are slow,
+run N+1 queries or send multi-megabyte payloads.
+
+Every public method of the API object is wrapped in place, the same way
+`StartupProfiler.watch_bridge` does.  A call records its latency, the SQL
+statements its thread ran (counted through the engine's
+`before_cursor_execute` event), the records it returned and the size of its
+JSON payload.  Latency percentiles are taken over the most recent `SAMPLES`
+calls of each method.
+
+"""
+
+import collections
+import datetime as DT
+import functools
+import json
+import math
+import pathlib
+import threading
+import time
+import types
+import typing as T
+
+import sqlalchemy
+from sqlalchemy import event
+
+from .app_types import DiagnosticsReport, MethodStats
+from .log_helper import getLogger
+
+LOG = getLogger(__name__)
+
+SAMPLES = 1024  # latencies kept per method for the percentiles
+
+
+def percentile(ordered: T.Sequence[float], fraction: float) -> float:
+    """
+    Nearest rank percentile of already sorted values, 0 when there are none.
+    """
+    if not ordered:
+        return 0.0
+    rank = max(math.ceil(fraction * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def count_records(result: T.Any) -> int:
+    """
+    Records in a bridge result: the length of a list, 1 for anything else but
+    None.
+    """
+    if result is None:
+        return 0
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    return 1
+
+
+class MethodCalls:
+    calls: int
+    errors: int
+    total_seconds: float
+    latencies: collections.deque[float]
+    statements: int
+    max_statements: int
+    rows: int
+    payload_bytes: int
+    max_payload_bytes: int
+
+    def __init__(self, samples: int = SAMPLES):
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.latencies = collections.deque(maxlen=samples)
+        self.statements = 0
+        self.max_statements = 0
+        self.rows = 0
+        self.payload_bytes = 0
+        self.max_payload_bytes = 0
+
+    def add(
+        self, seconds: float, statements: int, rows: int, payload: int, failed: bool
+    ) -> None:
+        self.calls += 1
+        self.errors += failed
+        self.total_seconds += seconds
+        self.latencies.append(seconds)
+        self.statements += statements
+        self.max_statements = max(self.max_statements, statements)
+        self.rows += rows
+        self.payload_bytes += payload
+        self.max_payload_bytes = max(self.max_payload_bytes, payload)
+
+    def stats(self, name: str) -> MethodStats:
+        ordered = sorted(self.latencies)
+        return MethodStats(
+            name=name,
+            calls=self.calls,
+            errors=self.errors,
+            total_ms=round(self.total_seconds * 1000, 3),
+            p50_ms=round(percentile(ordered, 0.50) * 1000, 3),
+            p95_ms=round(percentile(ordered, 0.95) * 1000, 3),
+            p99_ms=round(percentile(ordered, 0.99) * 1000, 3),
+            max_ms=round(ordered[-1] * 1000, 3) if ordered else 0.0,
+            statements=self.statements,
+            max_statements=self.max_statements,
+            rows=self.rows,
+            payload_bytes=self.payload_bytes,
+            max_payload_bytes=self.max_payload_bytes,
+        )
+
+
+class Diagnostics:
+    engine: sqlalchemy.engine.Engine
+    samples: int
+    started_on: DT.datetime
+    methods: dict[str, MethodCalls]
+
+    def __init__(self, engine: sqlalchemy.engine.Engine, samples: int = SAMPLES):
+        self.engine = engine
+        self.samples = samples
+        self.started_on = DT.datetime.now()
+        self.methods = {}
+        self._lock = threading.Lock()
+        # statements run so far by each thread, a call counts the difference
+        self._local = threading.local()
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+
+    def _before_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        self._local.statements = self._statements() + 1
+
+    def _statements(self) -> int:
+        return getattr(self._local, "statements", 0)
+
+    def record(
+        self,
+        name: str,
+        seconds: float,
+        statements: int = 0,
+        rows: int = 0,
+        payload: int = 0,
+        failed: bool = False,
+    ) -> None:
+        with self._lock:
+            if name not in self.methods:
+                self.methods[name] = MethodCalls(self.samples)
+            self.methods[name].add(seconds, statements, rows, payload, failed)
+
+    def instrument(self, api: object) -> None:
+        """
+        Wrap every public method of `api` in place to record its calls.  Calls
+        from one bridge method to another are recorded for both.
+
+        :param api: the js_api object
+        :return:
+        """
+        for name in dir(api):
+            method = getattr(api, name)
+            if not name.startswith("_") and isinstance(method, types.MethodType):
+                setattr(api, name, self._wrap(api, name, method))
+
+    def _wrap(self, api: object, name: str, method: types.MethodType):
+        @functools.wraps(method.__func__)
+        def call(owner, *args, **kwargs):
+            statements = self._statements()
+            started = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            except BaseException:
+                self.record(
+                    name,
+                    time.perf_counter() - started,
+                    self._statements() - statements,
+                    failed=True,
+                )
+                raise
+
+            seconds = time.perf_counter() - started
+            payload = len(json.dumps(result, default=str).encode())
+            self.record(
+                name,
+                seconds,
+                self._statements() - statements,
+                count_records(result),
+                payload,
+            )
+            return result
+
+        return types.MethodType(call, api)
+
+    def report(self) -> DiagnosticsReport:
+        with self._lock:
+            methods = [calls.stats(name) for name, calls in self.methods.items()]
+        methods.sort(key=lambda stats: stats["total_ms"], reverse=True)
+        return DiagnosticsReport(
+            started_on=self.started_on.isoformat(),
+            methods=methods,
+        )
+
+    def write(self, destination: pathlib.Path) -> DiagnosticsReport:
+        report = self.report()
+        destination.write_text(json.dumps(report, indent=2))
+        LOG.info(f"Bridge call diagnostics written to {destination}")
+        return report
+
+    def close(self) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._before_execute)
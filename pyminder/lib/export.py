@@ -0,0 +1,166 @@
+"""
+Streaming CSV/JSONL exports of report breakdowns and raw entries.
+
+Rows are pulled from the database in batches with `yield_per` and encoded one
+batch at a time, so memory stays flat no matter how large the range is.  The
+flask static server (main.run_flask) serves them as chunked downloads through
+`blueprint`.
+
+"""
+
+import csv
+import datetime as DT
+import io
+import json
+import typing as T
+
+import sqlalchemy
+
+from . import models
+
+BATCH_SIZE = 1000
+
+KINDS = {
+    "breakdown": models.Queries.BreakdownByConditionsStmt,
+    "entries": models.Queries.EntriesByConditionsStmt,
+}
+
+FORMATS = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+
+
+class ExportConditions(T.TypedDict, total=False):
+    client_id: int | None
+    project_id: int | None
+    task_id: int | None
+    start_date: DT.date | None
+    end_date: DT.date | None
+
+
+def stream_rows(
+    engine: sqlalchemy.engine.Engine,
+    stmt,
+    batch_size: int = BATCH_SIZE,
+) -> T.Iterator[tuple[list[str], T.Sequence[sqlalchemy.Row]]]:
+    """
+    Run `stmt` with a server side cursor and yield its column names with each
+    batch of rows, at least once.
+
+    :param engine:
+    :param stmt:
+    :param batch_size:
+    :return:
+    """
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=batch_size).execute(stmt)
+        columns = list(result.keys())
+        batch = []
+        for batch in result.partitions():
+            yield columns, batch
+        if not batch:
+            # nothing matched, a CSV still gets its header
+            yield columns, batch
+
+
+def encode_value(value):
+    if isinstance(value, (DT.date, DT.datetime)):
+        return value.isoformat()
+    if isinstance(value, models.StopReasons):
+        return value.value
+    return value
+
+
+def to_csv(batches) -> T.Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    header = True
+    for columns, rows in batches:
+        if header:
+            writer.writerow(columns)
+            header = False
+        writer.writerows([encode_value(value) for value in row] for row in rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def to_jsonl(batches) -> T.Iterator[str]:
+    for columns, rows in batches:
+        yield "".join(
+            json.dumps(dict(zip(columns, map(encode_value, row)))) + "\n"
+            for row in rows
+        )
+
+
+ENCODERS = {"csv": to_csv, "jsonl": to_jsonl}
+
+
+def export(
+    engine: sqlalchemy.engine.Engine,
+    kind: str,
+    fmt: str,
+    conditions: ExportConditions,
+    batch_size: int = BATCH_SIZE,
+) -> T.Iterator[str]:
+    """
+    Encoded chunks of an export, one per batch of rows.
+
+    :param engine:
+    :param kind: `breakdown` or `entries`
+    :param fmt: `csv` or `jsonl`
+    :param conditions: narrowing, as for `Queries.BreakdownByConditionsStmt`
+    :param batch_size:
+    :return:
+    """
+    stmt = KINDS[kind](
+        conditions.get("client_id"),
+        conditions.get("project_id"),
+        conditions.get("task_id"),
+        conditions.get("start_date"),
+        conditions.get("end_date"),
+    )
+    return ENCODERS[fmt](stream_rows(engine, stmt, batch_size))
+
+
+def blueprint(engine: sqlalchemy.engine.Engine):
+    """
+    Flask routes serving `/export/<kind>.<fmt>` as a chunked download, narrowed
+    by the `client_id`, `project_id`, `task_id`, `start_date` and `end_date`
+    query arguments.
+
+    :param engine:
+    :return:
+    """
+    import flask
+
+    routes = flask.Blueprint("export", __name__)
+
+    def to_date(value: str | None) -> DT.date | None:
+        return DT.date.fromisoformat(value[:10]) if value else None
+
+    @routes.route("/export/<kind>.<fmt>")
+    def download(kind: str, fmt: str):
+        if kind not in KINDS or fmt not in FORMATS:
+            flask.abort(404)
+
+        args = flask.request.args
+        try:
+            conditions = ExportConditions(
+                client_id=args.get("client_id", type=int),
+                project_id=args.get("project_id", type=int),
+                task_id=args.get("task_id", type=int),
+                start_date=to_date(args.get("start_date")),
+                end_date=to_date(args.get("end_date")),
+            )
+        except ValueError:
+            flask.abort(400)
+
+        return flask.Response(
+            export(engine, kind, fmt, conditions),
+            mimetype=FORMATS[fmt],
+            headers={"Content-Disposition": f"attachment; filename={kind}.{fmt}"},
+        )
+
+    return routes
@@ -0,0 +1,93 @@
+"""
+Per table data generation counters.
+
+Every INSERT, UPDATE or DELETE run through the engine marks the table it
+writes to on its connection, and the counters of the marked tables go up when
+that transaction commits (a rollback drops the marks).  Anything derived from
+those tables can be cached and checked for staleness by comparing generations
+instead of re-querying: a reader never sees a new generation before the data
+that goes with it is committed.
+
+"""
+
+import collections
+import re
+import threading
+
+import sqlalchemy
+from sqlalchemy import event
+
+DML = re.compile(
+    r"""^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+["`\[]?(\w+)""",
+    re.IGNORECASE,
+)
+
+
+class DataGeneration:
+    engine: sqlalchemy.engine.Engine
+    counters: collections.Counter[str]
+
+    def __init__(self, engine: sqlalchemy.engine.Engine):
+        self.engine = engine
+        self.counters = collections.Counter()
+        self._lock = threading.Lock()
+        # keys of the tables this instance marked in each connection's `info`
+        self._pending = ("generation_pending", id(self))
+        self._committed = ("generation_committed", id(self))
+        self._listeners = (
+            ("after_cursor_execute", self._after_execute),
+            ("commit", self._commit),
+            ("rollback", self._rollback),
+            ("begin", self._begin),
+            ("checkin", self._checkin),
+        )
+        for name, listener in self._listeners:
+            event.listen(engine, name, listener)
+
+    def _after_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        match = DML.match(statement)
+        if match is not None:
+            conn.info.setdefault(self._pending, set()).add(match.group(1))
+
+    def _commit(self, conn) -> None:
+        # the commit event fires just before the DBAPI commit, a reader in
+        # between could still cache the old rows under the new generation, so
+        # the tables are bumped once more when the connection is used again
+        tables = conn.info.pop(self._pending, set())
+        self.bump(*tables)
+        conn.info.setdefault(self._committed, set()).update(tables)
+
+    def _rollback(self, conn) -> None:
+        conn.info.pop(self._pending, None)
+
+    def _begin(self, conn) -> None:
+        self.bump(*conn.info.pop(self._committed, ()))
+
+    def _checkin(self, dbapi_connection, connection_record) -> None:
+        if connection_record is not None:
+            connection_record.info.pop(self._pending, None)
+            self.bump(*connection_record.info.pop(self._committed, ()))
+
+    def bump(self, *tables: str) -> None:
+        with self._lock:
+            for table in tables:
+                self.counters[table] += 1
+
+    def of(self, *tables: str) -> int:
+        """
+        Generation of the given tables together, it changes whenever a write to
+        any of them is committed.
+
+        :param tables: table names, all tables when empty
+        :return:
+        """
+        with self._lock:
+            if not tables:
+                return sum(self.counters.values())
+            return sum(self.counters[table] for table in tables)
+
+    def close(self) -> None:
+        for name, listener in self._listeners:
+            event.remove(self.engine, name, listener)
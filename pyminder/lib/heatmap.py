@@ -0,0 +1,180 @@
+"""
+Activity heatmaps binned from entry spans.
+
+Each entry's tracked seconds are spread evenly over its started_on..stopped_on
+span, an entry with an empty span counts entirely at started_on.  The bins are
+fixed width (hours or days), so every entry lands in them with a few integer
+divisions and no sorting: the partial bins at either end of its span are
+`bincount`ed directly, and the whole bins in between come from a prefix sum
+over where each entry starts and stops covering them, however many hours or
+days it runs across.
+
+Naive datetimes are taken as UTC epochs, the bins follow the wall clock the
+entries were recorded in.
+
+"""
+
+import datetime as DT
+import itertools
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from . import models
+from .app_types import HeatmapCalendar, HeatmapWeekdayHour, Identifier
+from .columnar import SECONDS_PER_DAY, epoch, to_day
+from .lazy import lazy_import
+
+np = lazy_import("numpy")
+
+SECONDS_PER_HOUR = 3600
+HOURS_PER_DAY = 24
+DAYS_PER_WEEK = 7
+EPOCH_WEEKDAY = 3  # 1970-01-01 was a Thursday, Monday is 0
+
+# started, stopped (epoch seconds) and tracked seconds of a set of entries
+Spans = tuple["np.ndarray", "np.ndarray", "np.ndarray"]
+
+
+def to_epoch(day: DT.date) -> int:
+    return to_day(day) * SECONDS_PER_DAY
+
+
+def load_spans(
+    session: Session,
+    start: DT.date,
+    end: DT.date,
+    client_id: Identifier | None = None,
+    project_id: Identifier | None = None,
+    task_id: Identifier | None = None,
+) -> Spans:
+    """
+    Read the entries overlapping the `start` to `end` days in one scan, for
+    when the columnar entry store is off.
+    """
+    stmt = (
+        select(
+            epoch(models.Entry.started_on),
+            epoch(models.Entry.stopped_on),
+            models.Entry.seconds,
+        )
+        .select_from(models.Entry)
+        .join(models.Event, models.Entry.event_id == models.Event.id)
+        .join(models.Task, models.Event.task_id == models.Task.id)
+        .join(models.Project, models.Task.project_id == models.Project.id)
+        .where(
+            models.Entry.started_on
+            < DT.datetime.combine(end + DT.timedelta(days=1), DT.time()),
+            models.Entry.stopped_on >= DT.datetime.combine(start, DT.time()),
+        )
+    )
+    if client_id is not None:
+        stmt = stmt.where(models.Project.client_id == client_id)
+
+        if project_id is not None:
+            stmt = stmt.where(models.Project.id == project_id)
+
+            if task_id is not None:
+                stmt = stmt.where(models.Task.id == task_id)
+
+    rows = session.execute(stmt).all()
+    table = np.fromiter(
+        itertools.chain.from_iterable(rows), dtype=np.int64, count=len(rows) * 3
+    ).reshape(-1, 3)
+    return table[:, 0], table[:, 1], table[:, 2]
+
+
+def apportion(
+    started: "np.ndarray",
+    stopped: "np.ndarray",
+    seconds: "np.ndarray",
+    origin: int,
+    width: int,
+    bins: int,
+) -> "np.ndarray":
+    """
+    Seconds tracked in each of `bins` consecutive `width` second bins from the
+    `origin` epoch.
+
+    :param started: entry starts, epoch seconds
+    :param stopped: entry stops, epoch seconds
+    :param seconds: tracked seconds of each entry
+    :return: one total per bin
+    """
+    high = origin + width * bins
+    totals = np.zeros(bins + 1)
+
+    point = (stopped <= started) & (started >= origin) & (started < high)
+    totals += np.bincount(
+        (started[point] - origin) // width,
+        weights=seconds[point].astype(np.float64),
+        minlength=bins + 1,
+    )
+
+    spread = stopped > started
+    rate = seconds[spread] / (stopped[spread] - started[spread])
+    # clipped to the bins and relative to the origin
+    first = np.clip(started[spread], origin, high) - origin
+    last = np.clip(stopped[spread], origin, high) - origin
+    first_bin = first // width
+    last_bin = last // width
+
+    # the partial bins at either end of a span, or the span within one bin
+    inside = first_bin == last_bin
+    totals += np.bincount(
+        first_bin[inside],
+        weights=rate[inside] * (last[inside] - first[inside]),
+        minlength=bins + 1,
+    )
+    across = ~inside
+    first_bin, last_bin, rate = first_bin[across], last_bin[across], rate[across]
+    totals += np.bincount(
+        first_bin,
+        weights=rate * ((first_bin + 1) * width - first[across]),
+        minlength=bins + 1,
+    )
+    totals += np.bincount(
+        last_bin,
+        weights=rate * (last[across] - last_bin * width),
+        minlength=bins + 1,
+    )
+
+    # every bin in between is covered whole, a prefix sum of the rates that
+    # start and stop covering them
+    steps = np.bincount(first_bin + 1, weights=rate, minlength=bins + 2)
+    steps -= np.bincount(last_bin, weights=rate, minlength=bins + 2)
+    totals += np.cumsum(steps)[: bins + 1] * width
+
+    return totals[:bins]
+
+
+def calendar(spans: Spans, start: DT.date, end: DT.date) -> HeatmapCalendar:
+    days = (end - start).days + 1
+    totals = apportion(*spans, to_epoch(start), SECONDS_PER_DAY, days)
+    totals = np.rint(totals).astype(np.int64)
+    return HeatmapCalendar(
+        start_date=start.isoformat(),
+        end_date=end.isoformat(),
+        seconds=totals.tolist(),
+        total_seconds=int(totals.sum()),
+    )
+
+
+def weekday_hour(spans: Spans, start: DT.date, end: DT.date) -> HeatmapWeekdayHour:
+    hours = ((end - start).days + 1) * HOURS_PER_DAY
+    hourly = apportion(*spans, to_epoch(start), SECONDS_PER_HOUR, hours)
+
+    hour = np.arange(hours)
+    weekday = (to_day(start) + hour // HOURS_PER_DAY + EPOCH_WEEKDAY) % DAYS_PER_WEEK
+    cells = np.bincount(
+        weekday * HOURS_PER_DAY + hour % HOURS_PER_DAY,
+        weights=hourly,
+        minlength=DAYS_PER_WEEK * HOURS_PER_DAY,
+    )
+    totals = np.rint(cells).astype(np.int64).reshape(DAYS_PER_WEEK, HOURS_PER_DAY)
+    return HeatmapWeekdayHour(
+        start_date=start.isoformat(),
+        end_date=end.isoformat(),
+        seconds=totals.tolist(),
+        total_seconds=int(totals.sum()),
+    )
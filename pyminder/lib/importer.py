@@ -0,0 +1,401 @@
+"""
+Bulk import of time entries from CSV, JSON or JSONL files.
+
+Every record names its client, project and task and carries the entry's
+started_on/stopped_on (plus optional seconds, stop_reason and start_date, the
+day of its event).  The columns of an `/export/entries.csv` or `.jsonl` export
+are accepted as is, so history can be moved between databases.
+
+The whole file is validated first.  Then, inside one transaction, the client,
+project, task and event hierarchy is resolved through in-memory maps loaded
+once (upserting only what is missing) and the entries are written with
+executemany in large batches.  A dry run does all of it and rolls back.
+
+    cd pyminder && python -m lib.importer history.csv --db_path pyminder.sqlite3
+
+"""
+
+import csv
+import datetime as DT
+import json
+import pathlib
+import time
+import typing as T
+
+import sqlalchemy
+import tap
+from sqlalchemy import insert, select
+
+from . import models
+from .app_types import ImportSummary, StopReasons
+from .log_helper import getLogger
+
+LOG = getLogger(__name__)
+
+BATCH_SIZE = 5000
+MAX_ERRORS = 20  # validation errors reported back, the rest are only counted
+
+# field name, then the names it may also go by
+FIELDS = {
+    "client_name": ("client",),
+    "project_name": ("project",),
+    "task_name": ("task",),
+    "started_on": ("start", "started"),
+    "stopped_on": ("stop", "stopped"),
+    "seconds": (),
+    "stop_reason": (),
+    "start_date": ("date",),
+}
+
+NAMES = {field: (field, *aliases) for field, aliases in FIELDS.items()}
+
+Progress = T.Callable[[int, int], None]
+
+
+class ImportRow(T.NamedTuple):
+    line: int
+    client_name: str
+    project_name: str
+    task_name: str
+    start_date: DT.date
+    started_on: DT.datetime
+    stopped_on: DT.datetime
+    seconds: int
+    stop_reason: StopReasons
+
+
+def read_records(path: pathlib.Path) -> T.Iterator[tuple[int, T.Any]]:
+    """
+    Yield each record of a .csv, .json (a list of objects) or .jsonl file with
+    its line (or list position) number.  JSON that cannot be decoded is
+    yielded as a ValueError in place of the record, for `parse_record` to
+    report like any other invalid record.
+    """
+    match path.suffix.lower():
+        case ".csv":
+            with path.open(newline="", encoding="utf-8-sig") as handle:
+                reader = csv.DictReader(handle)
+                for record in reader:
+                    yield reader.line_num, record
+        case ".jsonl" | ".ndjson":
+            with path.open(encoding="utf-8") as handle:
+                for line, text in enumerate(handle, 1):
+                    if not text.strip():
+                        continue
+                    try:
+                        yield line, json.loads(text)
+                    except json.JSONDecodeError as error:
+                        yield line, ValueError(
+                            f"line {line}: invalid JSON, {error.msg}"
+                        )
+        case ".json":
+            with path.open(encoding="utf-8") as handle:
+                try:
+                    records = json.load(handle)
+                except json.JSONDecodeError as error:
+                    yield error.lineno, ValueError(
+                        f"line {error.lineno}: invalid JSON, {error.msg}"
+                    )
+                    return
+            if not isinstance(records, list):
+                yield 1, ValueError("line 1: a .json import must be a list of records")
+                return
+            yield from enumerate(records, 1)
+        case _:
+            raise ValueError(f"Unsupported import format {path.suffix!r}")
+
+
+def pick(record: dict[str, T.Any], field: str) -> T.Any:
+    for name in NAMES[field]:
+        value = record.get(name, None)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def parse_datetime(value: T.Any) -> DT.datetime:
+    """
+    :raises ValueError: unless `value` is an ISO datetime without a UTC offset
+    """
+    parsed = DT.datetime.fromisoformat(str(value))
+    if parsed.tzinfo is not None:
+        raise ValueError(f"{value} has a UTC offset")
+    return parsed
+
+
+def parse_record(line: int, record: T.Any) -> ImportRow:
+    """
+    Validate one raw record.
+
+    :raises ValueError: with a message naming the line and field at fault
+    """
+    if isinstance(record, ValueError):
+        raise record
+    if not isinstance(record, dict):
+        raise ValueError(
+            f"line {line}: expected an object, not {type(record).__name__}"
+        )
+
+    names = []
+    for field in ("client_name", "project_name", "task_name"):
+        value = str(pick(record, field) or "").strip()
+        if not value:
+            raise ValueError(f"line {line}: {field} is missing")
+        names.append(value)
+
+    # entries are stored in naive local time, like the timer records them
+    try:
+        started_on = parse_datetime(pick(record, "started_on"))
+        stopped_on = parse_datetime(pick(record, "stopped_on"))
+    except ValueError:
+        raise ValueError(
+            f"line {line}: started_on/stopped_on must be ISO datetimes"
+            " without a UTC offset"
+        )
+    if stopped_on < started_on:
+        raise ValueError(f"line {line}: stopped_on is before started_on")
+
+    seconds = pick(record, "seconds")
+    try:
+        seconds = (
+            int((stopped_on - started_on).total_seconds())
+            if seconds is None
+            else int(float(seconds))
+        )
+    except (TypeError, ValueError):
+        raise ValueError(f"line {line}: seconds must be a number")
+    if seconds < 0:
+        raise ValueError(f"line {line}: seconds is negative")
+
+    stop_reason = str(pick(record, "stop_reason") or StopReasons.FINISHED.value)
+    try:
+        reason = StopReasons(stop_reason.lower())
+    except ValueError:
+        raise ValueError(f"line {line}: unknown stop_reason {stop_reason!r}")
+
+    start_date = pick(record, "start_date")
+    try:
+        day = (
+            started_on.date()
+            if start_date is None
+            else DT.date.fromisoformat(str(start_date)[:10])
+        )
+    except ValueError:
+        raise ValueError(f"line {line}: start_date must be an ISO date")
+
+    return ImportRow(line, *names, day, started_on, stopped_on, seconds, reason)
+
+
+class Hierarchy:
+    """
+    Client, project, task and event ids by their natural keys, loaded once per
+    import and filled in as missing rows are inserted.
+    """
+
+    def __init__(self, conn: sqlalchemy.Connection):
+        self.conn = conn
+        self.created = dict(clients=0, projects=0, tasks=0, events=0)
+        self.clients: dict[str, int] = {}
+        # the oldest client wins when names repeat, clients are not unique
+        for client_id, name in conn.execute(
+            select(models.Client.id, models.Client.name).order_by(
+                models.Client.id.desc()
+            )
+        ):
+            self.clients[name] = client_id
+        self.projects: dict[tuple[int, str], int] = {
+            (client_id, name): project_id
+            for project_id, client_id, name in conn.execute(
+                select(models.Project.id, models.Project.client_id, models.Project.name)
+            )
+        }
+        self.tasks: dict[tuple[int, str], int] = {
+            (project_id, name): task_id
+            for task_id, project_id, name in conn.execute(
+                select(models.Task.id, models.Task.project_id, models.Task.name)
+            )
+        }
+        self.events: dict[tuple[int, DT.date], int] = {
+            (task_id, day): event_id
+            for event_id, task_id, day in conn.execute(
+                select(models.Event.id, models.Event.task_id, models.Event.start_date)
+            )
+        }
+
+    def _insert(self, kind: str, model, lookup: dict, keys: list[tuple], *key: str):
+        """
+        Upsert the missing rows in batches and map their new ids by natural key.
+        """
+        if not keys:
+            return
+        rows = [dict(zip(key, values)) for values in keys]
+        for values, new_id in zip(keys, model.Upsert(self.conn, rows, key=key)):
+            lookup[values[0] if len(values) == 1 else values] = new_id
+        self.created[kind] += len(rows)
+
+    def resolve(self, rows: T.Sequence[ImportRow]) -> list[int]:
+        """
+        Event id of every row, creating the owners that don't exist yet.
+        """
+        names = sorted({row.client_name for row in rows} - self.clients.keys())
+        self._insert(
+            "clients",
+            models.Client,
+            self.clients,
+            [(name,) for name in names],
+            "name",
+        )
+
+        keys = {(self.clients[row.client_name], row.project_name) for row in rows}
+        missing = sorted(keys - self.projects.keys())
+        self._insert(
+            "projects",
+            models.Project,
+            self.projects,
+            missing,
+            "client_id",
+            "name",
+        )
+
+        def task_key(row: ImportRow) -> tuple[int, str]:
+            client_id = self.clients[row.client_name]
+            return self.projects[client_id, row.project_name], row.task_name
+
+        missing = sorted({task_key(row) for row in rows} - self.tasks.keys())
+        self._insert(
+            "tasks",
+            models.Task,
+            self.tasks,
+            missing,
+            "project_id",
+            "name",
+        )
+
+        event_keys = [(self.tasks[task_key(row)], row.start_date) for row in rows]
+        missing = sorted(set(event_keys) - self.events.keys())
+        self._insert(
+            "events",
+            models.Event,
+            self.events,
+            missing,
+            "task_id",
+            "start_date",
+        )
+        return [self.events[key] for key in event_keys]
+
+
+def import_entries(
+    engine: sqlalchemy.engine.Engine,
+    path: pathlib.Path,
+    dry_run: bool = False,
+    progress: Progress | None = None,
+    batch_size: int = BATCH_SIZE,
+) -> ImportSummary:
+    """
+    Import every entry of `path` in one transaction, or nothing at all when a
+    record fails validation.
+
+    :param engine:
+    :param path: a .csv, .json or .jsonl file
+    :param dry_run: validate and resolve everything, then roll back
+    :param progress: called with (entries written, entries total) per batch
+    :param batch_size: entries per executemany
+    :return:
+    """
+    started = time.perf_counter()
+    summary = ImportSummary(
+        path=str(path),
+        dry_run=dry_run,
+        records=0,
+        entries=0,
+        clients=0,
+        projects=0,
+        tasks=0,
+        events=0,
+        errors=[],
+        error_count=0,
+        seconds=0.0,
+    )
+
+    rows = []
+    for line, record in read_records(path):
+        summary["records"] += 1
+        try:
+            rows.append(parse_record(line, record))
+        except ValueError as error:
+            summary["error_count"] += 1
+            if len(summary["errors"]) < MAX_ERRORS:
+                summary["errors"].append(str(error))
+
+    if summary["error_count"] == 0:
+        with engine.connect() as conn, conn.begin() as transaction:
+            hierarchy = Hierarchy(conn)
+            event_ids = hierarchy.resolve(rows)
+            for first in range(0, len(rows), batch_size):
+                conn.execute(
+                    insert(models.Entry),
+                    [
+                        dict(
+                            event_id=event_id,
+                            started_on=row.started_on,
+                            stopped_on=row.stopped_on,
+                            seconds=row.seconds,
+                            stop_reason=row.stop_reason,
+                        )
+                        for row, event_id in zip(
+                            rows[first : first + batch_size],
+                            event_ids[first : first + batch_size],
+                        )
+                    ],
+                )
+                summary["entries"] = min(first + batch_size, len(rows))
+                if progress is not None:
+                    progress(summary["entries"], len(rows))
+            summary.update(hierarchy.created)
+            if dry_run:
+                transaction.rollback()
+
+    summary["seconds"] = round(time.perf_counter() - started, 3)
+    LOG.info(
+        f"Imported {summary['entries']} entries from {path}"
+        f"{' (dry run)' if dry_run else ''} with {summary['error_count']} errors"
+        f" in {summary['seconds']}s"
+    )
+    return summary
+
+
+class ImportArgs(tap.Tap):
+    """
+    Bulk import time entries into a PyMinder database
+    """
+
+    source: pathlib.Path  # .csv, .json or .jsonl file of entries
+    db_path: pathlib.Path = pathlib.Path("pyminder.sqlite3")
+    dry_run: bool = False  # validate and resolve everything, write nothing
+    batch_size: int = BATCH_SIZE
+
+    def configure(self) -> None:
+        self.add_argument("source", type=pathlib.Path)
+
+
+def main():
+    args = ImportArgs().parse_args()
+    assert args.source.exists(), f"Cannot find {args.source} to import!"
+
+    engine, _ = models.connect(args.db_path)
+
+    def report(done: int, total: int) -> None:
+        print(f"\r{done}/{total} entries", end="", flush=True)
+
+    summary = import_entries(
+        engine, args.source, args.dry_run, report, batch_size=args.batch_size
+    )
+    print()
+    for error in summary["errors"]:
+        print(error)
+    print(json.dumps({k: v for k, v in summary.items() if k != "errors"}, indent=2))
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Deferred imports for heavy optional dependencies.
+
+`lazy_import("flask")` returns a stand-in module that only runs the real import
+the first time one of its attributes is used, so code paths that never touch
+it (the main window, the timer) don't pay for loading it.
+
+"""
+import types
+import typing as T
+
+
+class LazyModule(types.ModuleType):
+    """
+    Module proxy that imports `__name__` on first attribute access.
+    """
+
+    def __getattr__(self, attr: str) -> T.Any:
+        # __import__ rather than importlib so `-X importtime` still reports it
+        module = __import__(self.__name__, fromlist=("__name__",))
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self.__name__!r}>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """
+    Get a module that is imported the first time it is used.
+
+    PyInstaller's analysis only follows static imports, so every module
+    imported this way must also be listed in `hiddenimports` in main.spec or
+    the frozen build goes without it.
+
+    :param name: dotted module name, as given to `import`
+    :return:
+    """
+    return LazyModule(name)
@@ -5,6 +5,7 @@ import pathlib
 import typing as T
 
 import sqlalchemy
+from sqlalchemy.pool import QueuePool
 from sqlalchemy import (
     select,
     update,
@@ -15,8 +16,14 @@ from sqlalchemy import (
     and_,
     delete,
     CheckConstraint,
+    Index,
     true,
+    DDL,
+    insert,
+    tuple_,
 )
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.hybrid import hybrid_property, hybrid_method
 from sqlalchemy.orm import (
     Session,
@@ -24,14 +31,17 @@ from sqlalchemy.orm import (
     Mapped,
     mapped_column,
     relationship,
+    column_property,
+    selectinload,
     declared_attr,
     scoped_session,
     sessionmaker,
     InstrumentedAttribute,
+    aliased,
 )
 
 from . import app_types
-from .app_types import TaskStatus, StopReasons, Identifier, TimeObject
+from .app_types import TaskStatus, StopReasons, Identifier
 from .log_helper import getLogger
 
 log = getLogger(__name__)
@@ -48,10 +58,105 @@ def db_with(db_url="sqlite:///test.sqlite3", echo=True):
         yield session
 
 
-def connect(db_path: pathlib.Path, echo=False, create=True):
+class StorageProfile(T.NamedTuple):
+    """
+    SQLite pragmas applied to every new connection plus pool sizing.
+
+    See https://www.sqlite.org/pragma.html for what each pragma does.
+    """
+
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    mmap_size: int = 0  # bytes
+    cache_size: int = -2000  # negative is KiB, positive is pages
+    temp_store: str = "DEFAULT"
+    busy_timeout: int = 5000  # milliseconds
+    foreign_keys: bool = True
+    pool_size: int = 5
+    max_overflow: int = 10
+
+
+STORAGE_PROFILES: dict[str, StorageProfile] = {
+    # What PyMinder ran with before profiles existed: SQLite's own defaults.
+    "legacy": StorageProfile(
+        journal_mode="DELETE",
+        synchronous="FULL",
+        foreign_keys=False,
+        pool_size=10,
+        max_overflow=20,
+    ),
+    # WAL lets reports read while the timer writes and NORMAL only fsyncs on
+    # WAL checkpoints, a crash can lose the last commits but not corrupt.
+    "balanced": StorageProfile(
+        synchronous="NORMAL",
+        mmap_size=64 * 1024 * 1024,
+        cache_size=-16000,
+        temp_store="MEMORY",
+    ),
+    "durable": StorageProfile(
+        synchronous="FULL",
+        cache_size=-8000,
+        busy_timeout=10000,
+    ),
+    # Never fsync, for throwaway databases, imports and benchmarks.
+    "fast": StorageProfile(
+        synchronous="OFF",
+        mmap_size=256 * 1024 * 1024,
+        cache_size=-64000,
+        temp_store="MEMORY",
+    ),
+}
+
+DEFAULT_STORAGE_PROFILE = "balanced"
+
+
+def apply_storage_profile(engine: sqlalchemy.engine.Engine, profile: StorageProfile):
+    """
+    Set the profile's pragmas on every connection `engine` opens.
+
+    :param engine:
+    :param profile:
+    :return:
+    """
+
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"PRAGMA journal_mode={profile.journal_mode}")
+            cursor.execute(f"PRAGMA synchronous={profile.synchronous}")
+            cursor.execute(f"PRAGMA mmap_size={int(profile.mmap_size)}")
+            cursor.execute(f"PRAGMA cache_size={int(profile.cache_size)}")
+            cursor.execute(f"PRAGMA temp_store={profile.temp_store}")
+            cursor.execute(f"PRAGMA busy_timeout={int(profile.busy_timeout)}")
+            cursor.execute(
+                f"PRAGMA foreign_keys={'ON' if profile.foreign_keys else 'OFF'}"
+            )
+        finally:
+            cursor.close()
+
+    sqlalchemy.event.listen(engine, "connect", on_connect)
+
+
+def connect(
+    db_path: pathlib.Path,
+    echo=False,
+    create=True,
+    profile: str | StorageProfile = DEFAULT_STORAGE_PROFILE,
+):
+    if isinstance(profile, str):
+        profile = STORAGE_PROFILES[profile]
+
+    # One writer at a time is all SQLite allows, a small queue of reused
+    # connections keeps the pragmas and page cache warm across calls.
     engine = create_engine(
-        f"sqlite:///{db_path}", echo=echo, pool_size=10, max_overflow=20
+        f"sqlite:///{db_path}",
+        echo=echo,
+        poolclass=QueuePool,
+        pool_size=profile.pool_size,
+        max_overflow=profile.max_overflow,
     )
+    apply_storage_profile(engine, profile)
+
     if create:
         Base.metadata.create_all(engine, checkfirst=True)
 
@@ -60,6 +165,50 @@ def connect(db_path: pathlib.Path, echo=False, create=True):
     return engine, scoped_session(session_factory)
 
 
+def seconds_to_time(total_seconds: int | float | None) -> app_types.TimeObject:
+    """
+    Split a number of seconds into an hours/minutes/seconds time object.
+
+    :param total_seconds:
+    :return:
+    """
+    total = total_seconds if total_seconds and total_seconds > 0 else 0
+    hours, remainder = divmod(total, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return app_types.TimeObject(hours=hours, minutes=minutes, seconds=round(seconds))
+
+
+def date_range(
+    column, start: DT.date | None, end: DT.date | None
+) -> tuple[sqlalchemy.ColumnElement[bool], ...]:
+    """
+    Conditions keeping `column` between the `start` and `end` days, both
+    included, as the half open `column >= start AND column < end + 1 day` an
+    index can range scan.  A missing bound is left open.
+
+    :param column: a date column, Event.start_date mostly
+    :param start:
+    :param end:
+    :return: conditions to splat into `.where()`
+    """
+    conditions = []
+    if start is not None:
+        conditions.append(column >= start)
+    if end is not None:
+        conditions.append(column < end + DT.timedelta(days=1))
+    return tuple(conditions)
+
+
+UPSERT_BATCH_SIZE = 500
+SHORTCUT_CAPACITY = 4  # most recently used shortcuts kept
+
+# INSERT constructs with .on_conflict_do_nothing(), by dialect name
+UPSERT_DIALECTS = {
+    "sqlite": sqlite_insert,
+    "postgresql": postgresql_insert,
+}
+
+
 class Base(DeclarativeBase):
     id: Mapped[int] = mapped_column(primary_key=True)
     is_active: Mapped[bool] = mapped_column(default=True, server_default=true())
@@ -75,6 +224,10 @@ class Base(DeclarativeBase):
         enum.Enum: sqlalchemy.Enum(enum.Enum),
     }
 
+    # read server generated values such as updated_on back with RETURNING when
+    # flushing, instead of a refresh SELECT the next time they are accessed
+    __mapper_args__ = {"eager_defaults": True}
+
     @classmethod
     def Touch(cls, session: Session, fetch_id: int):
         stmt = update(cls).where(cls.id == fetch_id).values()
@@ -133,21 +286,99 @@ class Base(DeclarativeBase):
         return session.execute(stmt).scalars().all()
 
     @classmethod
-    def GetOrCreate(cls, session: Session, defaults=None, **kwargs) -> T.Self | None:
-        instance = session.execute(select(cls).filter_by(**kwargs)).one_or_none()
-        if instance:
-            return instance[0]
+    def UniqueKey(cls, columns: T.Iterable[str]) -> tuple[str, ...] | None:
+        """
+        The columns of the unique constraint made of exactly `columns`, if the
+        table has one.
+        """
+        wanted = set(columns)
+        for constraint in cls.__table__.constraints:
+            if isinstance(constraint, UniqueConstraint):
+                names = tuple(column.name for column in constraint.columns)
+                if set(names) == wanted:
+                    return names
+        return None
+
+    @classmethod
+    def Upsert(
+        cls,
+        session: Session | sqlalchemy.Connection,
+        rows: T.Sequence[dict[str, T.Any]],
+        key: T.Sequence[str] | None = None,
+        batch_size: int = UPSERT_BATCH_SIZE,
+    ) -> list[int]:
+        """
+        Insert the rows that don't exist yet and return the id of every row,
+        created or found, in the order given.  Never commits.
+
+        When `key` is a unique constraint of the table this is
+        `INSERT ... ON CONFLICT DO NOTHING RETURNING` in batches, plus one
+        SELECT per batch for the rows that already existed.  Otherwise the
+        existing rows are selected first and only the rest inserted.
+
+        :param session: a Session or a Connection
+        :param rows: column values, every row with the same columns
+        :param key: the columns identifying a row, the whole row by default,
+            the other columns are only used when it is created
+        :param batch_size: rows per statement
+        :return:
+        """
+        if not rows:
+            return []
+
+        key = tuple(key or rows[0])
+        columns = [cls.__table__.c[name] for name in key]
+        found: dict[tuple, int] = {}
+        # first row of each key, duplicates resolve to the same id
+        pending = list({tuple(row[name] for name in key): row for row in rows}.items())
+
+        def select_existing(keys: T.Sequence[tuple]) -> None:
+            # the oldest row wins where the key is not unique
+            stmt = (
+                select(cls.id, *columns)
+                .where(tuple_(*columns).in_(keys))
+                .order_by(cls.id.desc())
+            )
+            for record_id, *values in session.execute(stmt):
+                found[tuple(values)] = record_id
+
+        bind = session.get_bind() if isinstance(session, Session) else session
+        dialect = bind.dialect.name
+        if cls.UniqueKey(key) is not None and dialect in UPSERT_DIALECTS:
+            for first in range(0, len(pending), batch_size):
+                batch = pending[first : first + batch_size]
+                stmt = (
+                    UPSERT_DIALECTS[dialect](cls)
+                    .values([row for _, row in batch])
+                    .on_conflict_do_nothing(index_elements=key)
+                    .returning(cls.id, *columns)
+                )
+                for record_id, *values in session.execute(stmt):
+                    found[tuple(values)] = record_id
+                conflicts = [values for values, _ in batch if values not in found]
+                if conflicts:
+                    select_existing(conflicts)
         else:
-            kwargs |= defaults or {}
-            new_instance = cls(**kwargs)
-            try:
-                session.add(new_instance)
-                session.commit()
-            except sqlalchemy.exc.IntegrityError:  # type: ignore
-                session.rollback()
-                return session.execute(select(cls).filter_by(**kwargs)).one()[0]
-            else:
-                return new_instance
+            for first in range(0, len(pending), batch_size):
+                select_existing(
+                    [values for values, _ in pending[first : first + batch_size]]
+                )
+            missing = [row for values, row in pending if values not in found]
+            if missing:
+                stmt = insert(cls).returning(cls.id, *columns)
+                for record_id, *values in session.execute(stmt, missing):
+                    found[tuple(values)] = record_id
+
+        return [found[tuple(row[name] for name in key)] for row in rows]
+
+    @classmethod
+    def GetOrCreate(cls, session: Session, defaults=None, **kwargs) -> T.Self:
+        """
+        Get the record matching `kwargs`, creating it with `defaults` on top
+        if there is none.  Never commits, see `Upsert`.
+        """
+        (record_id,) = cls.Upsert(session, [kwargs | (defaults or {})], key=kwargs)
+        return session.get_one(cls, record_id)
 
     @declared_attr.directive
     def __tablename__(self) -> str:
@@ -175,12 +406,15 @@ class Client(Base):
         "Shortcut", back_populates="client", cascade="all, delete-orphan"
     )
 
+    if T.TYPE_CHECKING:
+        projects_count: int  # column_property, see below the model definitions
+
     def to_dict(self) -> app_types.Client:
         return app_types.Client(
             name=self.name,
             id=self.id,
             is_active=self.is_active,
-            projects_count=len(self.projects),
+            projects_count=self.projects_count,
             time=None,
             created_on=self.created_on.isoformat(),
             updated_on=self.updated_on.isoformat(),
@@ -191,36 +425,25 @@ class Client(Base):
         cls, session: Session, client_id, start: DT.date, end: DT.date
     ) -> app_types.TimeObject:
         stmt = (
-            select(func.sum(Entry.seconds).label("total_seconds"))
-            .join(Project, Project.client_id == client_id)
-            .join(Task, Task.project_id == Project.id)
-            .join(Event, Event.task_id == Task.id)
-            .where(Event.by_task_and_dates(Task.id, start, end))
-            .where(Entry.event_id == Event.id)
-        )
-        total_seconds = session.execute(stmt).scalar() or 0
-        hours, remainder = divmod(total_seconds, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        return app_types.TimeObject(
-            hours=hours, minutes=minutes, seconds=round(seconds)
+            select(func.sum(Event.duration).label("total_seconds"))
+            .select_from(Event)
+            .join(Task, Event.task_id == Task.id)
+            .join(Project, Task.project_id == Project.id)
+            .where(Project.client_id == client_id)
+            .where(*date_range(Event.start_date, start, end))
         )
+        return seconds_to_time(session.execute(stmt).scalar())
 
     @classmethod
     def GetAllTime(cls, session: Session, client_id) -> app_types.TimeObject:
         stmt = (
-            select(func.sum(Entry.seconds).label("total_seconds"))
-            .join(Project, Project.client_id == client_id)
-            .join(Task, Task.project_id == Project.id)
-            .join(Event, Event.task_id == Task.id)
-            .where(Entry.event_id == Event.id)
-        )
-        total_seconds = session.execute(stmt).scalar()
-        total = total_seconds if total_seconds and total_seconds > 0 else 0
-        hours, remainder = divmod(total, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        return app_types.TimeObject(
-            hours=hours, minutes=minutes, seconds=round(seconds)
+            select(func.sum(Event.duration).label("total_seconds"))
+            .select_from(Event)
+            .join(Task, Event.task_id == Task.id)
+            .join(Project, Task.project_id == Project.id)
+            .where(Project.client_id == client_id)
         )
+        return seconds_to_time(session.execute(stmt).scalar())
 
 
 class Project(Base):
@@ -240,6 +463,9 @@ class Project(Base):
         "Shortcut", back_populates="project", cascade="all, delete-orphan"
     )
 
+    if T.TYPE_CHECKING:
+        tasks_count: int  # column_property, see below the model definitions
+
     __table_args__ = (
         UniqueConstraint("client_id", "name", name="unique_client"),
         CheckConstraint(
@@ -254,7 +480,7 @@ class Project(Base):
             name=self.name,
             client_id=self.client_id,
             is_active=self.is_active,
-            tasks_count=len(self.tasks),
+            tasks_count=self.tasks_count,
             time=None,
             created_on=self.created_on.isoformat(),
             updated_on=self.updated_on.isoformat(),
@@ -277,36 +503,25 @@ class Project(Base):
         cls, session: Session, project_id: Identifier
     ) -> app_types.TimeObject:
         stmt = (
-            select(func.sum(Entry.seconds).label("total_seconds"))
-            .join(Task, Task.project_id == project_id)
-            .join(Event, Event.task_id == Task.id)
-            .where(Entry.event_id == Event.id)
-        )
-        total_seconds = session.execute(stmt).scalar() or 0
-
-        hours, remainder = divmod(total_seconds, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        return app_types.TimeObject(
-            hours=hours, minutes=minutes, seconds=round(seconds)
+            select(func.sum(Event.duration).label("total_seconds"))
+            .select_from(Event)
+            .join(Task, Event.task_id == Task.id)
+            .where(Task.project_id == project_id)
         )
+        return seconds_to_time(session.execute(stmt).scalar())
 
     @classmethod
     def GetTimeBetweenDates(
         cls, session, project_id, start, end
     ) -> app_types.TimeObject:
         stmt = (
-            select(func.sum(Entry.seconds).label("total_seconds"))
-            .join(Task, Task.project_id == project_id)
-            .join(Event, Event.task_id == Task.id)
-            .join(Entry, Entry.event_id == Event.id)
-            .where(and_(Event.start_date > start, Event.start_date < end))
-        )
-        total_seconds = session.execute(stmt).scalar() or 0
-        hours, remainder = divmod(total_seconds, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        return app_types.TimeObject(
-            hours=hours, minutes=minutes, seconds=round(seconds)
+            select(func.sum(Event.duration).label("total_seconds"))
+            .select_from(Event)
+            .join(Task, Event.task_id == Task.id)
+            .where(Task.project_id == project_id)
+            .where(*date_range(Event.start_date, start, end))
         )
+        return seconds_to_time(session.execute(stmt).scalar())
 
 
 class Task(Base):
@@ -326,6 +541,9 @@ class Task(Base):
         "Shortcut", back_populates="task", cascade="all, delete-orphan"
     )
 
+    if T.TYPE_CHECKING:
+        events_count: int  # column_property, see below the model definitions
+
     __table_args__ = (
         UniqueConstraint("project_id", "name", name="unique_task"),
         CheckConstraint("length(trim(name)) != 0", name="name_not_empty"),
@@ -338,7 +556,7 @@ class Task(Base):
             project_id=self.project_id,
             status=self.status.value,
             is_active=self.is_active,
-            events_count=len(self.events),
+            events_count=self.events_count,
             time=None,
             created_on=self.created_on.isoformat(),
             updated_on=self.updated_on.isoformat(),
@@ -366,30 +584,18 @@ class Task(Base):
     @classmethod
     def GetTimeBetweenDates(cls, session, task_id, start, end) -> app_types.TimeObject:
         stmt = (
-            select(func.sum(Entry.seconds).label("total_seconds"))
-            .join(Event, Event.task_id == task_id)
-            .join(Entry, Entry.event_id == Event.id)
-            .where(and_(Event.start_date > start, Event.start_date < end))
+            select(func.sum(Event.duration).label("total_seconds"))
+            .where(Event.task_id == task_id)
+            .where(*date_range(Event.start_date, start, end))
         )
-        total_seconds = session.execute(stmt).scalar() or 0
-        hours, remainder = divmod(total_seconds, 3600)
-        minutes, seconds = divmod(remainder, 60)
-
-        return TimeObject(hours=hours, minutes=minutes, seconds=seconds)
+        return seconds_to_time(session.execute(stmt).scalar())
 
     @classmethod
     def GetAllTime(cls, session, task_id) -> app_types.TimeObject:
-        stmt = (
-            select(func.sum(Entry.seconds).label("total_seconds"))
-            .join(Event, Event.task_id == task_id)
-            .where(Entry.event_id == Event.id)
+        stmt = select(func.sum(Event.duration).label("total_seconds")).where(
+            Event.task_id == task_id
         )
-
-        total_seconds = session.execute(stmt).scalar() or 0
-        hours, remainder = divmod(total_seconds, 3600)
-        minutes, seconds = divmod(remainder, 60)
-
-        return TimeObject(hours=hours, minutes=minutes, seconds=seconds)
+        return seconds_to_time(session.execute(stmt).scalar())
 
     @classmethod
     def Update_Status(cls, session: Session, task_id: Identifier, status: bool) -> bool:
@@ -413,15 +619,27 @@ class Event(Base):
     details: Mapped[str] = mapped_column(default="")
     notes: Mapped[str] = mapped_column(default="")
 
-    duration: Mapped[int] = mapped_column(default=0)  # seconds
+    # seconds, a counter cache of sum(Entry.seconds) kept in sync by the
+    # ENTRY_DURATION_TRIGGERS below.  Use `RebuildDurations` to repair it.
+    duration: Mapped[int] = mapped_column(default=0)
 
     entries: Mapped[list["Entry"]] = relationship(
         "Entry", back_populates="event", cascade="all, delete-orphan"
     )
 
-    __table_args__ = (UniqueConstraint("task_id", "start_date", name="unique_event"),)
+    __table_args__ = (
+        UniqueConstraint("task_id", "start_date", name="unique_event"),
+        Index("ix_Event_start_date_task_id", "start_date", "task_id"),
+    )
+
+    if T.TYPE_CHECKING:
+        entries_count: int  # column_property, see below the model definitions
 
-    def to_dict(self) -> app_types.Event:
+    def to_dict(self, include_entries: bool = False) -> app_types.Event:
+        """
+        :param include_entries: serialize the entries too, load them with
+            `with_entries` first when doing this for many events.
+        """
         return app_types.Event(
             id=self.id,
             task_id=self.task_id,
@@ -429,12 +647,22 @@ class Event(Base):
             details=self.details,
             notes=self.notes,
             is_active=self.is_active,
-            entries=[entry.to_dict() for entry in self.entries],
-            time=None,
+            entries_count=self.entries_count,
+            entries=(
+                [entry.to_dict() for entry in self.entries] if include_entries else None
+            ),
+            time=self.get_time(),
             created_on=self.created_on.isoformat(),
             updated_on=self.updated_on.isoformat(),
         )
 
+    @classmethod
+    def with_entries(cls, stmt, include_entries: bool = True):
+        """
+        Batch load the entries of every event `stmt` returns in one extra query.
+        """
+        return stmt.options(selectinload(cls.entries)) if include_entries else stmt
+
     def create_entry(
         self,
         start: DT.datetime,
@@ -453,19 +681,22 @@ class Event(Base):
         return entry
 
     def get_time(self):
-        total_seconds = sum(entry.seconds for entry in self.entries)
-        hours, remainder = divmod(total_seconds, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        return TimeObject(hours=hours, minutes=minutes, seconds=seconds)
+        return seconds_to_time(self.duration)
 
     @classmethod
-    def GetByTask(cls, session, task_id) -> T.Sequence["Event"]:
+    def GetByTask(
+        cls, session, task_id, include_entries: bool = False
+    ) -> T.Sequence["Event"]:
         stmt = select(cls).filter(cls.by_task(task_id))
+        stmt = cls.with_entries(stmt, include_entries)
         return session.execute(stmt).scalars().all()
 
     @classmethod
-    def GetActiveByTask(cls, session, task_id) -> T.Sequence["Event"]:
+    def GetActiveByTask(
+        cls, session, task_id, include_entries: bool = False
+    ) -> T.Sequence["Event"]:
         stmt = select(cls).filter(cls.by_task(task_id)).where(cls.is_active == true())
+        stmt = cls.with_entries(stmt, include_entries)
         return session.execute(stmt).scalars().all()
 
     @hybrid_method
@@ -479,72 +710,78 @@ class Event(Base):
         start_date: DT.date,
         end_date: DT.date,
     ):
-        return and_(
-            self.by_task(task_id),
-            and_(Event.start_date <= start_date, Event.start_date <= end_date),
-        )
+        return and_(self.by_task(task_id), self.by_dates(start_date, end_date))
 
     @hybrid_method
     def by_dates(self, start_date: DT.date, end_date: DT.date):
-        return and_(Event.start_date <= start_date, Event.start_date <= end_date)
+        return and_(*date_range(self.start_date, start_date, end_date))
 
     @classmethod
     def GetOrCreateByDate(cls, session, task_id, my_date):
+        if isinstance(my_date, DT.datetime):
+            my_date = my_date.date()
         return cls.GetOrCreate(session, task_id=task_id, start_date=my_date)
 
     @hybrid_property
     def total_seconds(self):
-        return sum(entry.seconds for entry in self.entries)
+        return self.duration
 
     @classmethod
     def GetTimeBetweenDates(
         cls, session, event_id: Identifier, start: DT.date, end: DT.date
     ) -> app_types.TimeObject:
         stmt = (
-            select(func.sum(Entry.seconds).label("total_seconds"))
-            .join(Entry, Entry.event_id == event_id)
+            select(cls.duration.label("total_seconds"))
+            .where(cls.id == event_id)
             .filter(cls.by_dates(start, end))
         )
-        total_seconds = session.execute(stmt).scalar().total_seconds or 0
-
-        hours, remainder = divmod(total_seconds, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        return TimeObject(hours=hours, minutes=minutes, seconds=seconds)
+        return seconds_to_time(session.execute(stmt).scalar())
 
     @classmethod
     def GetAllTime(cls, session, event_id: Identifier) -> app_types.TimeObject:
-        stmt = (
-            select(func.sum(Entry.seconds).label("total_seconds"))
-            .select_from(Event)
-            .join(Entry, Entry.event_id == event_id)
-        )
-        total_seconds = session.execute(stmt).scalar() or 0
+        stmt = select(cls.duration.label("total_seconds")).where(cls.id == event_id)
+        return seconds_to_time(session.execute(stmt).scalar())
 
-        hours, remainder = divmod(total_seconds, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        return TimeObject(hours=hours, minutes=minutes, seconds=seconds)
+    @classmethod
+    def RebuildDurations(cls, session: Session) -> int:
+        """
+        Recompute every Event.duration from its entries and (re)install the
+        triggers that keep it in sync.
+
+        :param session:
+        :return: the number of events whose duration was wrong
+        """
+        for trigger in ENTRY_DURATION_TRIGGERS:
+            session.execute(sqlalchemy.text(trigger))
+
+        actual = (
+            select(func.coalesce(func.sum(Entry.seconds), 0))
+            .where(Entry.event_id == cls.id)
+            .scalar_subquery()
+        )
+        stmt = update(cls).where(cls.duration.is_not(actual)).values(duration=actual)
+        return session.execute(stmt).rowcount
 
     @classmethod
-    def GetByDate(cls, session, task_id, event_date):
+    def GetByDate(cls, session, task_id, event_date, include_entries: bool = False):
         smt = (
             select(cls)
             .where(cls.task_id == task_id)
             .where(cls.start_date == event_date)
         )
-        return session.execute(smt).one_or_none()
+        smt = cls.with_entries(smt, include_entries)
+        return session.execute(smt).scalars().one_or_none()
 
     @classmethod
     def GetAllEventDatesByTask(
         cls, session, task_id: Identifier | InstrumentedAttribute[int]
     ):
         stmt = select(cls.id, cls.start_date).where(cls.task_id == task_id)
-        return session.execute(stmt).scalars().all()
+        return session.execute(stmt).all()
 
 
 class Entry(Base):
-    event_id: Mapped[int] = mapped_column(
-        ForeignKey("Event.id", ondelete="CASCADE"), index=True
-    )
+    event_id: Mapped[int] = mapped_column(ForeignKey("Event.id", ondelete="CASCADE"))
     event: Mapped[Event] = relationship("Event", back_populates="entries")
 
     started_on: Mapped[DT.datetime] = mapped_column()
@@ -552,6 +789,8 @@ class Entry(Base):
     seconds: Mapped[int] = mapped_column()
     stop_reason: Mapped[StopReasons]
 
+    __table_args__ = (Index("ix_Entry_event_id_started_on", "event_id", "started_on"),)
+
     def to_dict(self) -> app_types.Entry:
         return app_types.Entry(
             id=self.id,
@@ -584,101 +823,438 @@ class Entry(Base):
         return session.execute(stmt).scalars().all()
 
 
+# Every write to Entry recomputes the owning event(s) duration.  Recomputing
+# instead of adding deltas keeps it exact and only touches the handful of entries
+# a single day has (via the Entry.event_id index).
+_SYNC_EVENT_DURATION = """
+    UPDATE "Event" SET duration = (
+        SELECT coalesce(sum("Entry".seconds), 0) FROM "Entry"
+        WHERE "Entry".event_id = "Event".id
+    ) WHERE "Event".id IN ({event_ids});
+"""
+
+ENTRY_DURATION_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS entry_duration_insert AFTER INSERT ON "Entry"
+    BEGIN {_SYNC_EVENT_DURATION.format(event_ids="NEW.event_id")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS entry_duration_update
+    AFTER UPDATE OF seconds, event_id ON "Entry"
+    BEGIN {_SYNC_EVENT_DURATION.format(event_ids="OLD.event_id, NEW.event_id")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS entry_duration_delete AFTER DELETE ON "Entry"
+    BEGIN {_SYNC_EVENT_DURATION.format(event_ids="OLD.event_id")} END
+    """,
+]
+
+for _trigger in ENTRY_DURATION_TRIGGERS:
+    sqlalchemy.event.listen(Entry.__table__, "after_create", DDL(_trigger))
+
+
+class EventDay(Base):
+    """
+    Per event, per day totals of the entries with tracked time.
+
+    An aggregate store for the report breakdowns, kept in sync by the
+    EVENT_DAY_TRIGGERS below so a report costs one row per task and day instead
+    of one per entry.  Use `Rebuild` to repair it.
+    """
+
+    event_id: Mapped[int] = mapped_column(ForeignKey("Event.id", ondelete="CASCADE"))
+    # the entries' started_on day, `YYYY-MM-DD` like the breakdown's date_when
+    day: Mapped[str] = mapped_column()
+    seconds: Mapped[int] = mapped_column(default=0)
+    entries: Mapped[int] = mapped_column(default=0)
+
+    __table_args__ = (UniqueConstraint("event_id", "day", name="unique_event_day"),)
+
+    @classmethod
+    def Rebuild(cls, session: Session) -> int:
+        """
+        Recompute every day total from the entries and (re)install the
+        triggers that keep them in sync.
+
+        :param session:
+        :return: the number of day totals
+        """
+        for trigger in EVENT_DAY_TRIGGERS:
+            session.execute(sqlalchemy.text(trigger))
+
+        session.execute(delete(cls))
+        day = func.strftime("%Y-%m-%d", Entry.started_on)
+        totals = (
+            select(Entry.event_id, day, func.sum(Entry.seconds), func.count(Entry.id))
+            .where(Entry.seconds > 0)
+            .group_by(Entry.event_id, day)
+        )
+        stmt = insert(cls).from_select(
+            [cls.event_id, cls.day, cls.seconds, cls.entries], totals
+        )
+        return session.execute(stmt).rowcount
+
+
+# Like the event duration, every write to Entry recomputes the day total(s) it
+# belongs to from the handful of entries that event has.
+_SYNC_EVENT_DAY = """
+    DELETE FROM "EventDay"
+    WHERE event_id = {event_id} AND day = strftime('%Y-%m-%d', {started_on});
+    INSERT INTO "EventDay" (event_id, day, seconds, entries)
+    SELECT event_id, strftime('%Y-%m-%d', started_on), sum(seconds), count(id)
+    FROM "Entry"
+    WHERE event_id = {event_id}
+        AND strftime('%Y-%m-%d', started_on) = strftime('%Y-%m-%d', {started_on})
+        AND seconds > 0
+        -- entries cascading from a deleted event must not recreate its totals
+        AND EXISTS (SELECT 1 FROM "Event" WHERE "Event".id = {event_id})
+    GROUP BY event_id;
+"""
+
+
+def _sync_event_day(row: str) -> str:
+    return _SYNC_EVENT_DAY.format(
+        event_id=f"{row}.event_id", started_on=f"{row}.started_on"
+    )
+
+
+EVENT_DAY_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS entry_day_insert AFTER INSERT ON "Entry"
+    BEGIN {_sync_event_day("NEW")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS entry_day_update
+    AFTER UPDATE OF seconds, event_id, started_on ON "Entry"
+    BEGIN {_sync_event_day("OLD")} {_sync_event_day("NEW")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS entry_day_delete AFTER DELETE ON "Entry"
+    BEGIN {_sync_event_day("OLD")} END
+    """,
+]
+
+# The triggers join both tables, so wait until the whole schema exists.
+for _trigger in EVENT_DAY_TRIGGERS:
+    # DDL applies %-formatting, keep strftime's % intact
+    _ddl = DDL(_trigger.replace("%", "%%"))
+    sqlalchemy.event.listen(Base.metadata, "after_create", _ddl)
+
+
+# Child counts are correlated subqueries loaded in the same SELECT as their
+# parent so `to_dict` never has to lazy load a whole collection just to count it.
+# Flushing the parent itself can't change them, so they are kept across its
+# flushes instead of being reloaded.
+Client.projects_count = column_property(
+    select(func.count(Project.id))
+    .where(Project.client_id == Client.id)
+    .correlate_except(Project)
+    .scalar_subquery(),
+    expire_on_flush=False,
+)
+
+Project.tasks_count = column_property(
+    select(func.count(Task.id))
+    .where(Task.project_id == Project.id)
+    .correlate_except(Task)
+    .scalar_subquery(),
+    expire_on_flush=False,
+)
+
+Task.events_count = column_property(
+    select(func.count(Event.id))
+    .where(Event.task_id == Task.id)
+    .correlate_except(Event)
+    .scalar_subquery(),
+    expire_on_flush=False,
+)
+
+Event.entries_count = column_property(
+    select(func.count(Entry.id))
+    .where(Entry.event_id == Event.id)
+    .correlate_except(Entry)
+    .scalar_subquery(),
+    expire_on_flush=False,
+)
+
+
 class Shortcut(Base):
     client: Mapped[Client] = relationship("Client", back_populates="shortcuts")
-    client_id: Mapped[int] = mapped_column(ForeignKey("Client.id"))
+    client_id: Mapped[int] = mapped_column(
+        ForeignKey("Client.id", ondelete="CASCADE", name="fk_shortcut_client")
+    )
 
     project: Mapped[Project] = relationship("Project", back_populates="shortcuts")
-    project_id: Mapped[int] = mapped_column(ForeignKey("Project.id"))
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey("Project.id", ondelete="CASCADE", name="fk_shortcut_project")
+    )
 
     task: Mapped[Task] = relationship("Task", back_populates="shortcuts")
-    task_id: Mapped[int] = mapped_column(ForeignKey("Task.id"))
+    task_id: Mapped[int] = mapped_column(
+        ForeignKey("Task.id", ondelete="CASCADE", name="fk_shortcut_task")
+    )
 
-    @hybrid_property
-    def name(self) -> str:
-        return f"{self.client.name}->{self.project.name}->{self.task.name}"
+    # goes up by one on every use, orders the list where the whole second
+    # updated_on would tie
+    used_seq: Mapped[int] = mapped_column(default=0, server_default="0")
 
     @classmethod
-    def GetAll(cls, session: Session) -> T.Sequence[T.Self]:
+    def MostRecentStmt(cls):
+        """
+        Every shortcut with its client, project and task names in one joined
+        query, most recently used first.
+        """
         return (
-            session.execute(select(cls).order_by(cls.created_on.asc())).scalars().all()
+            select(
+                cls.id,
+                Client.name.label("client_name"),
+                Project.name.label("project_name"),
+                Task.name.label("task_name"),
+                cls.client_id,
+                cls.project_id,
+                cls.task_id,
+                cls.is_active,
+                cls.created_on,
+                cls.updated_on,
+            )
+            .join(Client, cls.client_id == Client.id)
+            .join(Project, cls.project_id == Project.id)
+            .join(Task, cls.task_id == Task.id)
+            .order_by(cls.used_seq.desc(), cls.id.desc())
         )
 
     @classmethod
-    def GetAllReversed(cls, session: Session) -> T.Sequence[T.Self]:
-        return (
-            session.execute(select(cls).order_by(cls.created_on.desc())).scalars().all()
+    def Use(
+        cls,
+        session: Session,
+        client_id: Identifier,
+        project_id: Identifier,
+        task_id: Identifier,
+        capacity: int = SHORTCUT_CAPACITY,
+    ) -> int:
+        """
+        Move the shortcut for a client/project/task to the front, creating it
+        if needed, then drop whatever falls past `capacity`.  Never commits.
+
+        :return: the shortcut's id
+        """
+        assert client_id and project_id and task_id
+
+        (shortcut_id,) = cls.Upsert(
+            session, [dict(client_id=client_id, project_id=project_id, task_id=task_id)]
         )
+        latest = aliased(cls)
+        session.execute(
+            update(cls)
+            .where(cls.id == shortcut_id)
+            .values(
+                used_seq=select(
+                    func.coalesce(func.max(latest.used_seq), 0) + 1
+                ).scalar_subquery(),
+                updated_on=func.current_timestamp(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        cls.Trim(session, capacity)
+        return shortcut_id
 
     @classmethod
-    def GetOrCreate(
+    def Trim(cls, session: Session, capacity: int = SHORTCUT_CAPACITY) -> None:
+        """
+        Delete all but the `capacity` most recently used shortcuts in one
+        statement.
+        """
+        keep = (
+            select(cls.id).order_by(cls.used_seq.desc(), cls.id.desc()).limit(capacity)
+        )
+        session.execute(
+            delete(cls)
+            .where(cls.id.not_in(keep))
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def row_to_dict(row) -> app_types.Shortcut:
+        """
+        A `MostRecentStmt` row as sent to the frontend.
+        """
+        return app_types.Shortcut(
+            id=row.id,
+            compound_name=[row.client_name, row.project_name, row.task_name],
+            client_id=row.client_id,
+            project_id=row.project_id,
+            task_id=row.task_id,
+            is_active=row.is_active,
+            created_on=row.created_on.isoformat(),
+            updated_on=row.updated_on.isoformat(),
+        )
+
+
+class Queries:
+    @classmethod
+    def TimeTreeStmt(
         cls,
-        session,
+        start: DT.date | None = None,
+        end: DT.date | None = None,
+        active_only: bool = False,
         client_id: Identifier | None = None,
         project_id: Identifier | None = None,
-        task_id: Identifier | None = None,
-    ) -> T.Optional["Shortcut"]:
-        assert client_id and project_id and task_id
+    ):
+        """
+        One row per client/project/task with the summed event durations, outer
+        joined so records without any time still show up with 0 seconds.
+        """
+        project_on = Project.client_id == Client.id
+        task_on = Task.project_id == Project.id
+        event_on = Event.task_id == Task.id
+        if active_only:
+            project_on = and_(project_on, Project.is_active == true())
+            task_on = and_(task_on, Task.is_active == true())
+        event_on = and_(event_on, *date_range(Event.start_date, start, end))
 
-        record = session.execute(
-            select(cls)
-            .where(cls.client_id == client_id)
-            .where(cls.project_id == project_id)
-            .where(cls.task_id == task_id)
-        ).one_or_none()
+        stmt = (
+            select(
+                Client.id.label("client_id"),
+                Client.name.label("client_name"),
+                Client.is_active.label("client_is_active"),
+                Project.id.label("project_id"),
+                Project.name.label("project_name"),
+                Project.is_active.label("project_is_active"),
+                Task.id.label("task_id"),
+                Task.name.label("task_name"),
+                Task.is_active.label("task_is_active"),
+                func.coalesce(func.sum(Event.duration), 0).label("seconds"),
+            )
+            .select_from(Client)
+            .outerjoin(Project, project_on)
+            .outerjoin(Task, task_on)
+            .outerjoin(Event, event_on)
+            .group_by(Client.id, Project.id, Task.id)
+            .order_by(Client.id, Project.id, Task.id)
+        )
+        if active_only:
+            stmt = stmt.where(Client.is_active == true())
+        if client_id is not None:
+            stmt = stmt.where(Client.id == client_id)
+        if project_id is not None:
+            stmt = stmt.where(Project.id == project_id)
 
-        if record is not None:
-            return record[0]
+        return stmt
 
-        try:
-            record = cls.Create(session, client_id, project_id, task_id)
-            session.add(record)
-        except sqlalchemy.exc.IntegrityError:
-            return session.execute(
-                select(cls)
-                .where(cls.client_id == client_id)
-                .where(cls.project_id == project_id)
-                .where(cls.task_id == task_id)
-            ).one_or_none()
+    @classmethod
+    def TimeTree(
+        cls,
+        session: Session,
+        start: DT.date | None = None,
+        end: DT.date | None = None,
+        active_only: bool = False,
+        client_id: Identifier | None = None,
+        project_id: Identifier | None = None,
+    ) -> list[app_types.ClientTimeNode]:
+        """
+        The whole client->project->task hierarchy with time totals, built in a
+        single pass over `TimeTreeStmt`.
+        """
 
-        return record
+        def node(record_id, name, is_active, **children):
+            return dict(
+                id=record_id,
+                name=name,
+                is_active=is_active,
+                seconds=0,
+                time=None,
+                **children,
+            )
+
+        clients: dict[int, T.Any] = {}
+        projects: dict[int, T.Any] = {}
+        stmt = cls.TimeTreeStmt(start, end, active_only, client_id, project_id)
+        for row in session.execute(stmt):
+            client = clients.get(row.client_id)
+            if client is None:
+                client = clients[row.client_id] = node(
+                    row.client_id,
+                    row.client_name,
+                    row.client_is_active,
+                    projects=[],
+                )
+            client["seconds"] += row.seconds
+
+            if row.project_id is None:
+                continue
+
+            project = projects.get(row.project_id)
+            if project is None:
+                project = projects[row.project_id] = node(
+                    row.project_id,
+                    row.project_name,
+                    row.project_is_active,
+                    tasks=[],
+                )
+                client["projects"].append(project)
+            project["seconds"] += row.seconds
+
+            if row.task_id is None:
+                continue
+
+            task = node(row.task_id, row.task_name, row.task_is_active)
+            task["seconds"] = row.seconds
+            project["tasks"].append(task)
+
+        # Sorting the (few) nodes here instead of ORDER BY name lets SQLite walk
+        # the foreign key indexes in id order without a temporary sort b-tree.
+        def by_name(node):
+            return node["name"]
+
+        for client in clients.values():
+            client["time"] = seconds_to_time(client["seconds"])
+            client["projects"].sort(key=by_name)
+            for project in client["projects"]:
+                project["time"] = seconds_to_time(project["seconds"])
+                project["tasks"].sort(key=by_name)
+                for task in project["tasks"]:
+                    task["time"] = seconds_to_time(task["seconds"])
+
+        return sorted(clients.values(), key=by_name)
 
     @classmethod
-    def Create(
+    def TimeTotals(
         cls,
         session: Session,
-        client_id: Identifier,
-        project_id: Identifier,
-        task_id: Identifier,
-    ) -> "Shortcut":
-        shortcut = Shortcut(client_id=client_id, project_id=project_id, task_id=task_id)
-        session.add(shortcut)
-        session.commit()
-        shortcuts = cls.GetAll(session)
-        if len(shortcuts) > 4:
-            done = shortcuts[0]
-            session.delete(done)
-            session.commit()
-
-        return shortcut
-
-    def to_dict(self) -> app_types.Shortcut:
-        return app_types.Shortcut(
-            id=self.id,
-            compound_name=[self.client.name, self.project.name, self.task.name],
-            client_id=self.client_id,
-            project_id=self.project_id,
-            task_id=self.task_id,
-            is_active=self.is_active,
-            created_on=self.created_on.isoformat(),
-            updated_on=self.updated_on.isoformat(),
+        start: DT.date | None = None,
+        end: DT.date | None = None,
+        active_only: bool = False,
+        client_id: Identifier | None = None,
+        project_id: Identifier | None = None,
+    ) -> dict[str, dict[int, app_types.TimeObject]]:
+        """
+        Flattened `TimeTree`, time objects keyed by record type then record id.
+        """
+        totals: dict[str, dict[int, app_types.TimeObject]] = dict(
+            client={}, project={}, task={}
         )
+        for client in cls.TimeTree(
+            session, start, end, active_only, client_id, project_id
+        ):
+            totals["client"][client["id"]] = client["time"]
+            for project in client["projects"]:
+                totals["project"][project["id"]] = project["time"]
+                for task in project["tasks"]:
+                    totals["task"][task["id"]] = task["time"]
 
+        return totals
 
-class Queries:
     @classmethod
     def DayActivities(cls, session: Session, search_day: DT.date):
-        stmt = (
+        return session.execute(cls.RangeActivitiesStmt(search_day, search_day)).all()
+
+    @classmethod
+    def RangeActivitiesStmt(cls, start: DT.date, end: DT.date):
+        """
+        Every entry with its owners for the events from `start` to `end`
+        inclusive, ordered by day and then by when the entry started.
+        """
+        return (
             select(
                 Event.start_date.label("start_date"),
                 Client.name.label("client_name"),
@@ -693,34 +1269,32 @@ class Queries:
                 Task.id.label("task_id"),
                 Event.id.label("event_id"),
             )
-            .select_from(Entry)
-            .join(Event, Entry.event_id == Event.id)
+            .select_from(Event)
+            .join(Entry, Entry.event_id == Event.id)
             .join(Task, Event.task_id == Task.id)
             .join(Project, Task.project_id == Project.id)
             .join(Client, Project.client_id == Client.id)
-            .order_by(Entry.started_on)
-            .where(Event.start_date == search_day)
+            .where(*date_range(Event.start_date, start, end))
+            .order_by(Event.start_date, Entry.started_on)
         )
 
-        return session.execute(stmt).all()
-
     @classmethod
     def _BaseSelect(cls):
+        # Reads the EventDay aggregates, which only hold entries with seconds > 0
         return (
             select(
-                (func.strftime("%Y-%m-%d", Entry.started_on)).label("date_when"),
+                EventDay.day.label("date_when"),
                 Client.name.label("client_name"),
                 Project.name.label("project_name"),
                 Task.name.label("task_name"),
-                func.sum(Entry.seconds).label("seconds"),
-                func.count(Entry.id).label("entries"),
+                func.sum(EventDay.seconds).label("seconds"),
+                func.sum(EventDay.entries).label("entries"),
             )
-            .select_from(Entry)
-            .join(Event, Entry.event_id == Event.id)
+            .select_from(EventDay)
+            .join(Event, EventDay.event_id == Event.id)
             .join(Task, Event.task_id == Task.id)
             .join(Project, Task.project_id == Project.id)
             .join(Client, Project.client_id == Client.id)
-            .where(Entry.seconds > 0)
             .group_by("client_name", "project_name", "task_name", "date_when")
             .order_by("date_when")
         )
@@ -744,11 +1318,11 @@ class Queries:
     def BreakdownClientByIDAndOptionalDates(
         cls, session, client_id, start: DT.date | None, end: DT.date | None
     ):
-        stmt = cls._BaseSelect().where(Client.id == client_id)
-        if start is not None:
-            stmt = stmt.where(Event.start_date >= start)
-        if end is not None:
-            stmt = stmt.where(Event.start_date <= end)
+        stmt = (
+            cls._BaseSelect()
+            .where(Client.id == client_id)
+            .where(*date_range(Event.start_date, start, end))
+        )
 
         return session.execute(stmt).all()
 
@@ -770,8 +1344,7 @@ class Queries:
             cls._BaseSelect()
             .where(Client.name == client_name)
             .where(Project.name == project_name)
-            .where(Event.start_date >= start_date)
-            .where(Event.start_date <= end_date)
+            .where(*date_range(Event.start_date, start_date, end_date))
         )
         return session.execute(stmt).all()
 
@@ -780,10 +1353,7 @@ class Queries:
         cls, session, project_id, start_date: DT.date | None, end_date: DT.date | None
     ):
         stmt = cls._BaseSelect().where(Project.id == project_id)
-        if start_date is not None:
-            stmt = stmt.where(Event.start_date >= start_date)
-        if end_date is not None:
-            stmt = stmt.where(Event.start_date <= end_date)
+        stmt = stmt.where(*date_range(Event.start_date, start_date, end_date))
 
         return session.execute(stmt).all()
 
@@ -792,10 +1362,7 @@ class Queries:
         cls, session, task_id, start_date, end_date
     ):
         stmt = cls._BaseSelect().where(Task.id == task_id)
-        if start_date is not None:
-            stmt = stmt.where(Event.start_date >= start_date)
-        if end_date is not None:
-            stmt = stmt.where(Event.start_date <= end_date)
+        stmt = stmt.where(*date_range(Event.start_date, start_date, end_date))
 
         return session.execute(stmt).all()
 
@@ -808,7 +1375,13 @@ class Queries:
         start_date=None,
         end_date=None,
     ):
-        stmt = cls._BaseSelect()
+        """
+        Breakdown rows ordered by client, project, date then task so a report
+        can be folded from them in one streaming pass.
+        """
+        order = ("client_name", "project_name", "date_when", "task_name")
+        stmt = cls._BaseSelect().group_by(None).group_by(*order)
+        stmt = stmt.order_by(None).order_by(*order)
         if client_id is not None:
             stmt = stmt.where(Client.id == client_id)
 
@@ -818,11 +1391,7 @@ class Queries:
                 if task_id is not None:
                     stmt = stmt.where(Task.id == task_id)
 
-        if start_date is not None:
-            stmt = stmt.where(Event.start_date >= start_date)
-
-        if end_date is not None:
-            stmt = stmt.where(Event.start_date <= end_date)
+        stmt = stmt.where(*date_range(Event.start_date, start_date, end_date))
 
         return stmt
 
@@ -840,3 +1409,54 @@ class Queries:
             client_id, project_id, task_id, start_date, end_date
         )
         return session.execute(stmt).all()
+
+    @classmethod
+    def EntriesByConditionsStmt(
+        cls,
+        client_id=None,
+        project_id=None,
+        task_id=None,
+        start_date=None,
+        end_date=None,
+    ):
+        """
+        Every entry with its owners, narrowed like `BreakdownByConditionsStmt`.
+
+        Ordered along the Event(start_date, task_id) and Entry(event_id,
+        started_on) indexes so rows can be streamed out without a sort.
+        """
+        stmt = (
+            select(
+                Event.start_date.label("start_date"),
+                Client.name.label("client_name"),
+                Project.name.label("project_name"),
+                Task.name.label("task_name"),
+                Entry.started_on.label("started_on"),
+                Entry.stopped_on.label("stopped_on"),
+                Entry.seconds.label("seconds"),
+                Entry.stop_reason.label("stop_reason"),
+                Entry.id.label("entry_id"),
+                Client.id.label("client_id"),
+                Project.id.label("project_id"),
+                Task.id.label("task_id"),
+                Event.id.label("event_id"),
+            )
+            .select_from(Event)
+            .join(Entry, Entry.event_id == Event.id)
+            .join(Task, Event.task_id == Task.id)
+            .join(Project, Task.project_id == Project.id)
+            .join(Client, Project.client_id == Client.id)
+            .order_by(Event.start_date, Event.task_id, Event.id, Entry.started_on)
+        )
+        if client_id is not None:
+            stmt = stmt.where(Client.id == client_id)
+
+            if project_id is not None:
+                stmt = stmt.where(Project.id == project_id)
+
+                if task_id is not None:
+                    stmt = stmt.where(Task.id == task_id)
+
+        stmt = stmt.where(*date_range(Event.start_date, start_date, end_date))
+
+        return stmt
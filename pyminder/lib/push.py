@@ -0,0 +1,185 @@
+"""
+Non-blocking push channel from python to the frontend.
+
+Timer ticks and callback clears are queued here and delivered by a single
+sender thread, so a slow webview never stalls the caller.  Only the latest
+pending tick per identifier is kept, and a clear drops any tick still waiting
+for its identifier before being queued behind everything sent earlier.
+
+"""
+
+import collections
+import threading
+import typing as T
+
+from .app_types import Identifier
+from .log_helper import getLogger
+
+LOG = getLogger(__name__)
+
+DEFAULT_LIMIT = 64
+
+TICK = "tick"
+CLEAR = "clear"
+
+
+class PushStats(T.TypedDict):
+    queued: int
+    delivered: int
+    coalesced: int
+    dropped: int
+    failed: int
+    pending: int
+
+
+class PushDispatcher:
+    send: T.Callable[[str], T.Any]
+    limit: int
+
+    queued: int
+    delivered: int
+    coalesced: int
+    dropped: int
+    failed: int
+
+    def __init__(self, send: T.Callable[[str], T.Any], limit: int = DEFAULT_LIMIT):
+        """
+
+        :param send: delivers a script to the frontend, called from the sender thread only
+        :param limit: most messages pending at once, the oldest tick is dropped past it
+        """
+        self.send = send
+        self.limit = limit
+
+        self._pending: collections.OrderedDict[tuple[str, Identifier], str] = (
+            collections.OrderedDict()
+        )
+        self._condition = threading.Condition()
+        self._sending = False
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+        self.queued = 0
+        self.delivered = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def tick(self, identifier: Identifier, script: str) -> None:
+        """
+        Queue a tick, replacing one still pending for the same identifier.
+
+        :param identifier:
+        :param script:
+        :return:
+        """
+        with self._condition:
+            key = (TICK, identifier)
+            if key in self._pending:
+                self.coalesced += 1
+                del self._pending[key]
+            self._put(key, script)
+
+    def clear(self, identifier: Identifier, script: str) -> None:
+        """
+        Queue a callback clear, any pending tick for it is stale and dropped.
+
+        :param identifier:
+        :param script:
+        :return:
+        """
+        with self._condition:
+            if self._pending.pop((TICK, identifier), None) is not None:
+                self.coalesced += 1
+            self._pending.pop((CLEAR, identifier), None)
+            self._put((CLEAR, identifier), script)
+
+    def _put(self, key: tuple[str, Identifier], script: str) -> None:
+        if self._closed:
+            self.dropped += 1
+            return
+
+        while len(self._pending) >= self.limit:
+            oldest = next(
+                (pending for pending in self._pending if pending[0] == TICK),
+                next(iter(self._pending)),
+            )
+            del self._pending[oldest]
+            self.dropped += 1
+
+        self._pending[key] = script
+        self.queued += 1
+
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="push-dispatcher", daemon=True
+            )
+            self._thread.start()
+
+        self._condition.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                _, script = self._pending.popitem(last=False)
+                self._sending = True
+
+            try:
+                self.send(script)
+            except Exception as exc:
+                LOG.warning(f"Failed to push `{script}`: {exc}")
+                delivered = False
+            else:
+                delivered = True
+
+            with self._condition:
+                self._sending = False
+                if delivered:
+                    self.delivered += 1
+                else:
+                    self.failed += 1
+                self._condition.notify_all()
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """
+        Wait for everything queued so far to be sent.
+
+        :param timeout:
+        :return: True if nothing is left pending
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._sending, timeout
+            )
+
+    def close(self, timeout: float | None = 1.0) -> None:
+        """
+        Stop the sender thread, anything still pending is dropped.
+
+        :param timeout:
+        :return:
+        """
+        with self._condition:
+            self._closed = True
+            self.dropped += len(self._pending)
+            self._pending.clear()
+            self._condition.notify_all()
+            thread = self._thread
+
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def stats(self) -> PushStats:
+        with self._condition:
+            return PushStats(
+                queued=self.queued,
+                delivered=self.delivered,
+                coalesced=self.coalesced,
+                dropped=self.dropped,
+                failed=self.failed,
+                pending=len(self._pending),
+            )
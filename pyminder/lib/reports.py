@@ -0,0 +1,204 @@
+"""
+Streaming aggregation of breakdown rows into a `TimeReport`.
+
+`Queries.BreakdownByConditionsStmt` yields one row per client, project, date and
+task, ordered in that sequence, so the nested report can be built in a single
+pass without holding the rows themselves.
+
+`Queries.RangeActivitiesStmt` rows are grouped by day the same way for the
+timeline views.
+
+"""
+
+import datetime as DT
+import itertools
+import operator
+import typing as T
+
+from .app_types import (
+    Identifier,
+    DayActivityEntry,
+    DayActivityColumns,
+    DayActivities,
+    TimeReport,
+    ClientTime,
+    ProjectTime,
+    DateTimeCard,
+    TaskTimeCard,
+    ReportTimeValues,
+)
+
+
+class BreakdownRow(T.Protocol):
+    client_name: str
+    project_name: str
+    date_when: str
+    task_name: str
+    seconds: float
+    entries: int
+
+
+class ActivityRow(T.Protocol):
+    _fields: tuple[str, ...]
+    start_date: DT.date
+    client_name: str
+    project_name: str
+    task_name: str
+    started_on: DT.datetime
+    stopped_on: DT.datetime
+    seconds: int
+    entry_id: Identifier
+    client_id: Identifier
+    project_id: Identifier
+    task_id: Identifier
+    event_id: Identifier
+
+
+def mk_time(my_seconds) -> tuple[int, int, int]:
+    hours, rem = divmod(my_seconds, 3600)
+    minutes, seconds = divmod(rem, 60)
+    return int(hours), int(minutes), int(seconds)
+
+
+def to_dec(hours, minutes, seconds) -> float:
+    return hours + (minutes / 60) + (seconds / 3600)
+
+
+def time_values(name: str, category: str, total_seconds=0) -> ReportTimeValues:
+    total_time = mk_time(total_seconds)
+    return {
+        "name": name,
+        "category": category,
+        "hours": total_time[0],
+        "minutes": total_time[1],
+        "seconds": total_time[2],
+        "total_seconds": total_seconds,
+        "decimal": to_dec(*total_time),
+    }
+
+
+def finish(frame: ReportTimeValues) -> None:
+    frame.update(time_values(frame["name"], frame["category"], frame["total_seconds"]))
+
+
+def build_time_report(rows: T.Iterable[BreakdownRow]) -> TimeReport:
+    """
+    Fold ordered breakdown rows into a report, holding only the open client,
+    project and date while streaming.
+
+    :param rows: rows ordered by client, project, date then task name
+    :return:
+    """
+    report = TimeReport(clients={}, **time_values("report", "report"))
+    client: ClientTime | None = None
+    project: ProjectTime | None = None
+    date: DateTimeCard | None = None
+
+    for row in rows:
+        cname, pname, my_date = (
+            str(row.client_name),
+            str(row.project_name),
+            str(row.date_when),
+        )
+
+        if client is None or client["name"] != cname:
+            client = report["clients"][cname] = ClientTime(
+                projects={}, **time_values(cname, "client")
+            )
+            project = date = None
+
+        if project is None or project["name"] != pname:
+            project = client["projects"][pname] = ProjectTime(
+                dates={}, **time_values(pname, "project")
+            )
+            date = None
+
+        if date is None or date["name"] != my_date:
+            date = project["dates"][my_date] = DateTimeCard(
+                tasks=[], **time_values(my_date, "date")
+            )
+
+        date["tasks"].append(
+            TaskTimeCard(
+                entries=row.entries,
+                **time_values(str(row.task_name), "task", row.seconds),
+            )
+        )
+        for frame in (date, project, client, report):
+            frame["total_seconds"] += row.seconds
+
+    finish(report)
+    for client in report["clients"].values():
+        finish(client)
+        for project in client["projects"].values():
+            finish(project)
+            for date in project["dates"].values():
+                finish(date)
+
+    return report
+
+
+def day_activity(row: ActivityRow) -> DayActivityEntry:
+    return DayActivityEntry(
+        start_date=row.start_date.isoformat(),
+        client_name=row.client_name,
+        project_name=row.project_name,
+        task_name=row.task_name,
+        started_on=row.started_on.isoformat(),
+        stopped_on=row.stopped_on.isoformat(),
+        seconds=row.seconds,
+        client_id=row.client_id,
+        project_id=row.project_id,
+        task_id=row.task_id,
+        event_id=row.event_id,
+        entry_id=row.entry_id,
+    )
+
+
+def day_columns(rows: list[ActivityRow]) -> DayActivityColumns:
+    """
+    Transpose a day's rows into one list per field, dropping the day itself.
+    """
+    columns = {name: list(values) for name, values in zip(rows[0]._fields, zip(*rows))}
+    del columns["start_date"]
+    for name in ("started_on", "stopped_on"):
+        columns[name] = [value.isoformat() for value in columns[name]]
+    return T.cast(DayActivityColumns, columns)
+
+
+def group_day_activities(
+    rows: T.Iterable[ActivityRow], columnar: bool = False
+) -> list[DayActivities]:
+    """
+    Split activity rows into one group per day, days without entries are
+    left out.
+
+    :param rows: rows ordered by day then by when the entry started
+    :param columnar: return each day as a `DayActivityColumns` instead of a
+        list of `DayActivityEntry`
+    :return:
+    """
+    days = []
+    for day, day_rows in itertools.groupby(rows, operator.attrgetter("start_date")):
+        if columnar:
+            columns = day_columns(list(day_rows))
+            days.append(
+                DayActivities(
+                    day=day.isoformat(),
+                    seconds=sum(columns["seconds"]),
+                    entries=None,
+                    columns=columns,
+                )
+            )
+        else:
+            entries = [day_activity(row) for row in day_rows]
+            days.append(
+                DayActivities(
+                    day=day.isoformat(),
+                    seconds=sum(entry["seconds"] for entry in entries),
+                    entries=entries,
+                    columns=None,
+                )
+            )
+
+    return days
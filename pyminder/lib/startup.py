@@ -0,0 +1,214 @@
+"""
+Wall time and resident memory per startup phase, for `main.py --profile-startup`.
+
+The profiler is always passed around but does nothing unless enabled, so the
+normal startup path stays free of bookkeeping.
+
+"""
+
+import contextlib
+import functools
+import json
+import os
+import pathlib
+import platform
+import socket
+import sys
+import threading
+import time
+import types
+import typing as T
+
+from .log_helper import getLogger
+
+LOG = getLogger(__name__)
+
+
+class StartupPhase(T.TypedDict):
+    name: str
+    started: float
+    seconds: float
+    rss_mb: float | None
+
+
+class StartupReport(T.TypedDict):
+    frozen: bool
+    python: str
+    platform: str
+    total_seconds: float
+    phases: list[StartupPhase]
+
+
+def current_rss() -> float | None:
+    """
+    Resident set size of this process in MiB, None where it can't be read.
+
+    :return:
+    """
+    try:
+        import psutil  # type: ignore
+
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    except ImportError:
+        pass
+
+    statm = pathlib.Path("/proc/self/statm")
+    if statm.exists():
+        pages = int(statm.read_text().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+
+    try:
+        import resource
+
+        # peak rather than current, but all there is on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        return None
+
+
+def wait_for_port(port: int, host="127.0.0.1", timeout=30.0, every=0.05) -> bool:
+    """
+    Poll until something accepts connections on `host:port`.
+
+    :return: False if it didn't come up within `timeout` seconds
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=every):
+                return True
+        except OSError:
+            time.sleep(every)
+    return False
+
+
+class StartupProfiler:
+    enabled: bool
+    destination: pathlib.Path | None
+    phases: list[StartupPhase]
+
+    def __init__(
+        self,
+        destination: pathlib.Path | None = None,
+        clock: T.Callable[[], float] = time.perf_counter,
+        origin: float | None = None,
+    ):
+        """
+
+        :param destination: JSON file to write, profiling is off when None
+        :param clock:
+        :param origin: clock reading phases are offset from, defaults to now
+        """
+        self.destination = destination
+        self.enabled = destination is not None
+        self.clock = clock
+        self.phases = []
+        self._origin = clock() if origin is None else origin
+        self._open: dict[str, float] = {}
+        self._written = False
+
+    def start(self, name: str, at: float | None = None) -> None:
+        if self.enabled:
+            self._open[name] = self.clock() if at is None else at
+
+    def finish(self, name: str) -> None:
+        if not self.enabled or name not in self._open:
+            return
+
+        started = self._open.pop(name)
+        phase = StartupPhase(
+            name=name,
+            started=started - self._origin,
+            seconds=self.clock() - started,
+            rss_mb=current_rss(),
+        )
+        self.phases.append(phase)
+        LOG.info(f"Startup phase {name} took {phase['seconds']:.3f}s")
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.finish(name)
+
+    def report(self) -> StartupReport:
+        return StartupReport(
+            frozen=getattr(sys, "frozen", False),
+            python=sys.version.split()[0],
+            platform=platform.platform(),
+            total_seconds=self.clock() - self._origin,
+            phases=list(self.phases),
+        )
+
+    def write(self) -> StartupReport | None:
+        """
+        Write the report to the destination file, once.
+
+        :return:
+        """
+        if not self.enabled or self._written:
+            return None
+
+        report = self.report()
+        self.destination.write_text(json.dumps(report, indent=2))
+        self._written = True
+        LOG.info(f"Startup profile written to {self.destination}")
+        return report
+
+    def watch_bridge(self, api: object, phase: str = "first_bridge_call") -> None:
+        """
+        Close `phase` and write the report on the first call to any public
+        method of `api`, the point where the UI is up and talking to python.
+
+        :param api: the js_api object, its bound methods are wrapped in place
+        :param phase: started by the caller, usually when the window is created
+        :return:
+        """
+        if not self.enabled:
+            return
+
+        originals = {}
+        # methods already wrapped on the instance, e.g. by Diagnostics, are
+        # put back afterwards instead of falling through to the class
+        replaced = {}
+        for name in dir(api):
+            method = getattr(api, name)
+            if not name.startswith("_") and isinstance(method, types.MethodType):
+                originals[name] = method
+                if name in vars(api):
+                    replaced[name] = method
+
+        # pywebview runs each js_api call on its own thread and a window makes
+        # several at once while loading, only the first to get here unwraps
+        lock = threading.Lock()
+
+        def first_call(name):
+            with lock:
+                pending = dict(originals)
+                originals.clear()
+            if not pending:
+                return
+
+            for watched in pending:
+                if watched in replaced:
+                    setattr(api, watched, replaced[watched])
+                else:
+                    delattr(api, watched)
+            LOG.info(f"First bridge call: {name}")
+            self.finish(phase)
+            self.write()
+
+        def watch(name, method):
+            @functools.wraps(method.__func__)
+            def call(owner, *args, **kwargs):
+                if originals:
+                    first_call(name)
+                return method(*args, **kwargs)
+
+            return types.MethodType(call, api)
+
+        for name, method in originals.items():
+            setattr(api, name, watch(name, method))
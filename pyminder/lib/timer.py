@@ -2,6 +2,7 @@ import datetime as DT
 import math
 import threading
 import time
+import typing as T
 
 from . import models
 from .app_types import Identifier
@@ -12,6 +13,15 @@ LOG = getLogger(__name__)
 
 
 class Timer(threading.Thread):
+    """
+    Tracks the running entry on a monotonic clock.
+
+    Elapsed time is always derived from `clock()` instead of summing sleeps, so
+    late wakeups or wall clock jumps never skew `accumulated_seconds`.  Wakeups
+    are aligned to multiples of `interval` of tracked time, and stop/pause/resume
+    interrupt the wait through a threading.Event so they apply immediately.
+    """
+
     app: Application
     identifier: Identifier
     event: models.Event
@@ -19,89 +29,157 @@ class Timer(threading.Thread):
     status: bool = True
     paused: bool = False
     running: bool = False
-    accumulated_seconds: int = 0
-    now: float = 0
+    accumulated_seconds: float = 0
+    # clock reading tracking started or last resumed at, None until `run()`
+    now: float | None = None
 
     entry_id: Identifier
 
     def __init__(
-        self, app: Application, identifier: Identifier, event_id, interval: int | float
+        self,
+        app: Application,
+        identifier: Identifier,
+        event_id,
+        interval: int | float,
+        clock: T.Callable[[], float] = time.monotonic,
+        wait: T.Optional[T.Callable[[float | None], bool]] = None,
     ):
+        """
+
+        :param app:
+        :param identifier: frontend callback receiving the ticks
+        :param event_id:
+        :param interval: seconds of tracked time between ticks
+        :param clock: monotonic time source
+        :param wait: blocks for up to timeout seconds (None is forever), returns early when woken
+        """
         threading.Thread.__init__(self)
 
         self.app = app
         self.identifier = identifier
         self.interval = interval
+        self.clock = clock
         self.status = True
         self.paused = False
         self.running = False
         self.accumulated_seconds = 0
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self.wait = wait if wait is not None else self._wake.wait
+        self._banked = 0.0
+        self._stopped_at = 0.0
+        self.now = None
+
         with self.app.get_db() as session:
             event = models.Event.Fetch_by_id(session, event_id)
             record = event.create_entry(DT.datetime.now(), DT.datetime.now(), 0)
             session.add(event)
             session.add(record)
-            session.commit()
+            session.flush()
             self.entry_id = record.id
 
+    def elapsed(self) -> float:
+        """
+        Seconds tracked so far, excluding the time spent paused.
+
+        :return:
+        """
+        with self._lock:
+            if self.paused or self.now is None:
+                return self._banked
+            return self._banked + max(self.clock() - self.now, 0)
+
     def update_record(
         self,
         stopped_on: DT.datetime,
         seconds: float,
         reason=models.StopReasons.PLACEHOLDER,
+        flush: bool = False,
     ):
-        with self.app.get_db() as session:
-            entry = models.Entry.Fetch_by_id(
-                session, self.entry_id
-            )  # type: models.Entry
-            entry.stop_reason = reason
-            entry.seconds = seconds
-            entry.stopped_on = stopped_on
-            session.add(entry)
-            session.commit()
+        """
+        Checkpoint the entry through the application's write-behind journal.
+
+        :param stopped_on:
+        :param seconds:
+        :param reason:
+        :param flush: write it now instead of when the journal interval is due
+        :return:
+        """
+        self.app.checkpoints.record(self.entry_id, stopped_on, seconds, reason)
+        if flush:
+            self.app.checkpoints.flush()
 
     def pause(self):
-        self.paused = True
+        with self._lock:
+            if not self.paused:
+                if self.now is not None:
+                    self._banked += max(self.clock() - self.now, 0)
+                self.paused = True
+            self.accumulated_seconds = self._banked
+
         self.update_record(
-            DT.datetime.now(), self.accumulated_seconds, models.StopReasons.PLACEHOLDER
+            DT.datetime.now(),
+            self.accumulated_seconds,
+            models.StopReasons.PLACEHOLDER,
+            flush=True,
         )
+        self._wake.set()
 
     def resume(self):
-        self.paused = False
-        self.now = time.time()
-        # self.update_record(DT.datetime.now(), self.accumulated_seconds, models.StopReasons.PLACEHOLDER)
+        with self._lock:
+            if self.paused:
+                self.now = self.clock()
+                self.paused = False
+        self._wake.set()
 
     def stop(self):
+        """
+        Stop tracking now, the thread writes the finished entry as it exits.
+        """
+        self._stopped_at = self.elapsed()
         self.status = False
+        self._wake.set()
+
+    def tick(self) -> float | None:
+        """
+        Checkpoint and report the tracked time to the frontend.
+
+        :return: seconds until the next interval boundary, None while paused
+        """
+        if self.paused or not self.status:
+            return None
+
+        self.accumulated_seconds = self.elapsed()
+        hours, remainder = divmod(self.accumulated_seconds, 3600)
+        minutes, seconds = divmod(remainder, 60)
         self.update_record(
-            DT.datetime.now(), self.accumulated_seconds, models.StopReasons.FINISHED
+            DT.datetime.now(),
+            self.accumulated_seconds,
+            models.StopReasons.PLACEHOLDER,
         )
+        self.app.tell(self.identifier, hours, minutes, math.floor(seconds))
+
+        return self.interval - (self.accumulated_seconds % self.interval)
 
     def run(self):
-        LOG.debug("Timer started: {}", self.identifier)
+        LOG.debug(f"Timer started: {self.identifier}")
+        with self._lock:
+            # only count from here, not from when the timer was built
+            self.now = self.clock()
         self.running = True
-        self.now = time.time()
         while self.status:
-            if self.paused is False:
-                last = time.time() - self.now
-                self.now = time.time()
-                if last < 0:
-                    last = 0
-
-                self.accumulated_seconds += last
-                hours, remainder = divmod(self.accumulated_seconds, 3600)
-                minutes, seconds = divmod(remainder, 60)
-                if seconds % 10 == 0:
-                    self.update_record(
-                        DT.datetime.now(),
-                        self.accumulated_seconds,
-                        models.StopReasons.PLACEHOLDER,
-                    )
-
-                self.app.tell(self.identifier, hours, minutes, math.floor(seconds))
-
-            time.sleep(self.interval)
-
-        LOG.debug("timer stopping: {}", self.identifier)
+            timeout = self.tick()
+            self.wait(timeout)
+            self._wake.clear()
+
+        LOG.debug(f"timer stopping: {self.identifier}")
+        self.accumulated_seconds = self._stopped_at
+        self.update_record(
+            DT.datetime.now(),
+            self.accumulated_seconds,
+            models.StopReasons.FINISHED,
+            flush=True,
+        )
         self.app.clearCallback(self.identifier)
         self.running = False
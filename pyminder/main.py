@@ -5,10 +5,8 @@ import multiprocessing as mp
 
 import time
 from pathlib import Path
-from wsgiref.simple_server import make_server
 
-import flask
-import wsgiref
+import typing as T
 
 import tap
 import webview  # type: ignore
@@ -16,9 +14,16 @@ import webview.menu as wm
 import sys
 
 
+from lib import models
 from lib.api import API
 from lib.application import Application
+from lib.checkpoint import DEFAULT_INTERVAL
+from lib.lazy import lazy_import
 from lib.log_helper import getLogger
+from lib.startup import StartupProfiler, wait_for_port
+
+# Only the static server process needs flask, keep it out of the main window's.
+flask = lazy_import("flask")
 
 IS_FROZEN = getattr(sys, "frozen", False)
 
@@ -34,6 +39,25 @@ class Arguments(tap.Tap):
     transform_api_target: Path | None = None
     alternate_db: Path | None = None
     db_name: str = "pyminder.sqlite3"
+    repair_durations: bool = False
+    storage_profile: T.Literal[
+        "legacy", "balanced", "durable", "fast"
+    ] = models.DEFAULT_STORAGE_PROFILE  # see models.STORAGE_PROFILES
+    checkpoint_interval: float = DEFAULT_INTERVAL  # seconds between running timer saves
+    columnar: bool = False  # answer reports from an in-memory NumPy entry store
+    shortcut_capacity: int = models.SHORTCUT_CAPACITY  # most recent shortcuts kept
+    profile_startup: Path | None = None
+    diagnostics_dump: Path | None = None  # write bridge call statistics here on exit
+
+    def configure(self):
+        self.add_argument(
+            "--profile-startup",
+            dest="profile_startup",
+            type=Path,
+            default=None,
+            required=False,
+            help="Write startup phase timings and memory to this JSON file",
+        )
 
 
 def setup_logging(level=logging.DEBUG):
@@ -87,13 +111,19 @@ def spinup_pnpm(url_path: pathlib.Path, port: str):
     return process
 
 
-def run_flask(ui_dir: pathlib.Path, port: str):
+def run_flask(ui_dir: pathlib.Path, port: str, db_path: pathlib.Path):
     DIST_DIR = ui_dir / "dist"
     if DIST_DIR.exists() is False:
         raise RuntimeError("Dist dir does not exist @ {}".format(ui_dir))
 
+    from wsgiref.simple_server import make_server
+    from lib import export
+
     app = flask.Flask(__name__)
 
+    engine, _ = models.connect(db_path, create=False)
+    app.register_blueprint(export.blueprint(engine))
+
     @app.route("/", defaults={"path": ""})
     @app.route("/<path:path>")
     def catch_all(path):
@@ -107,22 +137,24 @@ def run_flask(ui_dir: pathlib.Path, port: str):
         else:
             return (DIST_DIR / "index.html").read_text()
 
-    from werkzeug import wsgi
-
     with make_server("127.0.0.1", int(port), app) as httpd:
         httpd.serve_forever()
 
     app.run(host="127.0.0.1", port=int(port))
 
 
-def spinup_flask(ui_dir: pathlib.Path, port: str) -> mp.Process:
-    worker = mp.Process(target=run_flask, args=(ui_dir, port))
+def spinup_flask(ui_dir: pathlib.Path, port: str, db_path: pathlib.Path) -> mp.Process:
+    worker = mp.Process(target=run_flask, args=(ui_dir, port, db_path))
     worker.start()
     return worker
 
 
 def main(argv):
+    started = time.perf_counter()
     results = Arguments().parse_args()
+    profiler = StartupProfiler(results.profile_startup, origin=started)
+    profiler.start("arguments", at=started)
+    profiler.finish("arguments")
 
     print(f"{HERE=}")
     print(f"{UI_DIR=}")
@@ -137,9 +169,25 @@ def main(argv):
 
     setup_logging()
 
-    app = Application(HERE, db_dir / results.db_name)
+    app = Application(
+        HERE,
+        db_dir / results.db_name,
+        storage_profile=results.storage_profile,
+        checkpoint_interval=results.checkpoint_interval,
+        columnar=results.columnar,
+        shortcut_capacity=results.shortcut_capacity,
+        profiler=profiler,
+    )
     app.port = results.port
 
+    if results.repair_durations:
+        with app.get_db() as session:
+            repaired = models.Event.RebuildDurations(session)
+            days = models.EventDay.Rebuild(session)
+            session.commit()
+        LOG.info(f"Repaired {repaired} event durations, rebuilt {days} day totals")
+        sys.exit(0)
+
     if results.debug:
         print("Debug mode")
 
@@ -165,12 +213,20 @@ def main(argv):
     }
 
     worker = None
-    if results.debug:
-        worker = spinup_pnpm(UI_DIR, results.port)
-    else:
-        worker = spinup_flask(UI_DIR, results.port)
+    with profiler.phase("static_server"):
+        if results.debug:
+            worker = spinup_pnpm(UI_DIR, results.port)
+        else:
+            worker = spinup_flask(UI_DIR, results.port, app.database_path)
+
+        if profiler.enabled and not wait_for_port(int(results.port)):
+            LOG.warning(f"Static server did not come up on {results.port}")
 
+    profiler.start("window")
+    profiler.start("first_bridge_call")
+    profiler.watch_bridge(api)
     app.main_window = webview.create_window(**window_args)
+    app.main_window.events.shown += lambda: profiler.finish("window")
 
     toggle_state = True
 
@@ -201,6 +257,9 @@ def main(argv):
     webview.start(debug=results.debug, menu=menu_items)
 
     print("Finished, trying to shutdown")
+    profiler.write()
+    if results.diagnostics_dump is not None:
+        app.diagnostics.write(results.diagnostics_dump)
 
     if results.debug:
         import signal
@@ -0,0 +1,64 @@
+"""Event duration counter cache
+
+Revision ID: a3c1e5d7f901
+Revises: 8c8bdea55759
+Create Date: 2026-10-18 09:12:41.208312
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c1e5d7f901'
+down_revision: Union[str, None] = '8c8bdea55759'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SYNC_EVENT_DURATION = """
+    UPDATE "Event" SET duration = (
+        SELECT coalesce(sum("Entry".seconds), 0) FROM "Entry"
+        WHERE "Entry".event_id = "Event".id
+    ) WHERE "Event".id IN ({event_ids});
+"""
+
+
+def upgrade() -> None:
+    op.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS entry_duration_insert AFTER INSERT ON "Entry"
+        BEGIN {SYNC_EVENT_DURATION.format(event_ids="NEW.event_id")} END
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS entry_duration_update
+        AFTER UPDATE OF seconds, event_id ON "Entry"
+        BEGIN {SYNC_EVENT_DURATION.format(event_ids="OLD.event_id, NEW.event_id")} END
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS entry_duration_delete AFTER DELETE ON "Entry"
+        BEGIN {SYNC_EVENT_DURATION.format(event_ids="OLD.event_id")} END
+        """
+    )
+
+    # Backfill, duration has never been written before this revision
+    op.execute(
+        """
+        UPDATE "Event" SET duration = (
+            SELECT coalesce(sum("Entry".seconds), 0) FROM "Entry"
+            WHERE "Entry".event_id = "Event".id
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS entry_duration_delete')
+    op.execute('DROP TRIGGER IF EXISTS entry_duration_update')
+    op.execute('DROP TRIGGER IF EXISTS entry_duration_insert')
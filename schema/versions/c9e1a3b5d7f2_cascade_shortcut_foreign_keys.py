@@ -0,0 +1,53 @@
+"""Cascade shortcut foreign keys
+
+Revision ID: c9e1a3b5d7f2
+Revises: b7d2f4a6c8e0
+Create Date: 2026-10-18 10:41:05.903176
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e1a3b5d7f2'
+down_revision: Union[str, None] = 'b7d2f4a6c8e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def shortcut_table(cascade: bool) -> sa.Table:
+    # The original foreign keys are unnamed, so the table is rebuilt from this
+    # definition instead of dropping and re-adding the constraints.
+    ondelete = 'CASCADE' if cascade else None
+    return sa.Table(
+        'Shortcut',
+        sa.MetaData(),
+        sa.Column('client_id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), server_default=sa.text('1'), nullable=False),
+        sa.Column('created_on', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.Column('updated_on', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.ForeignKeyConstraint(['client_id'], ['Client.id'], name='fk_shortcut_client' if cascade else None, ondelete=ondelete),
+        sa.ForeignKeyConstraint(['project_id'], ['Project.id'], name='fk_shortcut_project' if cascade else None, ondelete=ondelete),
+        sa.ForeignKeyConstraint(['task_id'], ['Task.id'], name='fk_shortcut_task' if cascade else None, ondelete=ondelete),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def upgrade() -> None:
+    with op.batch_alter_table(
+        'Shortcut', copy_from=shortcut_table(cascade=True), recreate='always'
+    ):
+        pass
+
+
+def downgrade() -> None:
+    with op.batch_alter_table(
+        'Shortcut', copy_from=shortcut_table(cascade=False), recreate='always'
+    ):
+        pass
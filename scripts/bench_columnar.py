@@ -0,0 +1,142 @@
+"""
+Compare the SQL breakdown behind API.report_generate with the columnar
+EntryStore on a database of ~1M entries: first load, an incremental sync after
+a handful of writes, and the cost of one multi-year report each way.
+
+    PYTHONPATH=pyminder python scripts/bench_columnar.py
+
+Needs the optional numpy dependency (`poetry install -E analysis`).
+"""
+
+import datetime as DT
+import pathlib
+import tempfile
+import time
+
+from sqlalchemy import insert, update
+
+from lib import models
+from lib.app_types import StopReasons
+from lib.columnar import Breakdown, EntryStore
+from lib.generation import DataGeneration
+
+CLIENTS = 4
+PROJECTS = 5
+TASKS = 10
+DAYS = 1000
+ENTRIES = 5
+RUNS = 5
+START = DT.date(2020, 6, 1)
+END = DT.date(2022, 6, 1)
+
+
+def seed(engine):
+    # history is stamped with its own dates, as if tracked over the years
+    first_day = DT.date(2020, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(models.Client),
+            [dict(name=f"client {no}") for no in range(CLIENTS)],
+        )
+        conn.execute(
+            insert(models.Project),
+            [
+                dict(name=f"project {no}", client_id=client_id)
+                for client_id in range(1, CLIENTS + 1)
+                for no in range(PROJECTS)
+            ],
+        )
+        conn.execute(
+            insert(models.Task),
+            [
+                dict(name=f"task {no}", project_id=project_id)
+                for project_id in range(1, CLIENTS * PROJECTS + 1)
+                for no in range(TASKS)
+            ],
+        )
+        tasks = CLIENTS * PROJECTS * TASKS
+        days = [first_day + DT.timedelta(days=day) for day in range(DAYS)]
+        conn.execute(
+            insert(models.Event),
+            [
+                dict(task_id=task_id, start_date=day, updated_on=day)
+                for task_id in range(1, tasks + 1)
+                for day in days
+            ],
+        )
+        event_id = 0
+        for task_id in range(1, tasks + 1):
+            rows = []
+            for day in days:
+                event_id += 1
+                started = DT.datetime.combine(day, DT.time(9))
+                rows.extend(
+                    dict(
+                        event_id=event_id,
+                        started_on=started,
+                        stopped_on=started,
+                        seconds=60 + no,
+                        stop_reason=StopReasons.FINISHED,
+                        updated_on=started,
+                    )
+                    for no in range(ENTRIES)
+                )
+            conn.execute(insert(models.Entry), rows)
+
+
+def timed(func, *args, runs=1):
+    started = time.perf_counter()
+    for _ in range(runs):
+        result = func(*args)
+    return result, (time.perf_counter() - started) / runs
+
+
+def sql_breakdown(engine, *conditions):
+    stmt = models.Queries.BreakdownByConditionsStmt(*conditions)
+    with engine.connect() as conn:
+        return [Breakdown(**row._mapping) for row in conn.execute(stmt)]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, _ = models.connect(pathlib.Path(tmp) / "bench.sqlite3")
+        seed(engine)
+        generation = DataGeneration(engine)
+        store = EntryStore(engine, generation)
+
+        _, load_time = timed(store.sync)
+        print(f"loaded {len(store):,} entries in {load_time:.2f}s")
+
+        reports = {
+            "all clients, 2 years": (None, None, None, START, END),
+            "one client, 1 month": (1, None, None, START, START.replace(month=7)),
+        }
+        timings = {}
+        for name, conditions in reports.items():
+            expected, sql_time = timed(sql_breakdown, engine, *conditions, runs=RUNS)
+            rows, store_time = timed(store.breakdown, *conditions, runs=RUNS)
+            assert rows == expected, "breakdowns differ"
+            timings[name] = (len(rows), sql_time, store_time)
+
+        with engine.begin() as conn:
+            conn.execute(
+                update(models.Entry)
+                .where(models.Entry.id.in_(range(1, 1000, 100)))
+                .values(seconds=models.Entry.seconds + 1)
+            )
+        _, sync_time = timed(store.sync)
+        assert store.full_loads == 1 and store.incremental_loads == 1
+        assert store.breakdown(*conditions) == sql_breakdown(engine, *conditions)
+
+        print(f"{'report':22} {'rows':>7} {'sql ms':>8} {'columnar ms':>12}")
+        for name, (count, sql_time, store_time) in timings.items():
+            print(
+                f"{name:22} {count:7,} {sql_time * 1000:8.1f} {store_time * 1000:12.1f}"
+            )
+        print(f"incremental sync after 10 edits: {sync_time * 1000:.1f} ms")
+        generation.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
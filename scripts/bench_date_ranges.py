@@ -0,0 +1,91 @@
+"""
+Compare the old between-dates predicates with the half-open ranges built by
+models.date_range: rows matched, query plan and timing on ~100k events.
+
+    PYTHONPATH=pyminder python scripts/bench_date_ranges.py
+"""
+
+import datetime as DT
+import pathlib
+import tempfile
+import time
+
+from sqlalchemy import and_, func, insert, select
+
+from lib import models
+
+TASKS = 200
+DAYS = 500
+RUNS = 1000
+START = DT.date(2020, 3, 1)
+END = DT.date(2020, 3, 31)
+
+
+def seed(engine):
+    first_day = DT.date(2020, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(models.Client), [dict(name="client")])
+        conn.execute(insert(models.Project), [dict(name="project", client_id=1)])
+        conn.execute(
+            insert(models.Task),
+            [dict(name=f"task {no}", project_id=1) for no in range(TASKS)],
+        )
+        conn.execute(
+            insert(models.Event),
+            [
+                dict(
+                    task_id=task_id,
+                    start_date=first_day + DT.timedelta(days=day),
+                    duration=60,
+                )
+                for task_id in range(1, TASKS + 1)
+                for day in range(DAYS)
+            ],
+        )
+
+
+def total(*conditions):
+    return select(func.sum(models.Event.duration)).where(
+        models.Event.task_id == 1, *conditions
+    )
+
+
+STATEMENTS = {
+    # Task.GetTimeBetweenDates before the fix, drops both end days
+    "strict": total(
+        and_(models.Event.start_date > START, models.Event.start_date < END)
+    ),
+    # the inclusive form used by the breakdown queries
+    "inclusive": total(
+        models.Event.start_date >= START, models.Event.start_date <= END
+    ),
+    "half-open": total(*models.date_range(models.Event.start_date, START, END)),
+}
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, _ = models.connect(pathlib.Path(tmp) / "bench.sqlite3")
+        seed(engine)
+        print(f"seeded {TASKS * DAYS:,} events, range {START} .. {END}")
+
+        with engine.connect() as conn:
+            for name, stmt in STATEMENTS.items():
+                compiled = stmt.compile(engine)
+                params = tuple(compiled.params[key] for key in compiled.positiontup)
+                plan = conn.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {compiled}", params
+                ).all()
+                seconds = conn.execute(stmt).scalar()
+                started = time.perf_counter()
+                for _ in range(RUNS):
+                    conn.execute(stmt).scalar()
+                elapsed = (time.perf_counter() - started) / RUNS * 1000
+                print(f"\n{name}: {seconds // 60} days, {elapsed:.3f} ms/query")
+                for row in plan:
+                    print(f"    {row[-1]}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Time API.heatmap_calendar and API.heatmap_weekday_hour over five years of
+~500k entries, from the columnar entry store and from a single SQLite scan.
+
+    PYTHONPATH=pyminder python scripts/bench_heatmap.py
+"""
+
+import datetime as DT
+import pathlib
+import random
+import tempfile
+import time
+
+from sqlalchemy import insert
+
+from lib import models
+from lib.api import API
+from lib.app_types import StopReasons
+from lib.application import Application
+
+TASKS = 20
+DAYS = 5 * 365
+ENTRIES = 14  # per task every day
+RUNS = 10
+START = DT.date(2019, 1, 1)
+END = START + DT.timedelta(days=DAYS - 1)
+
+
+def seed(engine):
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(insert(models.Client), [dict(name="client")])
+        conn.execute(insert(models.Project), [dict(name="project", client_id=1)])
+        conn.execute(
+            insert(models.Task),
+            [dict(name=f"task {no}", project_id=1) for no in range(TASKS)],
+        )
+        days = [START + DT.timedelta(days=day) for day in range(DAYS)]
+        conn.execute(
+            insert(models.Event),
+            [
+                dict(task_id=task_id, start_date=day)
+                for task_id in range(1, TASKS + 1)
+                for day in days
+            ],
+        )
+        event_id = 0
+        for task_id in range(1, TASKS + 1):
+            rows = []
+            for day in days:
+                event_id += 1
+                for _ in range(ENTRIES):
+                    # spans of up to 3 hours, some running past midnight
+                    started = DT.datetime.combine(day, DT.time()) + DT.timedelta(
+                        seconds=rng.randrange(86400)
+                    )
+                    seconds = rng.randrange(10800)
+                    rows.append(
+                        dict(
+                            event_id=event_id,
+                            started_on=started,
+                            stopped_on=started + DT.timedelta(seconds=seconds),
+                            seconds=seconds,
+                            stop_reason=StopReasons.FINISHED,
+                        )
+                    )
+            conn.execute(insert(models.Entry), rows)
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    for _ in range(RUNS):
+        result = func(*args)
+    return result, (time.perf_counter() - started) / RUNS * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        here = pathlib.Path(tmp)
+        app = Application(here, here / "bench.sqlite3")
+        seed(app.engine)
+        print(f"seeded {TASKS * DAYS * ENTRIES:,} entries, {START} .. {END}")
+        app.push.close()
+
+        columnar = Application(here, here / "bench.sqlite3", columnar=True)
+        columnar.entry_store.sync()
+
+        print(f"{'':10} {'calendar ms':>12} {'weekday/hour ms':>16}")
+        results = []
+        for name, source in (("sqlite", app), ("columnar", columnar)):
+            api = API(source)
+            calendar, calendar_ms = timed(
+                api.heatmap_calendar, START.isoformat(), END.isoformat()
+            )
+            matrix, matrix_ms = timed(
+                api.heatmap_weekday_hour, START.isoformat(), END.isoformat()
+            )
+            results.append((calendar, matrix))
+            print(f"{name:10} {calendar_ms:12.1f} {matrix_ms:16.1f}")
+
+        assert results[0] == results[1], "heatmaps differ"
+        columnar.push.close()
+
+
+if __name__ == "__main__":
+    main()
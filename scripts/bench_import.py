@@ -0,0 +1,92 @@
+"""
+Time importer.import_entries on 100k entries against the row by row
+GetOrCreate/create_entry/commit path of scripts/new_entry.py, which is run on
+a sample and extrapolated.
+
+    PYTHONPATH=pyminder python scripts/bench_import.py
+"""
+
+import csv
+import datetime as DT
+import pathlib
+import tempfile
+import time
+
+from lib import importer, models
+
+CLIENTS = 5
+PROJECTS = 4
+TASKS = 5
+ENTRIES = 100_000
+SAMPLE = 2_000
+
+
+def write_history(path: pathlib.Path) -> None:
+    first = DT.datetime(2020, 1, 1, 9)
+    tasks = CLIENTS * PROJECTS * TASKS
+    with path.open("w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(
+            ["client_name", "project_name", "task_name", "started_on", "stopped_on"]
+        )
+        for no in range(ENTRIES):
+            task = no % tasks
+            started = first + DT.timedelta(days=no // tasks, minutes=no % 60)
+            writer.writerow(
+                [
+                    f"client {task // (PROJECTS * TASKS)}",
+                    f"project {task // TASKS % PROJECTS}",
+                    f"task {task % TASKS}",
+                    started.isoformat(),
+                    (started + DT.timedelta(minutes=25)).isoformat(),
+                ]
+            )
+
+
+def row_by_row(Session, rows) -> None:
+    for row in rows:
+        with Session() as session:
+            client = models.Client.GetOrCreate(session, name=row.client_name)
+            project = models.Project.GetOrCreate(
+                session, client_id=client.id, name=row.project_name
+            )
+            task = models.Task.GetOrCreate(
+                session, project_id=project.id, name=row.task_name
+            )
+            event = models.Event.GetOrCreateByDate(session, task.id, row.start_date)
+            session.add(
+                event.create_entry(
+                    row.started_on, row.stopped_on, row.seconds, row.stop_reason
+                )
+            )
+            session.commit()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        here = pathlib.Path(tmp)
+        source = here / "history.csv"
+        write_history(source)
+
+        engine, Session = models.connect(here / "rows.sqlite3")
+        rows = [
+            importer.parse_record(line, record)
+            for line, record in importer.read_records(source)
+        ][:SAMPLE]
+        started = time.perf_counter()
+        row_by_row(Session, rows)
+        per_row = (time.perf_counter() - started) / SAMPLE
+        engine.dispose()
+
+        engine, _ = models.connect(here / "bulk.sqlite3")
+        summary = importer.import_entries(engine, source)
+        assert summary["entries"] == ENTRIES
+        engine.dispose()
+
+        print(f"row by row: {per_row * 1000:.2f} ms/entry, ")
+        print(f"            ~{per_row * ENTRIES:.0f}s for {ENTRIES:,} entries")
+        print(f"importer:   {summary['seconds']:.1f}s for {ENTRIES:,} entries")
+
+
+if __name__ == "__main__":
+    main()
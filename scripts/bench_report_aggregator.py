@@ -0,0 +1,171 @@
+"""
+Compare API.report_generate's streaming aggregator with the pandas groupby
+implementation it replaced, on a database of ~1M entries.
+
+    PYTHONPATH=pyminder python scripts/bench_report_aggregator.py
+
+Needs the optional pandas dependency (`poetry install -E analysis`).
+"""
+
+import datetime as DT
+import pathlib
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+from sqlalchemy import insert
+
+from lib import models
+from lib.app_types import (
+    StopReasons,
+    TimeReport,
+    ClientTime,
+    ProjectTime,
+    DateTimeCard,
+    TaskTimeCard,
+)
+from lib.reports import build_time_report, mk_time, to_dec
+
+CLIENTS = 4
+PROJECTS = 5
+TASKS = 10
+DAYS = 500
+ENTRIES = 10
+
+
+def seed(engine):
+    first_day = DT.date(2020, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(models.Client),
+            [dict(name=f"client {no}") for no in range(CLIENTS)],
+        )
+        conn.execute(
+            insert(models.Project),
+            [
+                dict(name=f"project {no}", client_id=client_id)
+                for client_id in range(1, CLIENTS + 1)
+                for no in range(PROJECTS)
+            ],
+        )
+        conn.execute(
+            insert(models.Task),
+            [
+                dict(name=f"task {no}", project_id=project_id)
+                for project_id in range(1, CLIENTS * PROJECTS + 1)
+                for no in range(TASKS)
+            ],
+        )
+        tasks = CLIENTS * PROJECTS * TASKS
+        days = [first_day + DT.timedelta(days=day) for day in range(DAYS)]
+        conn.execute(
+            insert(models.Event),
+            [
+                dict(task_id=task_id, start_date=day)
+                for task_id in range(1, tasks + 1)
+                for day in days
+            ],
+        )
+        event_id = 0
+        for task_id in range(1, tasks + 1):
+            rows = []
+            for day in days:
+                event_id += 1
+                started = DT.datetime.combine(day, DT.time(9))
+                rows.extend(
+                    dict(
+                        event_id=event_id,
+                        started_on=started,
+                        stopped_on=started,
+                        seconds=60 + no,
+                        stop_reason=StopReasons.FINISHED,
+                    )
+                    for no in range(ENTRIES)
+                )
+            conn.execute(insert(models.Entry), rows)
+
+
+def pandas_report(engine, stmt) -> TimeReport:
+    """
+    The report_generate body before the streaming aggregator.
+    """
+
+    def to_frame(name, category, subframe):
+        total_seconds = subframe["seconds"].sum()
+        total_time = mk_time(total_seconds)
+        return {
+            "name": name,
+            "category": category,
+            "hours": total_time[0],
+            "minutes": total_time[1],
+            "seconds": total_time[2],
+            "total_seconds": total_seconds,
+            "decimal": to_dec(*total_time),
+        }
+
+    df = pd.read_sql_query(sql=stmt, con=engine)
+    report = TimeReport(clients={}, **to_frame("report", "report", df))
+    for client, client_data in df.groupby("client_name"):
+        cname = str(client)
+        report["clients"][cname] = ClientTime(
+            projects={}, **to_frame(cname, "client", client_data)
+        )
+        for project, project_data in client_data.groupby("project_name"):
+            pname = str(project)
+            report["clients"][cname]["projects"][pname] = ProjectTime(
+                dates={}, **to_frame(pname, "project", project_data)
+            )
+            for dtwhen, date_data in project_data.groupby("date_when"):
+                my_date = str(dtwhen)
+                report["clients"][cname]["projects"][pname]["dates"][my_date] = (
+                    DateTimeCard(tasks=[], **to_frame(my_date, "date", date_data))
+                )
+                for task, task_data in date_data.groupby("task_name"):
+                    report["clients"][cname]["projects"][pname]["dates"][my_date][
+                        "tasks"
+                    ].append(
+                        TaskTimeCard(
+                            entries=task_data["entries"].sum(),
+                            **to_frame(str(task), "task", task_data),
+                        )
+                    )
+    return report
+
+
+def streaming_report(engine, stmt) -> TimeReport:
+    with engine.connect() as conn:
+        return build_time_report(conn.execute(stmt))
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 / 1024
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, _ = models.connect(pathlib.Path(tmp) / "bench.sqlite3")
+        started = time.perf_counter()
+        seed(engine)
+        total = CLIENTS * PROJECTS * TASKS * DAYS * ENTRIES
+        print(f"seeded {total:,} entries in {time.perf_counter() - started:.1f}s")
+
+        stmt = models.Queries.BreakdownByConditionsStmt()
+        expected, pandas_time, pandas_peak = measure(pandas_report, engine, stmt)
+        report, stream_time, stream_peak = measure(streaming_report, engine, stmt)
+        assert report == expected, "reports differ"
+
+        print(f"{'':10} {'seconds':>8} {'peak MiB':>9}")
+        print(f"{'pandas':10} {pandas_time:8.2f} {pandas_peak:9.1f}")
+        print(f"{'streaming':10} {stream_time:8.2f} {stream_peak:9.1f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
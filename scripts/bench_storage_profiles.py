@@ -0,0 +1,127 @@
+"""
+Compare timer checkpoint latency and report latency, alone and while the
+other is running, for every models.STORAGE_PROFILES entry.
+
+    PYTHONPATH=pyminder python scripts/bench_storage_profiles.py
+"""
+import datetime as DT
+import pathlib
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy import insert, update
+
+from lib import models
+from lib.app_types import StopReasons
+
+CHECKPOINTS = 300
+REPORTS = 30
+
+
+def seed(engine, tasks=24, days=365, entries=4):
+    first_day = DT.date.today() - DT.timedelta(days=days)
+    with engine.begin() as conn:
+        client_id = conn.execute(
+            insert(models.Client).values(name="client")
+        ).inserted_primary_key[0]
+        project_id = conn.execute(
+            insert(models.Project).values(name="project", client_id=client_id)
+        ).inserted_primary_key[0]
+        conn.execute(
+            insert(models.Task),
+            [dict(name=f"task {no}", project_id=project_id) for no in range(tasks)],
+        )
+        conn.execute(
+            insert(models.Event),
+            [
+                dict(task_id=task_id, start_date=first_day + DT.timedelta(days=day))
+                for task_id in range(1, tasks + 1)
+                for day in range(days)
+            ],
+        )
+        started = DT.datetime.combine(first_day, DT.time(9))
+        conn.execute(
+            insert(models.Entry),
+            [
+                dict(
+                    event_id=event_id,
+                    started_on=started,
+                    stopped_on=started,
+                    seconds=60,
+                    stop_reason=StopReasons.FINISHED,
+                )
+                for event_id in range(1, tasks * days + 1)
+                for _ in range(entries)
+            ],
+        )
+
+
+def checkpoint(engine, seconds):
+    with engine.begin() as conn:
+        conn.execute(
+            update(models.Entry)
+            .where(models.Entry.id == 1)
+            .values(seconds=seconds, stopped_on=DT.datetime.now())
+        )
+
+
+def report(Session):
+    with Session() as session:
+        models.Queries.BreakdownByConditions(session)
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - started) * 1000
+
+
+def summary(samples):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    return f"p50 {statistics.median(samples):7.2f}ms  p95 {p95:7.2f}ms"
+
+
+def bench(name, workdir):
+    engine, Session = models.connect(workdir / f"{name}.sqlite3", profile=name)
+    seed(engine)
+
+    alone = [timed(checkpoint, engine, no) for no in range(CHECKPOINTS)]
+    reports_alone = [timed(report, Session) for _ in range(REPORTS)]
+
+    busy = []
+    stop = threading.Event()
+
+    def timer_thread():
+        seconds = 0
+        while not stop.is_set():
+            seconds += 1
+            busy.append(timed(checkpoint, engine, seconds))
+            time.sleep(0.005)
+
+    writer = threading.Thread(target=timer_thread)
+    writer.start()
+    reports_busy = [timed(report, Session) for _ in range(REPORTS)]
+    stop.set()
+    writer.join()
+
+    print(f"{name}:")
+    print(f"  checkpoint            {summary(alone)}")
+    print(f"  checkpoint w/ reports {summary(busy)}")
+    print(f"  report                {summary(reports_alone)}")
+    print(f"  report w/ checkpoints {summary(reports_busy)}")
+
+    Session.remove()
+    engine.dispose()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in models.STORAGE_PROFILES:
+            bench(name, pathlib.Path(workdir))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,9 @@ engine, Session = models.connect(
 )
 
 with Session() as session:
-    for client in models.Client.GetAll(session):
-        print(client.name, models.Client.GetAllTime(session, client.id))
-        for project in client.projects:
-            print("\t", project.name, models.Project.GetAllTime(session, project.id))
-            for task in project.tasks:
-                print("\t\t", task.name, models.Task.GetAllTime(session, task.id))
+    for client in models.Queries.TimeTree(session):
+        print(client["name"], client["time"])
+        for project in client["projects"]:
+            print("\t", project["name"], project["time"])
+            for task in project["tasks"]:
+                print("\t\t", task["name"], task["time"])
@@ -11,3 +11,4 @@ engine, Session = models.connect(
 
 with Session() as session:
     event = models.Event.GetOrCreateByDate(session, 2, DT.datetime.today())
+    session.commit()
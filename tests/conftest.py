@@ -0,0 +1,119 @@
+import contextlib
+import datetime as DT
+
+import pytest
+from sqlalchemy import event
+
+from pyminder.lib import models
+from pyminder.lib.api import API
+from pyminder.lib.app_types import StopReasons
+from pyminder.lib.application import Application
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine, Session = models.connect(tmp_path / "test.sqlite3")
+    yield engine, Session
+    Session.remove()
+    engine.dispose()
+
+
+@pytest.fixture
+def session(db):
+    _, Session = db
+    with Session() as session:
+        yield session
+
+
+@pytest.fixture
+def app(tmp_path):
+    application = Application(tmp_path, tmp_path / "app.sqlite3")
+    yield application
+    application.push.close()
+    application.Session.remove()
+    application.engine.dispose()
+
+
+@pytest.fixture
+def api(app):
+    return API(app)
+
+
+@pytest.fixture
+def count_statements():
+    """
+    Context manager collecting every SQL statement an engine executes.
+    """
+
+    @contextlib.contextmanager
+    def counter(engine):
+        statements: list[str] = []
+
+        def collect(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", collect)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", collect)
+
+    return counter
+
+
+@pytest.fixture
+def query_budget(count_statements):
+    """
+    Context manager failing the test when an engine runs more than `budget`
+    SQL statements inside it.
+    """
+
+    @contextlib.contextmanager
+    def budget(engine, limit: int, label: str = "block"):
+        with count_statements(engine) as statements:
+            yield statements
+        assert len(statements) <= limit, (
+            f"{label} ran {len(statements)} statements, its budget is {limit}:\n"
+            + "\n".join(statements)
+        )
+
+    return budget
+
+
+@pytest.fixture
+def seed_history():
+    """
+    Fill a database with `clients` x `projects` x `tasks`, each task tracked for
+    `days` days with `entries` entries of 60 seconds per day.
+    """
+
+    def seed(session, clients=1, projects=1, tasks=1, days=1, entries=1):
+        first_day = DT.date(2024, 1, 1)
+        for client_no in range(clients):
+            client = models.Client(name=f"client {client_no}")
+            session.add(client)
+            for project_no in range(projects):
+                project = models.Project(name=f"project {project_no}", client=client)
+                session.add(project)
+                for task_no in range(tasks):
+                    task = models.Task(name=f"task {task_no}", project=project)
+                    session.add(task)
+                    for day_no in range(days):
+                        day = first_day + DT.timedelta(days=day_no)
+                        record = models.Event(task=task, start_date=day)
+                        session.add(record)
+                        for entry_no in range(entries):
+                            started = DT.datetime.combine(
+                                day, DT.time(9)
+                            ) + DT.timedelta(minutes=2 * entry_no)
+                            session.add(
+                                record.create_entry(
+                                    started,
+                                    started + DT.timedelta(seconds=60),
+                                    60,
+                                    StopReasons.FINISHED,
+                                )
+                            )
+        session.commit()
+
+    return seed
@@ -0,0 +1,106 @@
+import datetime as DT
+import threading
+
+import pytest
+from sqlalchemy import event, select
+
+from pyminder.lib import models
+from pyminder.lib.app_types import StopReasons
+from pyminder.lib.checkpoint import CheckpointJournal
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def entry_ids(session, seed_history):
+    seed_history(session)
+    return tuple(session.execute(select(models.Entry.event_id, models.Entry.id)).one())
+
+
+def test_ticks_are_coalesced_per_interval(db, session, entry_ids, count_statements):
+    engine, _ = db
+    event_id, entry_id = entry_ids
+    clock = FakeClock()
+    journal = CheckpointJournal(engine, interval=10, clock=clock)
+    started = DT.datetime(2024, 1, 1, 9)
+
+    with count_statements(engine) as statements:
+        for second in range(1, 61):
+            clock.now = float(second)
+            journal.record(entry_id, started + DT.timedelta(seconds=second), second)
+
+    stats = journal.stats()
+    assert stats["recorded"] == 60
+    assert stats["writes"] == 6
+    assert stats["writes_per_minute"] == 6
+    assert stats["pending"] == 0
+    updates = [sql for sql in statements if sql.startswith("UPDATE")]
+    assert len(updates) == 6
+
+    session.expire_all()
+    assert models.Entry.Fetch_by_id(session, entry_id).seconds == 60
+    assert models.Event.Fetch_by_id(session, event_id).duration == 60
+
+
+def test_flush_writes_pending_state(db, session, entry_ids):
+    engine, _ = db
+    event_id, entry_id = entry_ids
+    clock = FakeClock()
+    journal = CheckpointJournal(engine, interval=10, clock=clock)
+    stopped = DT.datetime(2024, 1, 1, 9, 0, 3)
+
+    clock.now = 3.0
+    journal.record(entry_id, stopped, 3, StopReasons.FINISHED)
+    assert journal.stats()["pending"] == 1
+
+    assert journal.flush() == 1
+    assert journal.flush() == 0
+
+    entry = models.Entry.Fetch_by_id(session, entry_id)
+    assert entry.seconds == 3
+    assert entry.stopped_on == stopped
+    assert entry.stop_reason == StopReasons.FINISHED
+    assert models.Event.Fetch_by_id(session, event_id).duration == 3
+
+
+def test_concurrent_flushes_commit_in_order(db, session, entry_ids):
+    engine, _ = db
+    _, entry_id = entry_ids
+    journal = CheckpointJournal(engine, interval=10, clock=FakeClock())
+    stopped = DT.datetime(2024, 1, 1, 9, 0, 10)
+    writing = threading.Event()
+    release = threading.Event()
+
+    def hold_first_flush(conn, cursor, statement, parameters, context, executemany):
+        if threading.current_thread() is first:
+            writing.set()
+            release.wait(5)
+
+    event.listen(engine, "before_cursor_execute", hold_first_flush)
+    try:
+        journal.record(entry_id, stopped, 10)
+        first = threading.Thread(target=journal.flush)
+        first.start()
+        assert writing.wait(5)
+
+        # a newer state flushed from another thread while the older batch is
+        # still being written
+        journal.record(entry_id, stopped + DT.timedelta(seconds=10), 20)
+        second = threading.Thread(target=journal.flush)
+        second.start()
+        second.join(0.5)
+        release.set()
+        first.join(5)
+        second.join(5)
+    finally:
+        event.remove(engine, "before_cursor_execute", hold_first_flush)
+
+    session.expire_all()
+    assert models.Entry.Fetch_by_id(session, entry_id).seconds == 20
+    assert journal.stats()["flushes"] == 2
@@ -0,0 +1,110 @@
+import datetime as DT
+
+import pytest
+from sqlalchemy import delete, insert, update
+
+from pyminder.lib import models
+from pyminder.lib.api import API
+from pyminder.lib.app_types import StopReasons
+from pyminder.lib.application import Application
+from pyminder.lib.columnar import Breakdown, EntryStore
+from pyminder.lib.generation import DataGeneration
+from pyminder.lib.reports import build_time_report
+
+CONDITIONS = [
+    (),
+    (2,),
+    (2, 3),
+    (2, 3, 5),
+    (None, None, None, DT.date(2024, 1, 2), DT.date(2024, 1, 3)),
+    (1, None, None, DT.date(2024, 1, 3), None),
+    (None, None, None, DT.date(2023, 1, 1), DT.date(2023, 1, 31)),
+]
+
+
+@pytest.fixture
+def store(db, session, seed_history):
+    engine, _ = db
+    seed_history(session, clients=2, projects=2, tasks=2, days=4, entries=2)
+    generation = DataGeneration(engine)
+    yield EntryStore(engine, generation)
+    generation.close()
+
+
+def assert_matches_sql(store, session):
+    for conditions in CONDITIONS:
+        stmt = models.Queries.BreakdownByConditionsStmt(*conditions)
+        expected = [Breakdown(**row._mapping) for row in session.execute(stmt)]
+        assert store.breakdown(*conditions) == expected, conditions
+
+
+def test_breakdown_matches_sql(store, session):
+    assert_matches_sql(store, session)
+    assert len(store) == 2 * 2 * 2 * 4 * 2
+    assert store.full_loads == 1
+
+
+def test_unchanged_generation_skips_the_database(store, session, count_statements):
+    store.sync()
+
+    with count_statements(store.engine) as statements:
+        assert store.sync() is False
+        store.breakdown(1, None, None, DT.date(2024, 1, 1), None)
+    assert statements == []
+
+
+def test_writes_are_applied_incrementally(store, session):
+    store.sync()
+
+    session.execute(
+        update(models.Entry).where(models.Entry.id == 3).values(seconds=600)
+    )
+    session.execute(
+        insert(models.Entry).values(
+            event_id=1,
+            started_on=DT.datetime(2024, 1, 1, 12),
+            stopped_on=DT.datetime(2024, 1, 1, 12, 5),
+            seconds=300,
+            stop_reason=StopReasons.FINISHED,
+        )
+    )
+    session.execute(
+        update(models.Event)
+        .where(models.Event.id == 2)
+        .values(start_date=DT.date(2023, 1, 5))
+    )
+    session.commit()
+
+    assert_matches_sql(store, session)
+    assert (store.full_loads, store.incremental_loads) == (1, 1)
+
+    session.execute(update(models.Task).where(models.Task.id == 1).values(name="z"))
+    session.commit()
+    assert_matches_sql(store, session)
+    assert (store.full_loads, store.incremental_loads) == (1, 1)
+
+    session.execute(delete(models.Entry).where(models.Entry.id == 5))
+    session.commit()
+    assert_matches_sql(store, session)
+    assert store.full_loads == 2
+
+
+def test_report_generate_from_store(tmp_path, seed_history):
+    app = Application(tmp_path, tmp_path / "app.sqlite3", columnar=True)
+    try:
+        with app.get_db() as session:
+            seed_history(session, clients=2, projects=2, tasks=2, days=3)
+            expected = build_time_report(
+                session.execute(models.Queries.BreakdownByConditionsStmt())
+            )
+
+        api = API(app)
+        report = api.report_generate({})
+        assert app.entry_store.full_loads == 1
+        assert report["total_seconds"] == 2 * 2 * 2 * 3 * 60
+        assert list(report["clients"]) == ["client 0", "client 1"]
+        assert report == expected
+    finally:
+        app.push.close()
+        app.Session.remove()
+        app.engine.dispose()
@@ -0,0 +1,69 @@
+import datetime as DT
+
+import pytest
+from sqlalchemy import select
+
+from pyminder.lib import models
+
+START = DT.date(2024, 1, 2)
+END = DT.date(2024, 1, 4)
+# seed_history tracks 60 seconds per task and day from 2024-01-01 to 01-05,
+# three of those days are inside START..END
+INSIDE = 3 * 60
+
+
+def test_date_range_is_half_open():
+    conditions = models.date_range(models.Event.start_date, START, END)
+    sql = str(
+        select(models.Event.id)
+        .where(*conditions)
+        .compile(compile_kwargs={"literal_binds": True})
+    )
+
+    assert "start_date >= '2024-01-02'" in sql
+    assert "start_date < '2024-01-05'" in sql
+    assert models.date_range(models.Event.start_date, None, None) == ()
+    assert len(models.date_range(models.Event.start_date, START, None)) == 1
+
+
+@pytest.mark.parametrize(
+    "model",
+    [models.Client, models.Project, models.Task],
+)
+def test_time_between_dates_includes_both_ends(session, seed_history, model):
+    seed_history(session, days=5)
+
+    time = model.GetTimeBetweenDates(session, 1, START, END)
+    assert time["minutes"] * 60 + time["seconds"] == INSIDE
+
+
+def test_event_filters(session, seed_history):
+    seed_history(session, days=5)
+    event_days = dict(
+        session.execute(select(models.Event.id, models.Event.start_date)).all()
+    )
+
+    inside = {event_id for event_id, day in event_days.items() if START <= day <= END}
+    stmt = select(models.Event.id).where(models.Event.by_dates(START, END))
+    assert set(session.execute(stmt).scalars()) == inside
+    stmt = select(models.Event.id).where(models.Event.by_task_and_dates(1, START, END))
+    assert set(session.execute(stmt).scalars()) == inside
+
+    # event 1 is on the day before START, event 2 on START itself
+    assert models.Event.GetTimeBetweenDates(session, 1, START, END)["minutes"] == 0
+    assert models.Event.GetTimeBetweenDates(session, 2, START, END)["minutes"] == 1
+
+
+def test_breakdowns_include_both_ends(session, seed_history):
+    seed_history(session, days=5)
+
+    rows = models.Queries.BreakdownByConditions(session, start_date=START, end_date=END)
+    assert [row.date_when for row in rows] == [
+        "2024-01-02",
+        "2024-01-03",
+        "2024-01-04",
+    ]
+    rows = models.Queries.BreakdownClientProjectBetweenDates(
+        session, "client 0", "project 0", END, END
+    )
+    assert [row.date_when for row in rows] == ["2024-01-04"]
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+from sqlalchemy import text
+
+from pyminder.lib import diagnostics
+
+
+def by_name(api):
+    return {stats["name"]: stats for stats in api.diagnostics_get()["methods"]}
+
+
+def test_percentile():
+    values = [float(n) for n in range(1, 101)]
+    assert diagnostics.percentile(values, 0.50) == 50
+    assert diagnostics.percentile(values, 0.95) == 95
+    assert diagnostics.percentile(values, 0.99) == 99
+    assert diagnostics.percentile([], 0.5) == 0
+
+
+def test_calls_are_recorded(api, app, tmp_path):
+    client = api.client_create("client")
+    for name in ("one", "two", "three"):
+        api.project_create(client["id"], name)
+    for _ in range(4):
+        projects = api.projects_list_by_client_id(client["id"])
+
+    stats = by_name(api)["projects_list_by_client_id"]
+    assert stats["calls"] == 4 and stats["errors"] == 0
+    assert stats["rows"] == 4 * len(projects) == 12
+    assert stats["payload_bytes"] == 4 * len(json.dumps(projects))
+    assert stats["max_payload_bytes"] == len(json.dumps(projects))
+    assert stats["statements"] >= 4 and stats["max_statements"] >= 1
+    assert 0 < stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+
+    dumped = app.diagnostics.write(tmp_path / "diagnostics.json")
+    assert json.loads((tmp_path / "diagnostics.json").read_text()) == dumped
+
+
+def test_errors_and_statements_per_thread(api, app):
+    with pytest.raises(Exception):
+        api.event_create(12345)
+    assert by_name(api)["event_create"]["errors"] == 1
+
+    # statements run outside any bridge call are not attributed to one
+    with app.get_db() as session:
+        session.execute(text("SELECT 1"))
+    api.info("hello")
+    assert by_name(api)["info"]["statements"] == 0
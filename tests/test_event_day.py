@@ -0,0 +1,110 @@
+import datetime as DT
+
+from sqlalchemy import func, select, update
+
+from pyminder.lib import models
+from pyminder.lib.app_types import StopReasons
+
+
+def live_totals(session):
+    """
+    The per entry aggregate the EventDay rows stand in for.
+    """
+    day = func.strftime("%Y-%m-%d", models.Entry.started_on)
+    stmt = (
+        select(
+            models.Entry.event_id,
+            day,
+            func.sum(models.Entry.seconds),
+            func.count(models.Entry.id),
+        )
+        .where(models.Entry.seconds > 0)
+        .group_by(models.Entry.event_id, day)
+        .order_by(models.Entry.event_id, day)
+    )
+    return [tuple(row) for row in session.execute(stmt)]
+
+
+def stored_totals(session):
+    stmt = select(
+        models.EventDay.event_id,
+        models.EventDay.day,
+        models.EventDay.seconds,
+        models.EventDay.entries,
+    ).order_by(models.EventDay.event_id, models.EventDay.day)
+    return [tuple(row) for row in session.execute(stmt)]
+
+
+def test_totals_follow_entry_writes(api, app, seed_history):
+    with app.get_db() as session:
+        seed_history(session, tasks=2, days=3, entries=2)
+        assert stored_totals(session) == live_totals(session)
+        assert len(stored_totals(session)) == 6
+
+    # move an entry to the next day, like editing it in the entries page
+    api.entry_update(
+        1, {"started_on": "2024-01-02 09:00:00", "stopped_on": "2024-01-02 09:05:00"}
+    )
+    # zero second entries are not reported
+    api.entry_create(2, "2024-01-02 10:00:00", "2024-01-02 10:00:00", 0)
+    api.event_add_entry(
+        3, DT.datetime(2024, 1, 3, 11), DT.datetime(2024, 1, 3, 11, 1), 60, "FINISHED"
+    )
+    api.entry_destroy(4)
+
+    with app.get_db() as session:
+        session.execute(
+            update(models.Entry).where(models.Entry.id == 5).values(seconds=0)
+        )
+        session.commit()
+        stored = stored_totals(session)
+        assert stored == live_totals(session)
+        assert (1, "2024-01-02", 300, 1) in stored
+
+    api.event_destroy(2)
+    api.task_destroy(2)
+    with app.get_db() as session:
+        assert stored_totals(session) == live_totals(session)
+        assert {row[0] for row in stored_totals(session)} == {1, 3}
+
+
+def test_rebuild(session, seed_history):
+    seed_history(session, projects=2, tasks=2, days=2, entries=3)
+    expected = stored_totals(session)
+
+    session.execute(update(models.EventDay).values(seconds=1))
+    assert models.EventDay.Rebuild(session) == len(expected)
+    assert stored_totals(session) == expected
+
+
+def test_breakdown_matches_entries(session, seed_history):
+    seed_history(session, clients=2, projects=2, tasks=3, days=4, entries=2)
+    started = DT.datetime(2024, 1, 2, 23, 30)
+    event = models.Event.Fetch_by_id(session, 1)
+    session.add(event.create_entry(started, started, 120, StopReasons.FINISHED))
+    session.commit()
+
+    rows = models.Queries.BreakdownByConditions(
+        session, start_date=DT.date(2024, 1, 1), end_date=DT.date(2024, 1, 3)
+    )
+    day = func.strftime("%Y-%m-%d", models.Entry.started_on)
+    expected = session.execute(
+        select(
+            day,
+            models.Client.name,
+            models.Project.name,
+            models.Task.name,
+            func.sum(models.Entry.seconds),
+            func.count(models.Entry.id),
+        )
+        .join(models.Event, models.Entry.event_id == models.Event.id)
+        .join(models.Task)
+        .join(models.Project)
+        .join(models.Client)
+        .where(models.Entry.seconds > 0)
+        .where(models.Event.start_date.between("2024-01-01", "2024-01-03"))
+        .group_by(models.Client.name, models.Project.name, day, models.Task.name)
+        .order_by(models.Client.name, models.Project.name, day, models.Task.name)
+    ).all()
+
+    assert [tuple(row) for row in rows] == [tuple(row) for row in expected]
@@ -0,0 +1,92 @@
+import datetime as DT
+
+import pytest
+from sqlalchemy import delete, select, update
+
+from pyminder.lib import models
+from pyminder.lib.app_types import StopReasons
+
+
+@pytest.fixture
+def event(session, seed_history):
+    seed_history(session, entries=0)
+    return session.scalars(select(models.Event)).one()
+
+
+def add_entry(session, event, seconds):
+    now = DT.datetime(2024, 1, 1, 9)
+    entry = event.create_entry(now, now, seconds, StopReasons.FINISHED)
+    session.add(entry)
+    session.commit()
+    return entry
+
+
+def duration_of(session, event_id):
+    return session.execute(
+        select(models.Event.duration).where(models.Event.id == event_id)
+    ).scalar_one()
+
+
+def test_duration_follows_entry_writes(session, event) -> None:
+    first = add_entry(session, event, 30)
+    second = add_entry(session, event, 45)
+    assert duration_of(session, event.id) == 75
+
+    # ORM update, like entry_update
+    first.seconds = 10
+    session.commit()
+    assert duration_of(session, event.id) == 55
+
+    # Core update, like a timer checkpoint
+    session.execute(
+        update(models.Entry).where(models.Entry.id == second.id).values(seconds=50)
+    )
+    session.commit()
+    assert duration_of(session, event.id) == 60
+
+    # Core delete, like entry_destroy
+    models.Entry.Delete_By_Id(session, first.id)
+    session.commit()
+    assert duration_of(session, event.id) == 50
+
+
+def test_duration_follows_moved_entries(session, event) -> None:
+    other = models.Event(task_id=event.task_id, start_date=DT.date(2024, 1, 2))
+    session.add(other)
+    session.commit()
+    entry = add_entry(session, event, 30)
+
+    entry.event_id = other.id
+    session.commit()
+
+    assert duration_of(session, event.id) == 0
+    assert duration_of(session, other.id) == 30
+
+
+def test_aggregates_read_duration(session, event) -> None:
+    add_entry(session, event, 3725)
+
+    expected = {"hours": 1, "minutes": 2, "seconds": 5}
+    assert models.Event.GetAllTime(session, event.id) == expected
+    assert models.Task.GetAllTime(session, event.task_id) == expected
+    assert models.Project.GetAllTime(session, event.task.project_id) == expected
+    assert models.Client.GetAllTime(session, event.task.project.client_id) == expected
+    assert event.get_time() == expected
+
+
+def test_rebuild_durations(session, event) -> None:
+    add_entry(session, event, 30)
+    for trigger in ("insert", "update", "delete"):
+        session.execute(
+            models.sqlalchemy.text(f"DROP TRIGGER entry_duration_{trigger}")
+        )
+    session.execute(delete(models.Entry))
+    session.commit()
+    assert duration_of(session, event.id) == 30
+
+    assert models.Event.RebuildDurations(session) == 1
+    session.commit()
+    assert duration_of(session, event.id) == 0
+
+    add_entry(session, event, 20)
+    assert duration_of(session, event.id) == 20
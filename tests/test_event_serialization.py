@@ -0,0 +1,32 @@
+import pytest
+
+
+@pytest.mark.parametrize("include_entries,expected", [(False, 1), (True, 2)])
+def test_events_by_task_id_batches_entries(
+    app, api, count_statements, seed_history, include_entries, expected
+) -> None:
+    with app.get_db() as session:
+        seed_history(session, days=30, entries=4)
+
+    with count_statements(app.engine) as statements:
+        events = api.events_by_task_id(1, include_entries)
+
+    assert len(statements) == expected
+    assert len(events) == 30
+    for event in events:
+        assert event["entries_count"] == 4
+        assert event["time"] == {"hours": 0, "minutes": 4, "seconds": 0}
+        if include_entries:
+            assert len(event["entries"]) == 4
+        else:
+            assert event["entries"] is None
+
+
+def test_event_get_by_date(app, api, seed_history) -> None:
+    with app.get_db() as session:
+        seed_history(session, days=2, entries=2)
+
+    event = api.event_get_by_date(1, "2024-01-02", include_entries=True)
+    assert event["start_date"] == "2024-01-02"
+    assert len(event["entries"]) == 2
+    assert api.event_get_by_date(1, "2023-01-01") is None
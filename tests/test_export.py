@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+
+import flask
+
+from pyminder.lib import export
+
+
+def test_entries_stream_in_batches(db, session, seed_history):
+    engine, _ = db
+    seed_history(session, tasks=3, days=4, entries=5)
+
+    chunks = list(export.export(engine, "entries", "jsonl", {}, batch_size=7))
+
+    assert len(chunks) == 9  # 60 entries in batches of 7
+    rows = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert len(rows) == 60
+    assert rows[0]["start_date"] == "2024-01-01"
+    assert rows[0]["started_on"] == "2024-01-01T09:00:00"
+    assert rows[0]["stop_reason"] == "finished"
+    assert [row["start_date"] for row in rows] == sorted(
+        row["start_date"] for row in rows
+    )
+
+
+def test_breakdown_csv(db, session, seed_history):
+    engine, _ = db
+    seed_history(session, projects=2, tasks=2, days=3, entries=2)
+
+    text = "".join(
+        export.export(
+            engine,
+            "breakdown",
+            "csv",
+            {"client_id": 1, "project_id": 2, "start_date": None},
+            batch_size=2,
+        )
+    )
+    rows = list(csv.DictReader(io.StringIO(text)))
+
+    assert len(rows) == 6
+    assert {row["project_name"] for row in rows} == {"project 1"}
+    assert rows[0] == dict(
+        date_when="2024-01-01",
+        client_name="client 0",
+        project_name="project 1",
+        task_name="task 0",
+        seconds="120",
+        entries="2",
+    )
+
+
+def test_download_route(db, session, seed_history):
+    engine, _ = db
+    seed_history(session, tasks=2, days=5, entries=1)
+    app = flask.Flask(__name__)
+    app.register_blueprint(export.blueprint(engine))
+    client = app.test_client()
+
+    response = client.get(
+        "/export/entries.csv?start_date=2024-01-02&end_date=2024-01-03"
+    )
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == "text/csv"
+    assert "attachment; filename=entries.csv" == response.headers["Content-Disposition"]
+    assert len(response.get_data(as_text=True).splitlines()) == 1 + 4
+
+    assert client.get("/export/entries.xml").status_code == 404
+    assert client.get("/export/entries.csv?start_date=soon").status_code == 400
+
+
+def test_empty_export_has_csv_header(db):
+    engine, _ = db
+
+    assert list(export.export(engine, "breakdown", "jsonl", {})) == [""]
+    header = "".join(export.export(engine, "breakdown", "csv", {}))
+    assert (
+        header.strip() == "date_when,client_name,project_name,task_name,seconds,entries"
+    )
@@ -0,0 +1,117 @@
+import datetime as DT
+
+import numpy as np
+import pytest
+from sqlalchemy import insert
+
+from pyminder.lib import heatmap, models
+from pyminder.lib.api import API
+from pyminder.lib.app_types import StopReasons
+from pyminder.lib.application import Application
+
+MONDAY = DT.date(2024, 1, 1)
+
+
+def spans(*entries):
+    started, stopped, seconds = zip(
+        *(
+            (heatmap.to_epoch(MONDAY) + start, heatmap.to_epoch(MONDAY) + stop, tracked)
+            for start, stop, tracked in entries
+        )
+    )
+    return np.array(started), np.array(stopped), np.array(seconds)
+
+
+def test_calendar_splits_entries_at_midnight():
+    day = 86400
+    result = heatmap.calendar(
+        spans(
+            (day - 1800, day + 5400, 7200),  # 23:30 to 01:30
+            (2 * day, 2 * day + 7200, 3600),  # paused half of the time
+            (2 * day + 60, 2 * day + 60, 45),  # no span, counted at its start
+            (-3600, 1800, 5400),  # started before the first day
+            (5 * day, 5 * day + 60, 60),  # after the last day
+        ),
+        MONDAY,
+        MONDAY + DT.timedelta(days=2),
+    )
+
+    assert result["seconds"] == [1800 + 1800, 5400, 3600 + 45]
+    assert result["total_seconds"] == 1800 + 1800 + 5400 + 3600 + 45
+    assert result["end_date"] == "2024-01-03"
+
+
+def test_weekday_hour_splits_entries_at_the_hour():
+    result = heatmap.weekday_hour(
+        spans(
+            (9 * 3600 + 1800, 10 * 3600 + 1800, 3600),  # Monday 09:30 to 10:30
+            (8 * 86400 + 23 * 3600, 9 * 86400 + 3600, 7200),  # Tuesday 23:00 to 01:00
+        ),
+        MONDAY,
+        MONDAY + DT.timedelta(days=13),
+    )
+
+    cells = np.array(result["seconds"])
+    assert cells.shape == (7, 24)
+    assert cells[0, 9] == cells[0, 10] == 1800
+    assert cells[1, 23] == cells[2, 0] == 3600
+    assert cells.sum() == result["total_seconds"] == 3600 + 7200
+
+
+def test_apportion_matches_per_second_binning():
+    rng = np.random.default_rng(7)
+    started = rng.integers(-500, 5000, 300)
+    stopped = started + rng.integers(0, 2000, 300)
+    seconds = rng.integers(0, 2000, 300)
+
+    expected = np.zeros(12)
+    for start, stop, tracked in zip(started, stopped, seconds):
+        if stop == start:
+            if 0 <= start < 12 * 400:
+                expected[start // 400] += tracked
+            continue
+        for second in range(max(start, 0), min(stop, 12 * 400)):
+            expected[second // 400] += tracked / (stop - start)
+
+    result = heatmap.apportion(started, stopped, seconds, 0, 400, 12)
+    np.testing.assert_allclose(result, expected)
+
+
+@pytest.mark.parametrize("method", ["heatmap_calendar", "heatmap_weekday_hour"])
+def test_api_heatmaps_reject_reversed_ranges(api, method):
+    with pytest.raises(ValueError, match="before start_date"):
+        getattr(api, method)("2024-01-31", "2024-01-01")
+    assert getattr(api, method)("2024-01-31", "2024-01-31")["total_seconds"] == 0
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_api_heatmaps(tmp_path, seed_history, columnar):
+    app = Application(tmp_path, tmp_path / "app.sqlite3", columnar=columnar)
+    try:
+        with app.get_db() as session:
+            seed_history(session, clients=2, days=3, entries=2)
+            session.execute(
+                insert(models.Entry).values(
+                    event_id=1,
+                    started_on=DT.datetime(2024, 1, 1, 23, 0),
+                    stopped_on=DT.datetime(2024, 1, 2, 1, 0),
+                    seconds=7200,
+                    stop_reason=StopReasons.FINISHED,
+                )
+            )
+            session.commit()
+        api = API(app)
+
+        calendar = api.heatmap_calendar("2024-01-01", "2024-01-04")
+        assert calendar["seconds"] == [4 * 60 + 3600, 4 * 60 + 3600, 4 * 60, 0]
+        client = api.heatmap_calendar("2024-01-02", "2024-01-02", 2)
+        assert client["seconds"] == [2 * 60]
+
+        cells = api.heatmap_weekday_hour("2024-01-01", "2024-01-07")["seconds"]
+        assert cells[0][9] == cells[1][9] == cells[2][9] == 4 * 60
+        assert cells[0][23] == cells[1][0] == 3600
+        assert sum(map(sum, cells)) == calendar["total_seconds"]
+    finally:
+        app.push.close()
+        app.Session.remove()
+        app.engine.dispose()
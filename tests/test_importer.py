@@ -0,0 +1,181 @@
+import json
+
+from sqlalchemy import func, select
+
+from pyminder.lib import export, importer, models
+
+
+def breakdown(engine):
+    with engine.connect() as conn:
+        return conn.execute(models.Queries.BreakdownByConditionsStmt()).all()
+
+
+def counts(engine):
+    with engine.connect() as conn:
+        return [
+            conn.execute(select(func.count(model.id))).scalar()
+            for model in (models.Client, models.Project, models.Task, models.Event)
+        ] + [conn.execute(select(func.count(models.Entry.id))).scalar()]
+
+
+def test_export_round_trip(db, session, seed_history, tmp_path):
+    engine, _ = db
+    seed_history(session, clients=2, projects=2, tasks=2, days=3, entries=2)
+    for fmt in ("csv", "jsonl"):
+        path = tmp_path / f"entries.{fmt}"
+        path.write_text("".join(export.export(engine, "entries", fmt, {})))
+
+        target, _ = models.connect(tmp_path / f"{fmt}.sqlite3")
+        ticks = []
+        summary = importer.import_entries(
+            target, path, progress=lambda *tick: ticks.append(tick), batch_size=10
+        )
+
+        assert summary["error_count"] == 0
+        assert (summary["records"], summary["entries"]) == (48, 48)
+        assert [summary[kind] for kind in ("clients", "projects", "tasks")] == [2, 4, 8]
+        assert summary["events"] == 24
+        assert ticks == [(10, 48), (20, 48), (30, 48), (40, 48), (48, 48)]
+        assert breakdown(target) == breakdown(engine)
+        target.dispose()
+
+
+def test_existing_hierarchy_is_reused(db, session, seed_history, tmp_path):
+    engine, _ = db
+    seed_history(session, days=2)
+    path = tmp_path / "more.json"
+    path.write_text(
+        json.dumps(
+            [
+                dict(
+                    client="client 0",
+                    project="project 0",
+                    task="task 0",
+                    start="2024-01-02T10:00:00",
+                    stop="2024-01-02T10:30:00",
+                ),
+                dict(
+                    client="client 0",
+                    project="project 0",
+                    task="task 1",
+                    start="2024-01-02T11:00:00",
+                    stop="2024-01-02T11:01:00",
+                    seconds=45,
+                    stop_reason="PAUSED",
+                ),
+            ]
+        )
+    )
+
+    summary = importer.import_entries(engine, path)
+
+    assert [summary[kind] for kind in ("clients", "projects", "tasks", "events")] == [
+        0,
+        0,
+        1,
+        1,
+    ]
+    assert counts(engine) == [1, 1, 2, 3, 4]
+    day = [row for row in breakdown(engine) if row.date_when == "2024-01-02"]
+    assert [(row.task_name, row.seconds) for row in day] == [
+        ("task 0", 60 + 1800),
+        ("task 1", 45),
+    ]
+
+
+def test_dry_run_and_invalid_records_write_nothing(db, session, tmp_path):
+    engine, _ = db
+    path = tmp_path / "entries.csv"
+    path.write_text(
+        "client_name,project_name,task_name,started_on,stopped_on,seconds\n"
+        "a,b,c,2024-01-01T09:00:00,2024-01-01T10:00:00,\n"
+        "a,b,,2024-01-01T09:00:00,2024-01-01T10:00:00,\n"
+        "a,b,c,2024-01-01T09:00:00,2024-01-01T08:00:00,\n"
+        "a,b,c,yesterday,2024-01-01T10:00:00,\n"
+        "a,b,c,2024-01-01T09:00:00,2024-01-01T10:00:00,lots\n"
+    )
+
+    summary = importer.import_entries(engine, path)
+    assert summary["error_count"] == 4
+    assert summary["errors"] == [
+        "line 3: task_name is missing",
+        "line 4: stopped_on is before started_on",
+        "line 5: started_on/stopped_on must be ISO datetimes without a UTC offset",
+        "line 6: seconds must be a number",
+    ]
+    assert summary["entries"] == 0
+
+    path.write_text("\n".join(path.read_text().splitlines()[:2]))
+    summary = importer.import_entries(engine, path, dry_run=True)
+    assert summary["error_count"] == 0
+    assert (summary["entries"], summary["clients"], summary["events"]) == (1, 1, 1)
+    assert counts(engine) == [0, 0, 0, 0, 0]
+
+
+def test_malformed_records_are_reported(db, tmp_path):
+    engine, _ = db
+    good = json.dumps(
+        dict(
+            client="a",
+            project="b",
+            task="c",
+            start="2024-01-01T09:00:00",
+            stop="2024-01-01T10:00:00",
+        )
+    )
+    cases = {
+        "lines.jsonl": (
+            f'{good}\n{{"client": "a",\n["a", "b"]\n{good}\n',
+            ["line 2: invalid JSON", "line 3: expected an object, not list"],
+        ),
+        "object.json": (
+            good,
+            ["line 1: a .json import must be a list of records"],
+        ),
+        "broken.json": (
+            f"[{good},\n",
+            ["line 2: invalid JSON"],
+        ),
+        "records.json": (
+            f'[{good}, "a,b,c", {good[:-1]}, "seconds": [1]}}]',
+            ["line 2: expected an object, not str", "line 3: seconds must be"],
+        ),
+        "offsets.csv": (
+            "client,project,task,start,stop\n"
+            "a,b,c,2024-01-01T09:00:00+02:00,2024-01-01T10:00:00\n"
+            "a,b,c,2024-01-01T09:00:00Z,2024-01-01T10:00:00Z\n",
+            [
+                "line 2: started_on/stopped_on must be ISO datetimes",
+                "line 3: started_on/stopped_on must be ISO datetimes",
+            ],
+        ),
+    }
+    for name, (text, errors) in cases.items():
+        path = tmp_path / name
+        path.write_text(text)
+        summary = importer.import_entries(engine, path)
+        assert summary["error_count"] == len(errors), name
+        for error, expected in zip(summary["errors"], errors):
+            assert error.startswith(expected), name
+        assert summary["entries"] == 0
+    assert counts(engine) == [0, 0, 0, 0, 0]
+
+
+def test_api_entries_import(api, app, tmp_path):
+    path = tmp_path / "entries.jsonl"
+    path.write_text(
+        json.dumps(
+            dict(
+                client_name="client",
+                project_name="project",
+                task_name="task",
+                started_on="2024-03-01T09:00:00",
+                stopped_on="2024-03-01T09:10:00",
+            )
+        )
+    )
+
+    summary = api.entries_import(str(path))
+
+    assert summary["entries"] == 1
+    assert api.report_generate({})["total_seconds"] == 600
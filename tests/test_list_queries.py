@@ -0,0 +1,48 @@
+import pytest
+
+from pyminder.lib import models
+
+LIST_CALLS = [
+    ("clients_list", (), 1),
+    ("client_list_active", (), 1),
+    ("projects_list_by_client_id", (1,), 1),
+    ("projects_list_active_by_client_id", (1,), 1),
+    ("tasks_lists_by_project_id", (1,), 1),
+    ("tasks_list_active_by_project_id", (1,), 1),
+    ("clients_list", (True,), 2),
+    ("projects_list_by_client_id", (1, True), 2),
+    ("tasks_lists_by_project_id", (1, True), 2),
+]
+
+
+def statements_for(app, api, count_statements, method, args):
+    with count_statements(app.engine) as statements:
+        getattr(api, method)(*args)
+    return len(statements)
+
+
+@pytest.mark.parametrize("method,args,expected", LIST_CALLS)
+def test_list_queries_do_not_grow_with_history(
+    app, api, count_statements, seed_history, method, args, expected
+) -> None:
+    with app.get_db() as session:
+        seed_history(session, clients=1, projects=1, tasks=1, days=1, entries=1)
+    small = statements_for(app, api, count_statements, method, args)
+
+    with app.get_db() as session:
+        seed_history(session, clients=3, projects=4, tasks=5, days=10, entries=3)
+    large = statements_for(app, api, count_statements, method, args)
+
+    assert small == large == expected
+
+
+def test_counts_are_correct(session, seed_history) -> None:
+    seed_history(session, clients=1, projects=2, tasks=3, days=4)
+
+    client = models.Client.GetById(session, 1).to_dict()
+    project = models.Project.GetById(session, 1).to_dict()
+    task = models.Task.GetById(session, 1).to_dict()
+
+    assert client["projects_count"] == 2
+    assert project["tasks_count"] == 3
+    assert task["events_count"] == 4
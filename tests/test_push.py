@@ -0,0 +1,98 @@
+import threading
+
+from pyminder.lib.push import PushDispatcher
+
+
+class BlockingSender:
+    """
+    Frontend stand-in that holds the sender thread until released.
+    """
+
+    def __init__(self):
+        self.sent: list[str] = []
+        self.release = threading.Event()
+        self.entered = threading.Event()
+
+    def __call__(self, script):
+        self.entered.set()
+        self.release.wait(5)
+        self.sent.append(script)
+
+
+def test_pending_ticks_are_coalesced():
+    sender = BlockingSender()
+    push = PushDispatcher(sender)
+
+    push.tick("a", "a0")
+    assert sender.entered.wait(5)
+    for number in range(1, 100):
+        push.tick("a", f"a{number}")
+        push.tick("b", f"b{number}")
+    assert push.stats()["pending"] == 2
+
+    sender.release.set()
+    assert push.drain(5)
+    push.close()
+
+    assert sender.sent == ["a0", "a99", "b99"]
+    stats = push.stats()
+    assert stats["delivered"] == 3
+    assert stats["coalesced"] == 196
+    assert stats["dropped"] == 0
+
+
+def test_clear_drops_stale_tick_and_keeps_order():
+    sender = BlockingSender()
+    push = PushDispatcher(sender)
+
+    push.tick("a", "a0")
+    assert sender.entered.wait(5)
+    push.tick("b", "b1")
+    push.tick("a", "a1")
+    push.clear("a", "end a")
+    push.tick("a", "a2")
+
+    sender.release.set()
+    assert push.drain(5)
+    push.close()
+
+    assert sender.sent == ["a0", "b1", "end a", "a2"]
+
+
+def test_pending_is_bounded():
+    sender = BlockingSender()
+    push = PushDispatcher(sender, limit=3)
+
+    push.tick("first", "first")
+    assert sender.entered.wait(5)
+    push.clear("a", "end a")
+    for name in "bcde":
+        push.tick(name, name)
+
+    stats = push.stats()
+    assert stats["pending"] == 3
+    assert stats["dropped"] == 2
+
+    sender.release.set()
+    assert push.drain(5)
+    push.close()
+    assert sender.sent == ["first", "end a", "d", "e"]
+
+
+def test_tell_does_not_wait_for_the_webview(app):
+    sender = BlockingSender()
+    app.push.send = sender
+
+    app.tell("timer", 0, 0, 0)
+    assert sender.entered.wait(5)
+    for second in range(1, 100):
+        app.tell("timer", 0, 0, second)
+    app.clearCallback("timer")
+
+    assert not sender.release.is_set()
+    sender.release.set()
+    assert app.push.drain(5)
+    assert sender.sent == [
+        "window.criticalCall('timer', [0, 0, 0])",
+        "window.endCallback('timer')",
+    ]
@@ -0,0 +1,161 @@
+"""
+Every bridge method that touches the database runs against a small and a
+large seeded history and must stay within its statement budget at both sizes,
+with the same count, so N+1 queries show up here instead of as slow windows.
+
+"""
+
+import datetime as DT
+import inspect
+
+import pytest
+from sqlalchemy import update
+
+from pyminder.lib import models
+from pyminder.lib.api import API
+from pyminder.lib.application import Application
+
+SIZES = {
+    "small": dict(),
+    "large": dict(clients=2, projects=3, tasks=4, days=6, entries=3),
+}
+
+# bridge methods that never query the database
+NO_SQL = {
+    "info",
+    "title_set",
+    "timer_check",
+    "timer_override",
+    "timer_stop",
+    "timer_pause",
+    "timer_resume",
+    "open_window",
+    "window_toggle_resize",
+    "report_cache_stats",
+    "diagnostics_get",
+}
+
+
+def unique_task_name(app):
+    with app.get_db() as session:
+        session.execute(
+            update(models.Task).where(models.Task.id == 1).values(name="unique")
+        )
+    return ()
+
+
+def import_file(app):
+    path = app.here / "import.csv"
+    path.write_text(
+        "client_name,project_name,task_name,started_on,stopped_on\n"
+        "client 0,project 0,task 0,2024-02-01T09:00:00,2024-02-01T10:00:00\n"
+        "new client,new project,new task,2024-02-01T09:00:00,2024-02-01T10:00:00\n"
+    )
+    return (str(path),)
+
+
+# method, arguments (or a callable preparing the database and returning
+# them), statement budget
+BUDGETS = [
+    ("client_create", ("new",), 2),
+    ("clients_list", (True,), 2),
+    ("client_list_active", (True,), 2),
+    ("client_get", (1,), 2),
+    ("client_set_status", (1, False), 2),
+    ("client_update", (1, "renamed"), 2),
+    ("client_destroy", (1,), 1),
+    ("project_create", (1, "new"), 2),
+    ("projects_list_by_client_id", (1, True), 2),
+    ("projects_list_active_by_client_id", (1, True), 2),
+    ("project_get", (1,), 2),
+    ("project_update", (1, "renamed"), 2),
+    ("project_set_status", (1, False), 2),
+    ("project_destroy", (1,), 1),
+    ("task_create", (1, "new"), 2),
+    ("tasks_lists_by_project_id", (1, True), 2),
+    ("tasks_list_active_by_project_id", (1, True), 2),
+    ("task_get", (1,), 2),
+    ("task_get_by_name", lambda app: unique_task_name(app) + ("unique",), 1),
+    ("task_update", (1, "renamed"), 2),
+    ("task_destroy", (1,), 1),
+    (
+        "task_set_status_by_name",
+        lambda app: unique_task_name(app) + ("unique", False),
+        2,
+    ),
+    ("task_set_status", (1, False), 1),
+    ("event_create", (1, "2025-01-01"), 2),
+    ("events_get_or_create_by_date", (1, DT.date(2024, 1, 1)), 3),
+    ("events_by_task_id", (1, True), 2),
+    ("event_active_by_task_id", (1, True), 2),
+    ("event_get", (1, True), 2),
+    ("event_get_by_date", (1, "2024-01-01", True), 2),
+    ("event_list_dates_by_project_id", (1,), 1),
+    ("event_update", (1, "details", "notes"), 2),
+    ("event_destroy", (1,), 1),
+    (
+        "event_add_entry",
+        (1, DT.datetime(2024, 1, 1, 12), DT.datetime(2024, 1, 1, 13), 60, "FINISHED"),
+        2,
+    ),
+    ("entries_lists_by_event_id", (1,), 1),
+    ("entry_get", (1,), 1),
+    (
+        "entry_update",
+        (1, dict(started_on="2024-01-01T09:00", stopped_on="2024-01-01T09:30")),
+        2,
+    ),
+    ("entry_destroy", (1,), 1),
+    ("entry_create", (1, "2024-01-01T12:00:00", "2024-01-01T12:30:00"), 1),
+    ("entries_import", import_file, 10),
+    ("timer_owner", (True,), 0),
+    ("timer_start", ("listener", 1, True), 5),
+    ("shortcut_get_all", (), 1),
+    ("shortcut_get", lambda app: (API(app).shortcut_add(1, 1, 1)["id"],), 1),
+    ("shortcut_add", (1, 1, 1), 5),
+    ("time_tree", ("2024-01-01", "2024-12-31"), 1),
+    ("report_generate", ({"client_id": 1},), 1),
+    ("report_build2text", ({"client_id": 1},), 1),
+    ("report_day", ("2024-01-02",), 1),
+    ("report_range_activities", ("2024-01-01", "2024-01-07"), 1),
+    ("heatmap_calendar", ("2024-01-01", "2024-01-31", 1), 1),
+    ("heatmap_weekday_hour", ("2024-01-01", "2024-01-31", 1), 1),
+]
+
+
+def test_every_method_has_a_budget():
+    public = {
+        name
+        for name, _ in inspect.getmembers(API, inspect.isfunction)
+        if not name.startswith("_")
+    }
+    assert public - NO_SQL == {method for method, _, _ in BUDGETS}
+
+
+@pytest.mark.parametrize(
+    "method,args,budget", BUDGETS, ids=[method for method, _, _ in BUDGETS]
+)
+def test_query_budget(
+    tmp_path, seed_history, query_budget, method, args, budget
+) -> None:
+    counts = {}
+    for size, shape in SIZES.items():
+        here = tmp_path / size
+        here.mkdir()
+        app = Application(here, here / "app.sqlite3")
+        api = API(app)
+        try:
+            with app.get_db() as session:
+                seed_history(session, **shape)
+            arguments = args(app) if callable(args) else args
+
+            with query_budget(app.engine, budget, f"{method} ({size})") as statements:
+                getattr(api, method)(*arguments)
+            counts[size] = len(statements)
+        finally:
+            api.timer_stop()
+            app.push.close()
+            app.Session.remove()
+            app.engine.dispose()
+
+    assert counts["small"] == counts["large"], f"{method} grows with the history"
@@ -0,0 +1,231 @@
+"""
+EXPLAIN QUERY PLAN regression suite.
+
+Every query in `models.Queries` and every model time aggregate runs against a
+seeded and ANALYZEd database.  The statements they emit are explained and the
+test fails if a history table (Event, Entry) is scanned or if SQLite needs a
+temporary b-tree that is not listed in the case's allowances.
+
+Client, Project, and Task are allowed to be scanned as they grow with the
+number of records a user creates, not with how long they have been tracking.
+"""
+
+import datetime as DT
+
+import pytest
+from sqlalchemy import event, insert, text
+
+from pyminder.lib import models
+from pyminder.lib.app_types import StopReasons
+
+HISTORY_TABLES = {"Event", "Entry"}
+
+FIRST_DAY = DT.date(2024, 1, 1)
+DAYS = 120
+START = FIRST_DAY + DT.timedelta(days=30)
+END = FIRST_DAY + DT.timedelta(days=37)
+
+# The breakdowns group and order by names and a date computed from each entry,
+# which SQLite can only do with a temporary b-tree.
+BREAKDOWN_SORTS = {"USE TEMP B-TREE FOR GROUP BY", "USE TEMP B-TREE FOR ORDER BY"}
+
+CASES = {
+    "Client.GetAllTime": (lambda s: models.Client.GetAllTime(s, 1), set()),
+    "Client.GetTimeBetweenDates": (
+        lambda s: models.Client.GetTimeBetweenDates(s, 1, START, END),
+        set(),
+    ),
+    "Project.GetAllTime": (lambda s: models.Project.GetAllTime(s, 1), set()),
+    "Project.GetTimeBetweenDates": (
+        lambda s: models.Project.GetTimeBetweenDates(s, 1, START, END),
+        set(),
+    ),
+    "Task.GetAllTime": (lambda s: models.Task.GetAllTime(s, 1), set()),
+    "Task.GetTimeBetweenDates": (
+        lambda s: models.Task.GetTimeBetweenDates(s, 1, START, END),
+        set(),
+    ),
+    "Event.GetAllTime": (lambda s: models.Event.GetAllTime(s, 1), set()),
+    "Event.GetTimeBetweenDates": (
+        lambda s: models.Event.GetTimeBetweenDates(s, 1, START, END),
+        set(),
+    ),
+    "Event.GetByTask": (lambda s: models.Event.GetByTask(s, 1, True), set()),
+    "Entry.GetByEvent": (lambda s: models.Entry.GetByEvent(s, 1), set()),
+    # Days come out in index order, only each day's entries are sorted by
+    # when they started
+    "Queries.DayActivities": (
+        lambda s: models.Queries.DayActivities(s, START),
+        {"USE TEMP B-TREE FOR RIGHT PART OF ORDER BY"},
+    ),
+    "Queries.RangeActivitiesStmt": (
+        lambda s: s.execute(models.Queries.RangeActivitiesStmt(START, END)).all(),
+        {"USE TEMP B-TREE FOR RIGHT PART OF ORDER BY"},
+    ),
+    "Queries.BreakdownAll": (lambda s: models.Queries.BreakdownAll(s), BREAKDOWN_SORTS),
+    "Queries.BreakdownClientByName": (
+        lambda s: models.Queries.BreakdownClientByName(s, "client 1"),
+        BREAKDOWN_SORTS,
+    ),
+    "Queries.BreakdownClientByID": (
+        lambda s: models.Queries.BreakdownClientByID(s, 1),
+        BREAKDOWN_SORTS,
+    ),
+    "Queries.BreakdownClientByIDAndOptionalDates": (
+        lambda s: models.Queries.BreakdownClientByIDAndOptionalDates(s, 1, START, END),
+        BREAKDOWN_SORTS,
+    ),
+    "Queries.BreakdownClientProjectDate": (
+        lambda s: models.Queries.BreakdownClientProjectDate(
+            s, "client 1", "project 1", START
+        ),
+        BREAKDOWN_SORTS,
+    ),
+    "Queries.BreakdownClientProjectBetweenDates": (
+        lambda s: models.Queries.BreakdownClientProjectBetweenDates(
+            s, "client 1", "project 1", START, END
+        ),
+        BREAKDOWN_SORTS,
+    ),
+    "Queries.BreakdownProjectByIDAndOptionallyBetweenDates": (
+        lambda s: models.Queries.BreakdownProjectByIDAndOptionallyBetweenDates(
+            s, 1, START, END
+        ),
+        BREAKDOWN_SORTS,
+    ),
+    "Queries.BreakdownTaskByIDAndOptionallyBetweenDates": (
+        lambda s: models.Queries.BreakdownTaskByIDAndOptionallyBetweenDates(
+            s, 1, START, END
+        ),
+        BREAKDOWN_SORTS,
+    ),
+    "Queries.BreakdownByConditions": (
+        lambda s: models.Queries.BreakdownByConditions(s, 1, 1, 1, START, END),
+        BREAKDOWN_SORTS,
+    ),
+    "Queries.BreakdownByConditions dates only": (
+        lambda s: models.Queries.BreakdownByConditions(
+            s, start_date=START, end_date=END
+        ),
+        BREAKDOWN_SORTS,
+    ),
+    "Queries.TimeTree": (lambda s: models.Queries.TimeTree(s), set()),
+    "Queries.TimeTree dates": (
+        lambda s: models.Queries.TimeTree(s, START, END, active_only=True),
+        set(),
+    ),
+    "Queries.TimeTotals": (
+        lambda s: models.Queries.TimeTotals(s, project_id=1),
+        set(),
+    ),
+    # Exports stream these.  A date range must come out in index order, a
+    # client's entries are few enough to sort across its tasks.
+    "Queries.EntriesByConditionsStmt client": (
+        lambda s: s.execute(
+            models.Queries.EntriesByConditionsStmt(1, 1, None, START, END)
+        ).all(),
+        {"USE TEMP B-TREE FOR ORDER BY"},
+    ),
+    "Queries.EntriesByConditionsStmt dates only": (
+        lambda s: s.execute(
+            models.Queries.EntriesByConditionsStmt(start_date=START, end_date=END)
+        ).all(),
+        set(),
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def planned_db(tmp_path_factory):
+    path = tmp_path_factory.mktemp("plans") / "plans.sqlite3"
+    engine, Session = models.connect(path)
+
+    with engine.begin() as conn:
+        task_ids = []
+        for client_no in range(4):
+            client_id = conn.execute(
+                insert(models.Client).values(name=f"client {client_no}")
+            ).inserted_primary_key[0]
+            for project_no in range(4):
+                project_id = conn.execute(
+                    insert(models.Project).values(
+                        name=f"project {project_no}", client_id=client_id
+                    )
+                ).inserted_primary_key[0]
+                for task_no in range(5):
+                    task_ids.append(
+                        conn.execute(
+                            insert(models.Task).values(
+                                name=f"task {task_no}", project_id=project_id
+                            )
+                        ).inserted_primary_key[0]
+                    )
+
+        conn.execute(
+            insert(models.Event),
+            [
+                dict(task_id=task_id, start_date=FIRST_DAY + DT.timedelta(days=day))
+                for task_id in task_ids
+                for day in range(DAYS)
+            ],
+        )
+        entries = []
+        for event_id in range(1, len(task_ids) * DAYS + 1):
+            day = FIRST_DAY + DT.timedelta(days=(event_id - 1) % DAYS)
+            for entry_no in range(4):
+                started = DT.datetime.combine(day, DT.time(9, entry_no))
+                entries.append(
+                    dict(
+                        event_id=event_id,
+                        started_on=started,
+                        stopped_on=started + DT.timedelta(seconds=60),
+                        seconds=60,
+                        stop_reason=StopReasons.FINISHED,
+                    )
+                )
+        conn.execute(insert(models.Entry), entries)
+        conn.execute(text("ANALYZE"))
+
+    yield engine, Session
+    Session.remove()
+    engine.dispose()
+
+
+def explain(engine, query):
+    selects = []
+
+    def collect(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", collect)
+    try:
+        query()
+    finally:
+        event.remove(engine, "before_cursor_execute", collect)
+
+    assert selects, "query did not run any SELECT"
+
+    plans = []
+    with engine.connect() as conn:
+        for statement, parameters in selects:
+            plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plans.append([row.detail for row in plan])
+    return plans
+
+
+@pytest.mark.parametrize("name", CASES.keys())
+def test_query_plan(planned_db, name) -> None:
+    engine, Session = planned_db
+    query, allowed = CASES[name]
+
+    with Session() as session:
+        plans = explain(engine, lambda: query(session))
+
+    for plan in plans:
+        for step in plan:
+            words = step.split()
+            if words[0] == "SCAN" and words[1] in HISTORY_TABLES:
+                pytest.fail(f"{name} scans {words[1]}: {plan}")
+            if "TEMP B-TREE" in step and step not in allowed:
+                pytest.fail(f"{name} needs `{step}`: {plan}")
@@ -0,0 +1,39 @@
+def test_range_activities_match_report_day(api, app, seed_history, count_statements):
+    with app.get_db() as session:
+        seed_history(session, tasks=2, days=5, entries=2)
+
+    with count_statements(app.engine) as statements:
+        days = api.report_range_activities("2024-01-02", "2024-01-04")
+    assert len(statements) == 1
+
+    assert [day["day"] for day in days] == ["2024-01-02", "2024-01-03", "2024-01-04"]
+    for day in days:
+        assert day["columns"] is None
+        assert day["entries"] == api.report_day(day["day"])
+        assert day["seconds"] == 2 * 2 * 60
+        started = [entry["started_on"] for entry in day["entries"]]
+        assert started == sorted(started)
+
+
+def test_range_activities_columnar(api, app, seed_history):
+    with app.get_db() as session:
+        seed_history(session, tasks=2, days=3, entries=2)
+
+    rows = api.report_range_activities("2024-01-01", "2024-01-31")
+    columnar = api.report_range_activities("2024-01-01", "2024-01-31", True)
+
+    assert [day["day"] for day in columnar] == [
+        "2024-01-01",
+        "2024-01-02",
+        "2024-01-03",
+    ]
+    for by_row, by_column in zip(rows, columnar):
+        assert by_column["entries"] is None
+        assert by_column["seconds"] == by_row["seconds"]
+        columns = by_column["columns"]
+        assert "start_date" not in columns
+        assert [dict(zip(columns, values)) for values in zip(*columns.values())] == [
+            {name: entry[name] for name in columns} for entry in by_row["entries"]
+        ]
+
+    assert api.report_range_activities("2023-01-01", "2023-01-31", True) == []
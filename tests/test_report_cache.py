@@ -0,0 +1,121 @@
+import datetime as DT
+import threading
+
+from pyminder.lib import models
+from pyminder.lib.app_types import StopReasons
+from pyminder.lib.cache import LRUCache
+from pyminder.lib.generation import DataGeneration
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(capacity=2)
+    built = []
+
+    def build(key):
+        return lambda: built.append(key) or key.upper()
+
+    assert cache.get_or_build("a", build("a")) == "A"
+    cache.get_or_build("b", build("b"))
+    cache.get_or_build("a", build("a"))
+    cache.get_or_build("c", build("c"))
+    cache.get_or_build("a", build("a"))
+    cache.get_or_build("b", build("b"))
+
+    assert built == ["a", "b", "c", "b"]
+    assert cache.stats() == dict(capacity=2, size=2, hits=2, misses=4, evictions=2)
+
+
+def test_generation_counts_committed_writes_per_table(db, session, seed_history):
+    engine, _ = db
+    generation = DataGeneration(engine)
+    seed_history(session, days=2, entries=3)
+
+    assert generation.counters["Client"] >= 1
+    assert generation.counters["Entry"] >= 1
+    assert generation.of("Shortcut") == 0
+    before = generation.of("Client", "Entry")
+
+    session.execute(models.Client.__table__.select())
+    session.commit()
+    assert generation.of("Client", "Entry") == before
+
+    # nothing changes until the write is committed, or ever if rolled back
+    session.execute(
+        models.Entry.__table__.update().values(seconds=models.Entry.seconds + 1)
+    )
+    assert generation.of("Client", "Entry") == before
+    session.rollback()
+    assert generation.of("Client", "Entry") == before
+
+    session.execute(
+        models.Entry.__table__.update().values(seconds=models.Entry.seconds + 1)
+    )
+    session.commit()
+    assert generation.of("Client", "Entry") > before
+    assert generation.of("Client") == generation.counters["Client"]
+    generation.close()
+
+
+def test_read_during_an_uncommitted_write_is_not_kept(api, app, seed_history):
+    with app.get_db() as session:
+        seed_history(session)
+    payload = {"client_id": 1}
+    first = api.report_generate(payload)
+
+    written = threading.Event()
+    read = threading.Event()
+
+    def writer():
+        with app.get_db() as session:
+            event = models.Event.Fetch_by_id(session, 1)
+            started = DT.datetime(2024, 1, 1, 12)
+            session.add(event.create_entry(started, started, 600, StopReasons.FINISHED))
+            session.flush()
+            written.set()
+            read.wait(5)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    assert written.wait(5)
+    # the write is not committed yet, this still reads and caches the old rows
+    during = api.report_generate(payload)
+    assert during["total_seconds"] == first["total_seconds"]
+    read.set()
+    thread.join(5)
+
+    after = api.report_generate(payload)
+    assert after["total_seconds"] == first["total_seconds"] + 600
+
+
+def test_reports_are_cached_until_data_changes(
+    api, app, seed_history, count_statements
+):
+    with app.get_db() as session:
+        seed_history(session, clients=2, projects=2, tasks=2, days=3, entries=2)
+    payload = {"client_id": 1, "start_date": "2024-01-01", "end_date": "2024-01-02"}
+
+    first = api.report_generate(payload)
+    with count_statements(app.engine) as statements:
+        assert api.report_generate(dict(payload, wage=30)) is first
+        assert (
+            api.report_generate(dict(payload, start_date=DT.date(2024, 1, 1))) is first
+        )
+        text = api.report_build2text(payload)
+    assert statements == []
+    assert "Client:  client 0" in text
+    assert api.report_cache_stats()["hits"] == 3
+
+    # a project narrows only a client's report, without one it is ignored
+    assert api.report_generate({"project_id": 1}) is api.report_generate({})
+
+    with app.get_db() as session:
+        event = models.Event.Fetch_by_id(session, 1)
+        started = DT.datetime(2024, 1, 1, 12)
+        session.add(event.create_entry(started, started, 600, StopReasons.FINISHED))
+        session.commit()
+
+    refreshed = api.report_generate(payload)
+    assert refreshed is not first
+    assert refreshed["total_seconds"] == first["total_seconds"] + 600
+    stats = api.report_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (4, 3)
@@ -0,0 +1,72 @@
+import collections
+
+from pyminder.lib.reports import build_time_report
+
+Row = collections.namedtuple(
+    "Row", "client_name project_name date_when task_name seconds entries"
+)
+
+
+def test_rows_fold_into_nested_totals():
+    report = build_time_report(
+        [
+            Row("acme", "site", "2024-01-01", "css", 1800, 2),
+            Row("acme", "site", "2024-01-01", "html", 3600, 1),
+            Row("acme", "site", "2024-01-02", "css", 90, 1),
+            Row("acme", "wiki", "2024-01-01", "edit", 45, 3),
+            Row("zen", "app", "2024-01-03", "bugs", 7200, 4),
+        ]
+    )
+
+    assert report["total_seconds"] == 12735
+    assert (report["hours"], report["minutes"], report["seconds"]) == (3, 32, 15)
+    assert report["decimal"] == 3 + 32 / 60 + 15 / 3600
+    assert list(report["clients"]) == ["acme", "zen"]
+
+    acme = report["clients"]["acme"]
+    assert acme["category"] == "client"
+    assert acme["total_seconds"] == 5535
+    assert list(acme["projects"]) == ["site", "wiki"]
+
+    site = acme["projects"]["site"]
+    assert site["total_seconds"] == 5490
+    assert list(site["dates"]) == ["2024-01-01", "2024-01-02"]
+
+    day = site["dates"]["2024-01-01"]
+    assert (day["hours"], day["minutes"], day["seconds"]) == (1, 30, 0)
+    assert [(task["name"], task["entries"]) for task in day["tasks"]] == [
+        ("css", 2),
+        ("html", 1),
+    ]
+    assert day["tasks"][1]["category"] == "task"
+    assert day["tasks"][1]["total_seconds"] == 3600
+
+
+def test_empty_report():
+    report = build_time_report([])
+    assert report["clients"] == {}
+    assert report["total_seconds"] == 0
+    assert report["decimal"] == 0
+
+
+def test_report_generate_streams_the_breakdown(api, app, seed_history):
+    with app.get_db() as session:
+        seed_history(session, clients=2, projects=2, tasks=11, days=3, entries=2)
+
+    report = api.report_generate(
+        {"start_date": "2024-01-02", "end_date": "2024-01-03", "client_id": None}
+    )
+
+    assert report["total_seconds"] == 2 * 2 * 11 * 2 * 2 * 60
+    assert list(report["clients"]) == ["client 0", "client 1"]
+    project = report["clients"]["client 1"]["projects"]["project 0"]
+    assert list(project["dates"]) == ["2024-01-02", "2024-01-03"]
+    tasks = project["dates"]["2024-01-02"]["tasks"]
+    assert [task["name"] for task in tasks] == sorted(
+        f"task {number}" for number in range(11)
+    )
+    assert {task["entries"] for task in tasks} == {2}
+
+    report = api.report_generate({"client_id": 2})
+    assert list(report["clients"]) == ["client 1"]
+    assert report["total_seconds"] == 2 * 11 * 3 * 2 * 60
@@ -0,0 +1,116 @@
+import threading
+
+from pyminder.lib import models
+from pyminder.lib.api import API
+from pyminder.lib.application import Application
+
+
+def make_tasks(api, count):
+    client = api.client_create("client")
+    project = api.project_create(client["id"], "project")
+    return [
+        (client["id"], project["id"], api.task_create(project["id"], f"task {n}")["id"])
+        for n in range(count)
+    ]
+
+
+def task_ids(api):
+    return [shortcut["task_id"] for shortcut in api.shortcut_get_all()]
+
+
+def test_most_recently_used_first(api):
+    tasks = make_tasks(api, 6)
+    for owner in tasks:
+        api.shortcut_add(*owner)
+
+    # capacity of 4, the two oldest were trimmed
+    assert task_ids(api) == [tasks[n][2] for n in (5, 4, 3, 2)]
+
+    touched = api.shortcut_add(*tasks[3])
+    assert touched["compound_name"] == ["client", "project", "task 3"]
+    assert task_ids(api) == [tasks[n][2] for n in (3, 5, 4, 2)]
+    assert api.shortcut_get(touched["id"]) == touched
+
+    api.shortcut_add(*tasks[0])
+    assert task_ids(api) == [tasks[n][2] for n in (0, 3, 5, 4)]
+
+
+def test_capacity_is_configurable(tmp_path):
+    app = Application(tmp_path, tmp_path / "app.sqlite3", shortcut_capacity=2)
+    api = API(app)
+    tasks = make_tasks(api, 3)
+    for owner in tasks:
+        api.shortcut_add(*owner)
+    assert task_ids(api) == [tasks[2][2], tasks[1][2]]
+
+    # a touch within the same second still moves it to the front, so the next
+    # add trims the least recently used one
+    api.shortcut_add(*tasks[1])
+    assert task_ids(api) == [tasks[1][2], tasks[2][2]]
+    api.shortcut_add(*tasks[0])
+    assert task_ids(api) == [tasks[0][2], tasks[1][2]]
+
+    app.push.close()
+    app.Session.remove()
+    app.engine.dispose()
+
+
+def test_reads_are_one_query_and_cached(api, app, count_statements):
+    tasks = make_tasks(api, 3)
+    for owner in tasks:
+        api.shortcut_add(*owner)
+
+    with count_statements(app.engine) as statements:
+        first = api.shortcut_get_all()
+    assert len(statements) == 1 and len(first) == 3
+
+    with count_statements(app.engine) as statements:
+        assert api.shortcut_get_all() == first
+        api.shortcut_get(first[0]["id"])
+    assert statements == []
+
+    # writes invalidate the copy, including renames of what they point to
+    api.task_update(tasks[0][2], "renamed")
+    assert api.shortcut_get_all()[-1]["compound_name"][-1] == "renamed"
+
+
+def test_touch_and_trim_statements(api, app, count_statements):
+    tasks = make_tasks(api, 5)
+    for owner in tasks[:4]:
+        api.shortcut_add(*owner)
+
+    with count_statements(app.engine) as statements:
+        api.shortcut_add(*tasks[4])
+    writes = [
+        statement
+        for statement in statements
+        if statement.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))
+    ]
+    assert len(writes) == 3
+    assert writes[-1].lstrip().upper().startswith("DELETE")
+
+
+def test_read_during_an_uncommitted_add_is_not_kept(api, app):
+    tasks = make_tasks(api, 2)
+    api.shortcut_add(*tasks[0])
+    assert task_ids(api) == [tasks[0][2]]
+
+    written = threading.Event()
+    read = threading.Event()
+
+    def writer():
+        with app.get_db() as session:
+            models.Shortcut.Use(session, *tasks[1])
+            session.flush()
+            written.set()
+            read.wait(5)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    assert written.wait(5)
+    # the add is not committed yet, this still reads and caches the old list
+    assert task_ids(api) == [tasks[0][2]]
+    read.set()
+    thread.join(5)
+
+    assert task_ids(api) == [tasks[1][2], tasks[0][2]]
@@ -0,0 +1,93 @@
+import json
+import socket
+import threading
+import time
+
+from pyminder.lib.api import API
+from pyminder.lib.application import Application
+from pyminder.lib.startup import StartupProfiler, wait_for_port
+
+
+def test_disabled_profiler_records_nothing(tmp_path):
+    profiler = StartupProfiler()
+    with profiler.phase("engine"):
+        pass
+
+    assert profiler.phases == []
+    assert profiler.write() is None
+
+
+def test_application_phases_and_first_bridge_call(tmp_path):
+    destination = tmp_path / "startup.json"
+    profiler = StartupProfiler(destination)
+    app = Application(tmp_path, tmp_path / "app.sqlite3", profiler=profiler)
+    api = API(app)
+
+    profiler.start("first_bridge_call")
+    profiler.watch_bridge(api)
+    assert not destination.exists()
+
+    assert api.clients_list() == []
+    assert api.clients_list() == []
+    assert api.clients_list() == []
+    app.push.close()
+    app.engine.dispose()
+
+    report = json.loads(destination.read_text())
+    names = [phase["name"] for phase in report["phases"]]
+    assert names == ["engine", "schema", "first_bridge_call"]
+    assert all(phase["seconds"] >= 0 for phase in report["phases"])
+    assert report["phases"][-1]["started"] <= report["total_seconds"]
+    # the profiler's wrappers are gone after the first call, the diagnostics
+    # ones are back and count every call
+    calls = {m["name"]: m["calls"] for m in api.diagnostics_get()["methods"]}
+    assert calls["clients_list"] == 3
+
+
+def test_concurrent_first_bridge_calls(tmp_path):
+    class Bridge:
+        def __delattr__(self, name):
+            # widen the window in which other first calls arrive
+            time.sleep(0.01)
+            super().__delattr__(name)
+
+        def ping(self):
+            return "pong"
+
+        def other(self):
+            return "other"
+
+    profiler = StartupProfiler(tmp_path / "startup.json")
+    written = []
+    write = profiler.write
+    profiler.write = lambda: written.append(write())
+    bridge = Bridge()
+    profiler.start("first_bridge_call")
+    profiler.watch_bridge(bridge)
+
+    barrier = threading.Barrier(8)
+    results = []
+
+    def call():
+        barrier.wait()
+        results.append(bridge.ping())
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["pong"] * 8
+    assert len(written) == 1 and written[0] is not None
+    assert vars(bridge) == {}
+
+
+def test_wait_for_port():
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        port = server.getsockname()[1]
+        assert wait_for_port(port, timeout=1)
+
+    assert not wait_for_port(port, timeout=0.2)
@@ -0,0 +1,70 @@
+import ast
+import pathlib
+import re
+import subprocess
+import sys
+
+PYMINDER = pathlib.Path(__file__).parent.parent / "pyminder"
+SPEC = PYMINDER.parent / "main.spec"
+
+HEAVY = {"pandas", "numpy", "flask", "werkzeug", "jinja2"}
+
+STARTUP = """
+import pathlib, sys
+import main
+from lib.api import API
+from lib.application import Application
+
+app = Application(main.HERE, pathlib.Path(sys.argv[1]))
+api = API(app)
+api.clients_list()
+api.time_tree()
+api.report_generate({})
+"""
+
+
+def imported_modules(code, *args):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code, *args],
+        cwd=PYMINDER,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {
+        line.rsplit("|", 1)[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+
+def test_main_window_startup_skips_heavy_imports(tmp_path):
+    modules = imported_modules(STARTUP, str(tmp_path / "startup.sqlite3"))
+
+    assert "lib.api" in modules
+    loaded = {name for name in modules if name.split(".")[0] in HEAVY}
+    assert loaded == set()
+
+
+def test_lazy_module_imports_on_first_use():
+    modules = imported_modules(
+        "from lib.lazy import lazy_import\n"
+        "colorsys = lazy_import('colorsys')\n"
+        "flask = lazy_import('flask')\n"
+        "assert colorsys.rgb_to_hsv\n"
+    )
+
+    assert "colorsys" in modules
+    assert "flask" not in modules
+
+
+def test_lazy_imports_are_hidden_imports_of_the_frozen_build():
+    lazy = {
+        name
+        for path in PYMINDER.rglob("*.py")
+        for name in re.findall(r"""lazy_import\(["']([\w.]+)["']\)""", path.read_text())
+    }
+    hidden = re.search(r"hiddenimports=(\[.*?\])", SPEC.read_text(), re.DOTALL)
+
+    assert lazy >= {"flask", "numpy"}
+    assert lazy <= set(ast.literal_eval(hidden.group(1)))
@@ -0,0 +1,37 @@
+import pytest
+from sqlalchemy import func, select
+
+from pyminder.lib import models
+
+
+@pytest.mark.parametrize("name", models.STORAGE_PROFILES.keys())
+def test_storage_profile_pragmas(tmp_path, name) -> None:
+    profile = models.STORAGE_PROFILES[name]
+    engine, Session = models.connect(tmp_path / f"{name}.sqlite3", profile=name)
+
+    with engine.connect() as conn:
+
+        def pragma(key):
+            return conn.exec_driver_sql(f"PRAGMA {key}").scalar()
+
+        assert pragma("journal_mode") == profile.journal_mode.lower()
+        assert pragma("foreign_keys") == int(profile.foreign_keys)
+        assert pragma("busy_timeout") == profile.busy_timeout
+        assert pragma("cache_size") == profile.cache_size
+
+    Session.remove()
+    engine.dispose()
+
+
+def test_foreign_keys_cascade_deletes(api, app) -> None:
+    client = api.client_create("client")
+    project = api.project_create(client["id"], "project")
+    task = api.task_create(project["id"], "task")
+    api.shortcut_add(client["id"], project["id"], task["id"])
+    api.event_create(task["id"])
+
+    assert api.client_destroy(client["id"])
+
+    with app.get_db() as session:
+        for model in (models.Project, models.Task, models.Event, models.Shortcut):
+            assert session.execute(select(func.count(model.id))).scalar() == 0
@@ -0,0 +1,70 @@
+import datetime as DT
+
+from sqlalchemy import event
+
+from pyminder.lib import models
+from pyminder.lib.app_types import StopReasons
+
+
+def seed(session):
+    client = models.Client(name="client")
+    idle = models.Client(name="idle client")
+    project = models.Project(name="project", client=client)
+    empty = models.Project(name="empty project", client=client)
+    task = models.Task(name="task", project=project)
+    other = models.Task(name="other task", project=project)
+    session.add_all([client, idle, project, empty, task, other])
+
+    for day, task_record, seconds in [
+        (DT.date(2024, 1, 1), task, 100),
+        (DT.date(2024, 1, 2), task, 200),
+        (DT.date(2024, 1, 2), other, 50),
+    ]:
+        record = models.Event(task=task_record, start_date=day)
+        started = DT.datetime.combine(day, DT.time(9))
+        session.add(
+            record.create_entry(started, started, seconds, StopReasons.FINISHED)
+        )
+    session.commit()
+
+
+def test_time_tree_is_one_statement(db, session) -> None:
+    engine, _ = db
+    seed(session)
+
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    tree = models.Queries.TimeTree(session)
+    assert len(statements) == 1
+
+    assert [client["name"] for client in tree] == ["client", "idle client"]
+    client, idle = tree
+    assert client["seconds"] == 350
+    assert idle["seconds"] == 0 and idle["projects"] == []
+
+    empty, project = client["projects"]
+    assert empty["tasks"] == [] and empty["seconds"] == 0
+    assert project["seconds"] == 350
+    assert {task["name"]: task["seconds"] for task in project["tasks"]} == {
+        "other task": 50,
+        "task": 300,
+    }
+    assert project["time"] == {"hours": 0, "minutes": 5, "seconds": 50}
+
+
+def test_time_tree_between_dates(session) -> None:
+    seed(session)
+
+    client, _ = models.Queries.TimeTree(
+        session, start=DT.date(2024, 1, 2), end=DT.date(2024, 1, 2)
+    )
+    assert client["seconds"] == 250
+
+    totals = models.Queries.TimeTotals(session, project_id=client["projects"][1]["id"])
+    assert list(totals["project"].values()) == [
+        {"hours": 0, "minutes": 5, "seconds": 50}
+    ]
@@ -0,0 +1,107 @@
+import time
+
+import pytest
+from sqlalchemy import select
+
+from pyminder.lib import models
+from pyminder.lib.timer import Timer
+
+
+class FakeClock:
+    """
+    Monotonic clock whose waits oversleep by `jitter` seconds, like a busy host.
+    """
+
+    def __init__(self, jitter=0.0):
+        self.now = 1000.0
+        self.jitter = jitter
+        self.waits: list[float | None] = []
+
+    def __call__(self):
+        return self.now
+
+    def wait(self, timeout):
+        self.waits.append(timeout)
+        self.now += timeout + self.jitter
+        return False
+
+
+@pytest.fixture
+def event_id(app, seed_history):
+    with app.get_db() as session:
+        seed_history(session, entries=0)
+        return session.scalars(select(models.Event.id)).one()
+
+
+def listen(app):
+    told = []
+    app.tell = lambda identifier, hours, minutes, seconds: told.append(
+        hours * 3600 + minutes * 60 + seconds
+    )
+    app.clearCallback = lambda identifier: None
+    return told
+
+
+def test_no_drift_over_hours(app, event_id):
+    told = listen(app)
+    clock = FakeClock(jitter=0.003)
+    timer = Timer(app, "listener", event_id, 1.0, clock=clock)
+    session_length = 3 * 3600
+
+    def wait(timeout):
+        clock.wait(timeout)
+        if clock.now - 1000.0 >= session_length:
+            timer.stop()
+        return False
+
+    timer.wait = wait
+    timer.run()
+
+    assert told == list(range(session_length))
+    assert timer.accumulated_seconds == clock.now - 1000.0
+    assert all(timeout <= 1.0 for timeout in clock.waits)
+
+    with app.get_db() as session:
+        entry = models.Entry.Fetch_by_id(session, timer.entry_id)
+        assert entry.seconds == timer.accumulated_seconds
+        assert entry.stop_reason == models.StopReasons.FINISHED
+
+
+def test_paused_time_is_not_tracked(app, event_id):
+    listen(app)
+    clock = FakeClock()
+    timer = Timer(app, "listener", event_id, 1.0, clock=clock)
+    # the thread has not run yet, none of this is tracked
+    clock.now += 600
+    assert timer.elapsed() == 0
+    checks = []
+
+    def wait(timeout):
+        clock.now += 30
+        timer.pause()
+        clock.now += 600
+        checks.append((timer.elapsed(), timer.tick()))
+
+        timer.resume()
+        clock.now += 12.5
+        checks.append((timer.elapsed(), timer.tick()))
+        timer.stop()
+        return False
+
+    timer.wait = wait
+    timer.run()
+
+    assert checks == [(30, None), (42.5, 0.5)]
+    assert timer.accumulated_seconds == 42.5
+
+
+def test_stop_is_immediate(app, event_id):
+    listen(app)
+    timer = Timer(app, "listener", event_id, 60.0)
+    timer.start()
+
+    started = time.perf_counter()
+    timer.stop()
+    timer.join(1)
+    assert not timer.is_alive()
+    assert time.perf_counter() - started < 0.5
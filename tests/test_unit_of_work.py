@@ -0,0 +1,101 @@
+import pytest
+from sqlalchemy import event, func, select
+
+from pyminder.lib import models
+
+
+@pytest.fixture
+def count_transactions():
+    """
+    Count the transactions an engine begins and commits while in the block.
+    """
+
+    class Counter:
+        def __init__(self, engine):
+            self.engine = engine
+            self.begins = 0
+            self.commits = 0
+
+        def _begin(self, conn):
+            self.begins += 1
+
+        def _commit(self, conn):
+            self.commits += 1
+
+        def __enter__(self):
+            event.listen(self.engine, "begin", self._begin)
+            event.listen(self.engine, "commit", self._commit)
+            return self
+
+        def __exit__(self, *exc):
+            event.remove(self.engine, "begin", self._begin)
+            event.remove(self.engine, "commit", self._commit)
+
+    return Counter
+
+
+def clients(app):
+    with app.get_db() as session:
+        return session.execute(select(func.count(models.Client.id))).scalar()
+
+
+def test_nested_blocks_share_the_outer_session(app):
+    with app.get_db() as outer:
+        outer.add(models.Client(name="client"))
+        with app.get_db() as inner:
+            assert inner is outer
+        assert outer.in_transaction()
+    assert clients(app) == 1
+
+
+def test_errors_roll_back_everything(app):
+    with pytest.raises(RuntimeError):
+        with app.get_db() as session:
+            session.add(models.Client(name="client"))
+            session.flush()
+            with app.get_db():
+                raise RuntimeError("failed call")
+
+    assert clients(app) == 0
+    with app.get_db() as session:
+        session.add(models.Client(name="after"))
+    assert clients(app) == 1
+
+
+def test_failed_bridge_call_leaves_no_transaction(api, app):
+    with pytest.raises(Exception):
+        api.event_create(12345)
+
+    client = api.client_create("client")
+    assert api.client_get(client["id"])["name"] == "client"
+    assert app.engine.pool.checkedout() == 0
+
+
+def test_one_session_per_call(api, app, monkeypatch):
+    client = api.client_create("client")
+    project = api.project_create(client["id"], "project")
+    task = api.task_create(project["id"], "task")
+
+    opened = []
+    factory = app.Session
+
+    def Session():
+        opened.append(factory())
+        return opened[-1]
+
+    monkeypatch.setattr(app, "Session", Session)
+    # adds the shortcut, then reads the list back through a helper
+    api.shortcut_add(client["id"], project["id"], task["id"])
+    assert len(opened) == 1
+
+
+def test_timer_start_is_one_transaction(api, app, count_transactions):
+    client = api.client_create("client")
+    project = api.project_create(client["id"], "project")
+    task = api.task_create(project["id"], "task")
+
+    with count_transactions(app.engine) as counter:
+        event = api.timer_start("listener", task["id"], include_entries=True)
+    api.timer_stop()
+    assert (counter.begins, counter.commits) == (1, 1)
+    assert len(event["entries"]) == 1
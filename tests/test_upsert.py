@@ -0,0 +1,108 @@
+import datetime as DT
+
+import pytest
+from sqlalchemy import func, select
+
+from pyminder.lib import models
+
+
+@pytest.fixture
+def task(session, seed_history):
+    seed_history(session, days=0)
+    return session.scalars(select(models.Task)).one()
+
+
+def count(session, model):
+    return session.execute(select(func.count(model.id))).scalar()
+
+
+def test_unique_key():
+    assert models.Event.UniqueKey(["start_date", "task_id"]) == (
+        "task_id",
+        "start_date",
+    )
+    assert models.Project.UniqueKey(["client_id", "name"]) is not None
+    assert models.Event.UniqueKey(["task_id"]) is None
+    assert models.Client.UniqueKey(["name"]) is None
+
+
+def test_get_or_create_never_commits(session, task):
+    day = DT.date(2024, 3, 1)
+
+    event = models.Event.GetOrCreateByDate(session, task.id, day)
+    assert event.start_date == day
+    session.rollback()
+    assert count(session, models.Event) == 0
+
+    event = models.Event.GetOrCreateByDate(session, task.id, day)
+    session.commit()
+    again = models.Event.GetOrCreateByDate(
+        session, task.id, DT.datetime.combine(day, DT.time(15))
+    )
+    assert again.id == event.id
+    assert count(session, models.Event) == 1
+
+
+def test_upsert_batches_keep_order(session, task, count_statements):
+    days = [DT.date(2024, 1, 1) + DT.timedelta(days=day) for day in range(10)]
+    existing = models.Event.Upsert(
+        session, [dict(task_id=task.id, start_date=day) for day in days[::2]]
+    )
+    session.commit()
+
+    rows = [dict(task_id=task.id, start_date=day) for day in reversed(days)]
+    rows.append(dict(task_id=task.id, start_date=days[0]))
+    with count_statements(session.get_bind()) as statements:
+        ids = models.Event.Upsert(session, rows, batch_size=4)
+    session.commit()
+
+    # three upserts of up to four rows, each with conflicts to select
+    assert sum("ON CONFLICT" in statement for statement in statements) == 3
+    assert len(statements) == 6
+    assert ids[-1] == ids[-2] == existing[0]
+    assert ids[-4::-2] == existing[1:]
+    assert len(set(ids)) == 10
+    by_id = {
+        event.id: event.start_date for event in session.scalars(select(models.Event))
+    }
+    assert [by_id[event_id] for event_id in ids] == [row["start_date"] for row in rows]
+
+
+def test_upsert_without_constraint(session):
+    older = models.Client(name="twin")
+    newer = models.Client(name="twin")
+    session.add_all([older, newer])
+    session.commit()
+
+    ids = models.Client.Upsert(session, [dict(name="twin"), dict(name="new")])
+    session.commit()
+
+    assert ids[0] == older.id
+    assert session.get(models.Client, ids[1]).name == "new"
+    assert count(session, models.Client) == 3
+
+
+def test_defaults_only_on_create(session):
+    client = models.Client(name="client")
+    session.add(client)
+    session.commit()
+
+    project = models.Project.GetOrCreate(
+        session, defaults=dict(is_active=False), client_id=client.id, name="project"
+    )
+    assert project.is_active is False
+    same = models.Project.GetOrCreate(
+        session, defaults=dict(is_active=True), client_id=client.id, name="project"
+    )
+    assert same.id == project.id and same.is_active is False
+
+
+def test_api_get_or_create_by_date_commits(api, app, seed_history):
+    with app.get_db() as session:
+        seed_history(session, days=0)
+        task_id = session.scalars(select(models.Task.id)).one()
+
+    event = api.events_get_or_create_by_date(task_id, DT.date(2024, 5, 1))
+    assert api.events_get_or_create_by_date(task_id, DT.date(2024, 5, 1)) == event
+    with app.get_db() as session:
+        assert count(session, models.Event) == 1
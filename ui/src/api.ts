@@ -15,7 +15,14 @@ import {
     type TimeReport,
     type ReportPayload,
     type EventDate,
-    type DayActivityEntry
+    type DayActivityEntry,
+    type DayActivities,
+    type HeatmapCalendar,
+    type HeatmapWeekdayHour,
+    type ImportSummary,
+    type ClientTimeNode,
+    type CacheStats,
+    type DiagnosticsReport
 } from '@src/types'
 
 interface Boundary {
@@ -61,19 +68,21 @@ client_create(name:string):Promise<Client> {
 
 /*
 List all clients.
+:param with_time: also fill in each client's all time total
 :return:
 */
-clients_list():Promise<Client[]> {
-        return this.boundary.remote('clients_list') as Promise<Client[]>
+clients_list(with_time:boolean = false):Promise<Client[]> {
+        return this.boundary.remote('clients_list', with_time) as Promise<Client[]>
     }
 
 /*
 List all active clients.
 
+:param with_time: also fill in each client's all time total
 :return:
 */
-client_list_active():Promise<Client[]> {
-        return this.boundary.remote('client_list_active') as Promise<Client[]>
+client_list_active(with_time:boolean = false):Promise<Client[]> {
+        return this.boundary.remote('client_list_active', with_time) as Promise<Client[]>
     }
 
 /*
@@ -120,19 +129,21 @@ project_create(client_id:Identifier, name:string):Promise<Project> {
 /*
 List all projects by client.
 :param client_id:
+:param with_time: also fill in each project's all time total
 :return:
 */
-projects_list_by_client_id(client_id:Identifier):Promise<Project[]> {
-        return this.boundary.remote('projects_list_by_client_id', client_id) as Promise<Project[]>
+projects_list_by_client_id(client_id:Identifier, with_time:boolean = false):Promise<Project[]> {
+        return this.boundary.remote('projects_list_by_client_id', client_id, with_time) as Promise<Project[]>
     }
 
 /*
 List all active projects by client.
 :param client_id:
+:param with_time: also fill in each project's all time total
 :return:
 */
-projects_list_active_by_client_id(client_id:Identifier):Promise<Project[]> {
-        return this.boundary.remote('projects_list_active_by_client_id', client_id) as Promise<Project[]>
+projects_list_active_by_client_id(client_id:Identifier, with_time:boolean = false):Promise<Project[]> {
+        return this.boundary.remote('projects_list_active_by_client_id', client_id, with_time) as Promise<Project[]>
     }
 
 /*
@@ -186,19 +197,21 @@ task_create(project_id:Identifier, name:string):Promise<Task> {
 /*
 List all tasks by project.
 :param project_id:
+:param with_time: also fill in each task's all time total
 :return:
 */
-tasks_lists_by_project_id(project_id:Identifier):Promise<Task[]> {
-        return this.boundary.remote('tasks_lists_by_project_id', project_id) as Promise<Task[]>
+tasks_lists_by_project_id(project_id:Identifier, with_time:boolean = false):Promise<Task[]> {
+        return this.boundary.remote('tasks_lists_by_project_id', project_id, with_time) as Promise<Task[]>
     }
 
 /*
 List all active tasks by project.
 :param project_id:
+:param with_time: also fill in each task's all time total
 :return:
 */
-tasks_list_active_by_project_id(project_id:Identifier):Promise<Task[]> {
-        return this.boundary.remote('tasks_list_active_by_project_id', project_id) as Promise<Task[]>
+tasks_list_active_by_project_id(project_id:Identifier, with_time:boolean = false):Promise<Task[]> {
+        return this.boundary.remote('tasks_list_active_by_project_id', project_id, with_time) as Promise<Task[]>
     }
 
 /*
@@ -272,38 +285,42 @@ events_get_or_create_by_date(task_id:Identifier, start_date:string | undefined =
 /*
 Get all events by task id.
 :param task_id:
+:param include_entries: also send every event's entries
 :return:
 */
-events_by_task_id(task_id:Identifier):Promise<Event[]> {
-        return this.boundary.remote('events_by_task_id', task_id) as Promise<Event[]>
+events_by_task_id(task_id:Identifier, include_entries:boolean = false):Promise<Event[]> {
+        return this.boundary.remote('events_by_task_id', task_id, include_entries) as Promise<Event[]>
     }
 
 /*
 Get all active events by task id.
 :param task_id:
+:param include_entries: also send every event's entries
 :return:
 */
-event_active_by_task_id(task_id:Identifier): Promise<void> {
-        return this.boundary.remote('event_active_by_task_id', task_id) as Promise<void>
+event_active_by_task_id(task_id:Identifier, include_entries:boolean = false): Promise<void> {
+        return this.boundary.remote('event_active_by_task_id', task_id, include_entries) as Promise<void>
     }
 
 /*
 Get an event record.
 :param event_id:
+:param include_entries: also send the event's entries
 :return:
 */
-event_get(event_id:Identifier): Promise<void> {
-        return this.boundary.remote('event_get', event_id) as Promise<void>
+event_get(event_id:Identifier, include_entries:boolean = false): Promise<void> {
+        return this.boundary.remote('event_get', event_id, include_entries) as Promise<void>
     }
 
 /*
 Get an event record based on date.
 :param task_id:
 :param event_date:
+:param include_entries: also send the event's entries
 :return:
 */
-event_get_by_date(task_id:Identifier, event_date:string | undefined): Promise<void> {
-        return this.boundary.remote('event_get_by_date', task_id, event_date) as Promise<void>
+event_get_by_date(task_id:Identifier, event_date:string | undefined, include_entries:boolean = false): Promise<void> {
+        return this.boundary.remote('event_get_by_date', task_id, event_date, include_entries) as Promise<void>
     }
 
 /*
@@ -375,13 +392,9 @@ entry_get(entry_id:Identifier):Promise<Entry> {
 
 /*
 Update an entry record.
-@TODO refactor so its a changeset and not a bunch of arguments
 
 :param entry_id:
-:param start_dt:
-:param end_dt:
-:param seconds:
-:param reason:
+:param changeset:
 :return:
 */
 entry_update(entry_id:Identifier, changeset:EntryUpdate):Promise<Entry> {
@@ -398,6 +411,20 @@ entry_destroy(entry_id:Identifier):Promise<boolean> {
         return this.boundary.remote('entry_destroy', entry_id) as Promise<boolean>
     }
 
+/*
+Bulk import entries from a .csv, .json or .jsonl file in one
+transaction, see importer.py for the accepted columns.
+
+:param path: the file to import
+:param dry_run: validate everything but write nothing
+:param listener_id: optional frontend callback receiving
+    (entries written, entries total) after each batch
+:return:
+*/
+entries_import(path:string, dry_run:boolean = false, listener_id:Identifier | undefined = undefined):Promise<ImportSummary> {
+        return this.boundary.remote('entries_import', path, dry_run, listener_id) as Promise<ImportSummary>
+    }
+
 /*
 Create an entry record.
 
@@ -423,10 +450,11 @@ timer_check():Promise<boolean> {
 /*
 Get everything about the timer's owner.
 
+:param include_entries: also send the running event's entries
 :return:
 */
-timer_owner():Promise<TimeOwner | undefined > {
-        return this.boundary.remote('timer_owner') as Promise<TimeOwner | undefined >
+timer_owner(include_entries:boolean = false):Promise<TimeOwner | undefined > {
+        return this.boundary.remote('timer_owner', include_entries) as Promise<TimeOwner | undefined >
     }
 
 /*
@@ -440,14 +468,15 @@ timer_override(new_receiver:Identifier): Promise<void> {
     }
 
 /*
-Create a new event if not exists and then start the timer with the provised event record id.
+Create a new event if not exists and then start the timer with the provided event record id.
 
 :param listener_id:
 :param task_id:
+:param include_entries: also send the event's entries
 :return:
 */
-timer_start(listener_id:Identifier, task_id:Identifier):Promise<Event> {
-        return this.boundary.remote('timer_start', listener_id, task_id) as Promise<Event>
+timer_start(listener_id:Identifier, task_id:Identifier, include_entries:boolean = false):Promise<Event> {
+        return this.boundary.remote('timer_start', listener_id, task_id, include_entries) as Promise<Event>
     }
 
 /*
@@ -477,7 +506,8 @@ timer_resume():Promise<boolean> {
     }
 
 /*
-Get all shortcuts (client, project, task) for rapid context switching.
+Get all shortcuts (client, project, task) for rapid context switching,
+most recently used first.
 
 :return:
 */
@@ -496,7 +526,8 @@ shortcut_get(shortcut_id:Identifier):Promise<Shortcut> {
     }
 
 /*
-Add a new shortcut .
+Add a shortcut, or move an existing one to the front.  Only the
+application's `shortcut_capacity` most recent shortcuts are kept.
 
 :param client_id:
 :param project_id:
@@ -528,9 +559,25 @@ window_toggle_resize(win_name:string, size:string):Promise<boolean> {
         return this.boundary.remote('window_toggle_resize', win_name, size) as Promise<boolean>
     }
 
+/*
+Get every client, its projects and their tasks with time totals.
+
+:param start_date: optional first day (inclusive) to count time from
+:param end_date: optional last day (inclusive) to count time to
+:param active_only: skip deactivated clients, projects, and tasks
+:return:
+*/
+time_tree(start_date:string | undefined = undefined, end_date:string | undefined = undefined, active_only:boolean = false):Promise<ClientTimeNode[]> {
+        return this.boundary.remote('time_tree', start_date, end_date, active_only) as Promise<ClientTimeNode[]>
+    }
+
 /*
 Generate a report using the given payload.
 
+Reports are cached by payload until a client, project, task, event or
+entry is written to.  With the columnar entry store enabled they are
+computed from its arrays instead of SQLite.
+
 :param payload:
 :return:
 */
@@ -538,6 +585,26 @@ report_generate(payload:ReportPayload):Promise<TimeReport> {
         return this.boundary.remote('report_generate', payload) as Promise<TimeReport>
     }
 
+/*
+Hit/miss counters of the report cache.
+
+:return:
+*/
+report_cache_stats():Promise<CacheStats> {
+        return this.boundary.remote('report_cache_stats') as Promise<CacheStats>
+    }
+
+/*
+Call count, latency percentiles, SQL statements, records returned and
+payload size of every bridge method called so far, slowest in total
+first.
+
+:return:
+*/
+diagnostics_get():Promise<DiagnosticsReport> {
+        return this.boundary.remote('diagnostics_get') as Promise<DiagnosticsReport>
+    }
+
 /*
 Converts a Report payload dictionary into a text block.
 
@@ -549,6 +616,30 @@ report_build2text(payload:ReportPayload):Promise<string> {
     }report_day(request_date:string):Promise<DayActivityEntry[]> {
         return this.boundary.remote('report_day', request_date) as Promise<DayActivityEntry[]>
     }
+
+/*
+Every entry from start_date to end_date inclusive, grouped by day, for
+the week and month timelines.  Days without entries are left out.
+*/
+report_range_activities(start_date:string, end_date:string, columnar:boolean = false):Promise<DayActivities[]> {
+        return this.boundary.remote('report_range_activities', start_date, end_date, columnar) as Promise<DayActivities[]>
+    }
+
+/*
+Seconds tracked on each day from start_date to end_date inclusive,
+entries running past midnight are split between their days.
+*/
+heatmap_calendar(start_date:string, end_date:string, client_id:Identifier | undefined = undefined, project_id:Identifier | undefined = undefined, task_id:Identifier | undefined = undefined):Promise<HeatmapCalendar> {
+        return this.boundary.remote('heatmap_calendar', start_date, end_date, client_id, project_id, task_id) as Promise<HeatmapCalendar>
+    }
+
+/*
+Seconds tracked from start_date to end_date inclusive as a 7x24
+weekday (Monday first) by hour of the day matrix.
+*/
+heatmap_weekday_hour(start_date:string, end_date:string, client_id:Identifier | undefined = undefined, project_id:Identifier | undefined = undefined, task_id:Identifier | undefined = undefined):Promise<HeatmapWeekdayHour> {
+        return this.boundary.remote('heatmap_weekday_hour', start_date, end_date, client_id, project_id, task_id) as Promise<HeatmapWeekdayHour>
+    }
 }
 
 export default APIBridge
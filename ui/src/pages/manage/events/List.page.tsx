@@ -52,9 +52,9 @@ export const ListPage = () => {
                     title: 'Started @'
                 },
                 {
-                    accessor: 'entries',
+                    accessor: 'entries_count',
                     title: 'Entries',
-                    render: ({ id, entries }) => <Link to={`${id}/entries`}>{entries.length || 0}</Link>
+                    render: ({ id, entries_count }) => <Link to={`${id}/entries`}>{entries_count || 0}</Link>
                 },
                 {
                     accessor: 'actions',
@@ -31,7 +31,7 @@ export interface HasTime {
     time?: TimeFacts
 }
 
-export interface Client {
+export interface Client extends HasTime {
     id: Identifier
     name: string
     projects_count: number
@@ -60,7 +60,8 @@ export interface Event extends HasTime {
     is_active: boolean
     task_id: number
 
-    entries: Entry[]
+    entries_count: number
+    entries?: Entry[] | null
 }
 
 export interface EventDate {
@@ -100,6 +101,22 @@ export interface TimeOwner {
     isPaused: boolean
 }
 
+export interface TaskTimeNode {
+    id: Identifier
+    name: string
+    is_active: boolean
+    seconds: number
+    time: TimeFacts
+}
+
+export interface ProjectTimeNode extends TaskTimeNode {
+    tasks: TaskTimeNode[]
+}
+
+export interface ClientTimeNode extends TaskTimeNode {
+    projects: ProjectTimeNode[]
+}
+
 export interface CommonTimeCardValues {
     hours: number
     minutes: number
@@ -153,3 +170,81 @@ export interface DayActivityEntry {
     event_id: Identifier
     entry_id: Identifier
 }
+
+export interface DayActivityColumns {
+    client_name: string[]
+    project_name: string[]
+    task_name: string[]
+    started_on: string[]
+    stopped_on: string[]
+    seconds: number[]
+    entry_id: Identifier[]
+    client_id: Identifier[]
+    project_id: Identifier[]
+    task_id: Identifier[]
+    event_id: Identifier[]
+}
+
+export interface DayActivities {
+    day: string
+    seconds: number
+    entries: DayActivityEntry[] | undefined
+    columns: DayActivityColumns | undefined
+}
+
+export interface HeatmapCalendar {
+    start_date: string
+    end_date: string
+    seconds: number[]
+    total_seconds: number
+}
+
+export interface HeatmapWeekdayHour {
+    start_date: string
+    end_date: string
+    seconds: number[][]
+    total_seconds: number
+}
+
+export interface ImportSummary {
+    path: string
+    dry_run: boolean
+    records: number
+    entries: number
+    clients: number
+    projects: number
+    tasks: number
+    events: number
+    errors: string[]
+    error_count: number
+    seconds: number
+}
+
+export interface CacheStats {
+    capacity: number
+    size: number
+    hits: number
+    misses: number
+    evictions: number
+}
+
+export interface MethodStats {
+    name: string
+    calls: number
+    errors: number
+    total_ms: number
+    p50_ms: number
+    p95_ms: number
+    p99_ms: number
+    max_ms: number
+    statements: number
+    max_statements: number
+    rows: number
+    payload_bytes: number
+    max_payload_bytes: number
+}
+
+export interface DiagnosticsReport {
+    started_on: string
+    methods: MethodStats[]
+}